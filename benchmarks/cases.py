@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""Requests sent by the benchmark suite to ``tests/apps/sanic_app.py``.
+
+Every location, the ``use_args``/``use_kwargs`` decorators, nested schemas
+and the error path are covered with a small, a large and an invalid input.
+The ``wide-*`` cases compare dict and record results of a 40 field schema.
+"""
+import typing
+
+LARGE = 1000
+
+
+class Case(typing.NamedTuple):
+    name: str
+    method: str
+    path: str
+    kwargs: dict
+    status: int = 200
+
+
+def _file(size: int, content_type: str = "text/plain"):
+    return {"myfile": ("data.txt", b"x" * size, content_type)}
+
+
+def _extra(count: int) -> dict:
+    return {"extra_{}".format(index): "value {}".format(index) for index in range(count)}
+
+
+def _tracking(count: int) -> dict:
+    return {"utm_{}".format(index): "campaign%20{}+x".format(index) for index in range(count)}
+
+
+def _wide(count: int) -> dict:
+    return {"field_{}".format(index): "x" for index in range(count)}
+
+
+CASES = [
+    Case("json-small", "POST", "/echo_json", {"json": {"name": "Ann"}}),
+    Case("json-large", "POST", "/echo_ignoring_extra_data", {"json": dict(_extra(LARGE), name="Ann")}),
+    Case("json-invalid", "POST", "/echo_json", {"json": {"name": "A"}}, 422),
+    Case("json-malformed", "POST", "/echo_json", {
+        "content": b'{"name": ', "headers": {"content-type": "application/json"}}, 400),
+
+    Case("json_stream-small", "POST", "/echo_json_stream", {"json": {"name": "Ann", "count": 1}}),
+    Case("json_stream-large", "POST", "/echo_json_stream", {"json": {"name": "Ann" * LARGE, "count": 1}}),
+    Case("json_stream-invalid", "POST", "/echo_json_stream", {"json": {"name": "Ann", "count": "x"}}, 422),
+
+    Case("query-small", "GET", "/echo_query", {"params": {"name": "Ann"}}),
+    Case("query-large", "GET", "/echo_multi", {"params": [("name", str(index)) for index in range(LARGE)]}),
+    Case("query-invalid", "GET", "/echo_query", {"params": {"name": "A"}}, 422),
+    Case("query-tracking", "GET", "/echo_query", {"params": dict(_tracking(LARGE), name="Ann")}),
+    Case("query_lazy-tracking", "GET", "/echo_query_lazy", {"params": dict(_tracking(LARGE), name="Ann")}),
+
+    Case("form-small", "POST", "/echo_form", {"data": {"name": "Ann"}}),
+    Case("form-large", "POST", "/echo_multi_form", {"data": {"name": [str(index) for index in range(LARGE)]}}),
+    Case("form-invalid", "POST", "/echo_form", {"data": {"name": "A"}}, 422),
+
+    Case("json_or_form-json", "POST", "/echo_json_or_form", {"json": {"name": "Ann"}}),
+    Case("json_or_form-form", "POST", "/echo_json_or_form", {"data": {"name": "Ann"}}),
+    Case("json_or_form-invalid", "POST", "/echo_json_or_form", {"data": {"name": "A"}}, 422),
+
+    Case("headers-small", "GET", "/echo_headers", {"headers": {"name": "Ann"}}),
+    Case("headers-large", "GET", "/echo_headers", {"headers": dict(_extra(100), name="Ann")}),
+    Case("headers-invalid", "GET", "/echo_headers", {"headers": {"name": "A"}}, 422),
+
+    Case("cookies-small", "GET", "/echo_cookie", {"headers": {"cookie": "name=Ann"}}),
+    Case("cookies-large", "GET", "/echo_cookie", {
+        "headers": {"cookie": "; ".join(["name=Ann"] + ["c{0}=v{0}".format(index) for index in range(100)])}}),
+    Case("cookies-invalid", "GET", "/echo_cookie", {"headers": {"cookie": "name=A"}}, 422),
+
+    Case("files-small", "POST", "/echo_file", {"files": _file(10)}),
+    Case("files-large", "POST", "/echo_file", {"files": _file(1024 * 1024)}),
+
+    Case("files_stream-small", "POST", "/echo_file_stream", {"files": _file(10)}),
+    Case("files_stream-large", "POST", "/echo_file_stream", {"files": _file(1024 * 1024)}),
+    Case("files_stream-invalid", "POST", "/echo_file_stream", {"files": _file(10, "image/png")}, 422),
+
+    Case("view_args-small", "GET", "/echo_view_arg/42", {}),
+    Case("view_args-large", "GET", "/echo_view_arg/" + "4" * 200, {}),
+    Case("view_args-invalid", "GET", "/echo_view_arg/foo", {}, 422),
+
+    Case("use_args-small", "GET", "/echo_use_args", {"params": {"name": "Ann"}}),
+    Case("use_args-large", "GET", "/echo_use_args", {"params": dict(_extra(LARGE), name="Ann")}),
+    Case("use_args-invalid", "GET", "/echo_use_args", {"params": {"name": "A"}}, 422),
+
+    Case("use_kwargs-small", "GET", "/echo_use_kwargs", {"params": {"name": "Ann"}}),
+    Case("use_kwargs-large", "GET", "/echo_use_kwargs", {"params": dict(_extra(LARGE), name="Ann")}),
+    Case("use_kwargs-invalid", "GET", "/echo_use_kwargs", {"params": {"name": "A"}}, 422),
+
+    Case("nested-small", "POST", "/echo_nested", {"json": {"name": {"first": "Ann", "last": "Lee"}}}),
+    Case("nested-large", "POST", "/echo_nested_many", {
+        "json": {"users": [{"id": index, "name": "user {}".format(index)} for index in range(LARGE)]}}),
+    Case("nested_limited-large", "POST", "/echo_nested_many_limited", {
+        "json": {"users": [{"id": index, "name": "user {}".format(index)} for index in range(LARGE)]}}),
+    Case("nested-invalid", "POST", "/echo_nested_many", {
+        "json": {"users": [{"id": "x{}".format(index)} for index in range(LARGE)]}}, 422),
+
+    Case("wide-dict", "POST", "/echo_wide", {"json": _wide(40)}),
+    Case("wide-records", "POST", "/echo_wide_records", {"json": _wide(40)}),
+
+    Case("error-small", "POST", "/error", {"json": {"text": "foo"}}, 422),
+    Case("error-large", "POST", "/error", {"json": {"text": "foo" * LARGE}}, 422),
+]
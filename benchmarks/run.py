@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""Run the request benchmarks and compare results.
+
+Requests go through Sanic's ASGI interface in-process, so the suite runs
+offline and measures webargs-sanic and Sanic, not the network::
+
+    python -m benchmarks.run run -o results.json
+    python -m benchmarks.run compare baseline.json results.json --threshold 0.1
+
+``compare`` exits with status 1 if a case got slower than the threshold.
+``run --memory`` also records ``peak_bytes``, the median peak of memory
+allocated while handling a request, which ``compare --stat peak_bytes``
+compares.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import typing
+
+import httpx
+import marshmallow
+import sanic
+import webargs
+
+import webargs_sanic
+from tests.apps.sanic_app import app
+
+from .cases import CASES, Case
+
+
+async def _measure(client, case: Case, number: int, repeat: int) -> typing.List[float]:
+    # the test client restarts the app on every request, go to httpx directly
+    send = httpx.AsyncClient.request
+    response = await send(client, case.method, case.path, **case.kwargs)
+    if response.status_code != case.status:
+        raise RuntimeError("{}: expected status {}, got {}: {}".format(
+            case.name, case.status, response.status_code, response.text[:200]))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await send(client, case.method, case.path, **case.kwargs)
+        timings.append((time.perf_counter() - start) / number * 1e6)
+    return timings
+
+
+async def _measure_memory(client, case: Case, number: int) -> float:
+    send = httpx.AsyncClient.request
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            await send(client, case.method, case.path, **case.kwargs)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return statistics.median(peaks)
+
+
+async def run_cases(
+        cases: typing.Iterable[Case], number: int = 100, repeat: int = 5, memory: bool = False
+) -> dict:
+    """Return per-request timings in microseconds for each case, and the peak
+    of memory allocated per request in bytes with ``memory``."""
+    client = app.asgi_client
+    # one request through the test client starts the application
+    await client.get("/echo_query")
+    results = {}
+    for case in cases:
+        timings = await _measure(client, case, number, repeat)
+        results[case.name] = {
+            "min": min(timings),
+            "median": statistics.median(timings),
+            "mean": statistics.mean(timings),
+            "number": number,
+            "repeat": repeat,
+        }
+        if memory:
+            # traced separately, tracing slows requests down
+            results[case.name]["peak_bytes"] = await _measure_memory(client, case, number)
+    return results
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sanic": sanic.__version__,
+        "webargs": webargs.__version__,
+        "webargs_sanic": webargs_sanic.__version__,
+        "marshmallow": marshmallow.__version__,
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float, stat: str = "median") -> typing.List[dict]:
+    """Return one row per case found in both results, flagging regressions."""
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline["results"].get(name)
+        if old is None or stat not in old or stat not in new:
+            continue
+        ratio = new[stat] / old[stat]
+        rows.append({
+            "name": name,
+            "baseline": old[stat],
+            "current": new[stat],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _run(args) -> int:
+    cases = [case for case in CASES if not args.filter or any(word in case.name for word in args.filter)]
+    results = asyncio.run(run_cases(cases, args.number, args.repeat, args.memory))
+    output = {"environment": environment(), "results": results}
+    for name, result in results.items():
+        memory = " {:>10.0f} B".format(result["peak_bytes"]) if "peak_bytes" in result else ""
+        print("{:<24} {:>10.1f} us{}".format(name, result["median"], memory))
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(output, fp, indent=2, sort_keys=True)
+    return 0
+
+
+def _compare(args) -> int:
+    with open(args.baseline) as fp:
+        baseline = json.load(fp)
+    with open(args.current) as fp:
+        current = json.load(fp)
+    rows = compare(baseline, current, args.threshold, args.stat)
+    for name, value in current.get("environment", {}).items():
+        old = baseline.get("environment", {}).get(name)
+        if old != value:
+            print("{}: {} -> {}".format(name, old, value))
+    for row in rows:
+        print("{:<24} {:>10.1f} {:>10.1f} {:>7.2f}x{}".format(
+            row["name"], row["baseline"], row["current"], row["ratio"],
+            "  REGRESSION" if row["regression"] else ""))
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the benchmarks")
+    run.add_argument("-o", "--output", help="write the results as JSON to this file")
+    run.add_argument("-n", "--number", type=int, default=100, help="requests per round")
+    run.add_argument("-r", "--repeat", type=int, default=5, help="rounds per case")
+    run.add_argument("-k", "--filter", action="append", help="only run cases whose name contains this")
+    run.add_argument("--memory", action="store_true", help="also measure the memory allocated per request")
+    run.set_defaults(handler=_run)
+
+    cmp = commands.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.1,
+                     help="slowdown ratio flagged as a regression (default: 0.1)")
+    cmp.add_argument("--stat", choices=("min", "median", "mean", "peak_bytes"), default="median")
+    cmp.set_defaults(handler=_compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ from setuptools import setup
 
 REQUIRES = [
     'sanic>=0.8.3',
-    'webargs>=7.0.1'
+    'webargs>=8.2.0'
 ]
 
 def find_version(fname):
@@ -36,6 +36,13 @@ setup(
     url="https://github.com/EndurantDevs/webargs-sanic",
     packages=["webargs_sanic"],
     install_requires=REQUIRES,
+    extras_require={
+        "msgpack": ["msgpack>=1.0.0"],
+        "cbor": ["cbor2>=5.0.0"],
+    },
+    entry_points={
+        "console_scripts": ["webargs-sanic-prebuild=webargs_sanic.artifacts:main"],
+    },
     license="MIT",
     zip_safe=False,
     keywords="webargs-sanic webargs sanic web args validation",
@@ -54,7 +61,7 @@ setup(
     ],
     requirements = [
         'sanic>=0.8.3',
-        'webargs>=7.0.1'
+        'webargs>=8.2.0'
     ],
     tests_require = ["pytest", "pytest-cov", "webtest-sanic>=0.4.2", "mock", "pytest-aiohttp", "webtest"],
 )
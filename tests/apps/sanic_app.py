@@ -1,4 +1,4 @@
-from sanic import Sanic
+from sanic import Blueprint, Sanic
 from sanic.response import json as J
 from sanic.views import HTTPMethodView
 from sanic import __version__ as sanic_version
@@ -6,9 +6,15 @@ from packaging import version
 
 
 import marshmallow as ma
-from webargs import fields, ValidationError
-from webargs_sanic.sanicparser import parser, use_args, use_kwargs, HandleValidationError
+from webargs import fields, validate, ValidationError
+from webargs_sanic.limits import RequestLimits
+from webargs_sanic.metrics import ParseMetrics
+from webargs_sanic.sanicparser import (
+    SanicParser, parser, use_annotations, use_args, use_kwargs, use_locations, use_response, HandleValidationError,
+)
 import asyncio
+import dataclasses
+import typing
 
 
 class TestAppConfig:
@@ -55,6 +61,26 @@ async def echo_query(request):
     return J(parsed)
 
 
+compiled_parser = SanicParser(compile_schemas=True)
+
+
+@app.route("/echo_compiled")
+async def echo_compiled(request):
+    parsed = await compiled_parser.parse(hello_args, request, location="query")
+    return J(parsed)
+
+
+metrics = ParseMetrics()
+metrics_parser = SanicParser(metrics=metrics)
+app.add_route(metrics.handler, "/metrics")
+
+
+@app.route("/echo_metrics", methods=["POST"])
+async def echo_metrics(request):
+    parsed = await metrics_parser.parse(hello_args, request, location="json")
+    return J(parsed)
+
+
 @app.route("/echo_form", methods=["POST"])
 async def echo_form(request):
     parsed = await parser.parse(hello_args, request, location="form")
@@ -67,6 +93,138 @@ async def echo_json(request):
     return J(parsed)
 
 
+@app.route("/echo_json_stream", methods=["POST"], stream=True)
+async def echo_json_stream(request):
+    args = {"name": fields.Str(required=True), "count": fields.Int()}
+    parsed = await parser.parse(args, request, location="json_stream")
+    return J(parsed)
+
+
+async def _echo_iter_args(request, location):
+    items = parser.iter_args(
+        {"id": fields.Int(required=True)}, request, location=location,
+        chunk_size=2, stop_on_error="stop" in request.args,
+    )
+    chunks = [chunk async for chunk in items]
+    return J({"chunks": chunks, "errors": items.errors})
+
+
+@app.route("/echo_iter_args", methods=["POST"])
+async def echo_iter_args(request):
+    return await _echo_iter_args(request, "json")
+
+
+@app.route("/echo_iter_args_stream", methods=["POST"], stream=True)
+async def echo_iter_args_stream(request):
+    return await _echo_iter_args(request, "json_stream")
+
+
+@app.route("/echo_ndjson", methods=["POST"])
+@use_args({"id": fields.Int(required=True)}, location="ndjson")
+async def echo_ndjson(request, args):
+    return J(args)
+
+
+@app.route("/echo_ndjson_stream", methods=["POST"], stream=True)
+async def echo_ndjson_stream(request):
+    parsed = await parser.parse({"id": fields.Int(required=True)}, request, location="ndjson")
+    return J(parsed)
+
+
+@app.route("/echo_body", methods=["POST"])
+async def echo_body(request):
+    parsed = await parser.parse(hello_args, request, location="body")
+    return J(parsed)
+
+
+@app.route("/echo_use_response", methods=["GET"])
+@use_response(HelloSchema, many=True, headers={"X-Count": "2"})
+@use_args({"name": fields.Str(), "raw": fields.Bool(load_default=False)}, location="query")
+async def echo_use_response(request, args):
+    if args["raw"]:
+        return J({"raw": True}, status=202)
+    return [{"name": args.get("name", "Ann"), "password": "secret"}, {}]
+
+
+@app.route("/echo_use_locations/<user_id>", methods=["POST"])
+@use_locations({
+    "view_args": {"user_id": fields.Int()},
+    "query": {"page": fields.Int(load_default=1)},
+    "headers": {"x_token": fields.Str(data_key="X-Token", required=True)},
+    "json": {"name": fields.Str(required=True, validate=validate.Length(min=3))},
+}, as_kwargs=True)
+async def echo_use_locations(request, user_id, page, x_token, name):
+    return J({"user_id": user_id, "page": page, "x_token": x_token, "name": name})
+
+
+@dataclasses.dataclass
+class NewUser:
+    name: str
+    tags: typing.List[str] = dataclasses.field(default_factory=list)
+
+
+@app.route("/echo_use_annotations/<user_id>", methods=["POST"])
+@use_annotations
+async def echo_use_annotations(
+        request, user: NewUser, user_id: typing.Annotated[int, "view_args"],
+        page: typing.Annotated[int, "query"] = 1,
+):
+    return J({"user": dataclasses.asdict(user), "user_id": user_id, "page": page})
+
+
+wide_args = {"field_{}".format(index): fields.Str() for index in range(40)}
+wide_parser = SanicParser(compile_schemas=True)
+records_parser = SanicParser(compile_schemas=True, result_records=True)
+
+
+@app.route("/echo_wide", methods=["POST"])
+@wide_parser.use_args(wide_args, location="json")
+async def echo_wide(request, args):
+    return J({"count": len(args)})
+
+
+@app.route("/echo_wide_records", methods=["POST"])
+@records_parser.use_args(wide_args, location="json")
+async def echo_wide_records(request, args):
+    return J({"count": len(args), "first": args.field_0})
+
+
+lazy_query_parser = SanicParser(lazy_query=True, query_max_params=2000)
+
+
+@app.route("/echo_query_lazy")
+async def echo_query_lazy(request):
+    parsed = await lazy_query_parser.parse(
+        {"name": fields.Str(required=True), "tags": fields.List(fields.Str())}, request, location="query",
+    )
+    return J(parsed)
+
+
+limited_parser = SanicParser(
+    limits=RequestLimits(
+        max_body_size=1024, max_depth=3, max_list_length=5, max_keys=4, max_query_params=2, schema_lengths=True,
+    ),
+    route_limits={app.name + ".echo_limited_stream": RequestLimits(max_body_size=40)},
+)
+limited_args = {
+    "tags": fields.List(fields.Str(), validate=validate.Length(max=2)),
+    "data": fields.Raw(),
+}
+
+
+@app.route("/echo_limited", methods=["GET", "POST"])
+async def echo_limited(request):
+    location = "query" if request.method == "GET" else "json"
+    parsed = await limited_parser.parse(limited_args, request, location=location)
+    return J(parsed)
+
+
+@app.route("/echo_limited_stream", methods=["POST"], stream=True)
+async def echo_limited_stream(request):
+    parsed = await limited_parser.parse(limited_args, request, location="json_stream")
+    return J(parsed)
+
+
 @app.route("/echo_json_or_form", methods=["POST"])
 async def echo_json_or_form(request):
     parsed = await parser.parse(hello_args, request, location="json_or_form")
@@ -178,6 +336,20 @@ async def echo_file(request):
     return J({"myfile": content})
 
 
+@app.route("/echo_file_stream", methods=["POST"], stream=True)
+async def echo_file_stream(request):
+    args = {
+        "myfile": fields.Field(validate=lambda upload: upload.type == "text/plain"),
+        "other": fields.List(fields.Field()),
+    }
+    result = await parser.parse(args, request, location="files_stream")
+    return J({
+        name: [{"name": upload.name, "size": upload.size, "body": upload.read().decode("utf8")}
+               for upload in (value if isinstance(value, list) else [value])]
+        for name, value in result.items()
+    })
+
+
 @app.route("/echo_view_arg/<view_arg>")
 async def echo_view_arg(request, view_arg):
     parsed = await parser.parse(
@@ -208,6 +380,18 @@ async def echo_nested_many(request):
     return J(parsed)
 
 
+nested_limited_parser = SanicParser(limits=RequestLimits(max_depth=16, max_list_length=10000, max_keys=100))
+
+
+@app.route("/echo_nested_many_limited", methods=["POST"])
+async def echo_nested_many_limited(request):
+    args = {
+        "users": fields.Nested({"id": fields.Int(), "name": fields.Str()}, many=True)
+    }
+    parsed = await nested_limited_parser.parse(args, request)
+    return J(parsed)
+
+
 @app.route("/echo_nested_many_data_key", methods=["POST"])
 async def echo_nested_many_with_data_key(request):
     args = {
@@ -235,6 +419,18 @@ class EchoMethodViewUseKwargs(HTTPMethodView):
 app.add_route(EchoMethodViewUseKwargs.as_view(), "/echo_method_view_use_kwargs")
 
 
+blueprint = Blueprint("echo_blueprint", url_prefix="/blueprint")
+
+
+@blueprint.route("/echo_use_kwargs/<name>")
+@use_kwargs({"value": fields.Int(required=True)}, location="query")
+async def echo_blueprint_use_kwargs(request, name, value):
+    return J({"name": name, "value": value})
+
+
+app.blueprint(blueprint)
+
+
 @app.route("/echo_use_kwargs_missing", methods=["POST"])
 @use_kwargs({"username": fields.Str(required=True), "password": fields.Str()}, location="form")
 async def echo_use_kwargs_missing(request, username, **kwargs):
@@ -0,0 +1,107 @@
+import asyncio
+import dataclasses
+import datetime
+import json
+import typing
+
+import pytest
+from marshmallow import fields
+
+from webargs_sanic.annotations import field_for_type, schema_for_type
+from webargs_sanic.sanicparser import HandleValidationError, SanicParser
+from .apps.sanic_app import app as myapp
+from .test_sanicparser import make_sanic_request
+
+
+class Address(typing.TypedDict):
+    city: str
+    zip_code: typing.Optional[str]
+
+
+@dataclasses.dataclass
+class Order:
+    id: int
+    placed: datetime.date
+    address: Address
+    note: typing.Optional[str] = None
+    quantities: typing.Dict[str, int] = dataclasses.field(default_factory=dict)
+
+
+@pytest.fixture
+def app():
+    return myapp
+
+
+def test_schema_for_type():
+    schema = schema_for_type(Order)
+    assert schema is schema_for_type(Order)
+    assert type(schema.fields["address"].schema) is type(schema_for_type(Address))
+
+    order = schema.load({"id": "3", "placed": "2024-05-01", "address": {"city": "Oslo", "zip_code": None}})
+    assert order == Order(3, datetime.date(2024, 5, 1), {"city": "Oslo", "zip_code": None})
+    assert schema.load({"id": 1, "placed": "2024-05-01", "address": {"city": "Oslo", "zip_code": None}}).quantities == {}
+    assert schema.validate({"id": "x", "address": {}}) == {
+        "id": ["Not a valid integer."],
+        "placed": ["Missing data for required field."],
+        "address": {"city": ["Missing data for required field."], "zip_code": ["Missing data for required field."]},
+    }
+
+
+def test_field_for_type():
+    assert isinstance(field_for_type(typing.List[int]).inner, fields.Integer)
+    assert field_for_type(typing.Optional[int]).load_default is None
+    assert field_for_type(int, default=5).load_default == 5
+    custom = fields.Email()
+    assert field_for_type(typing.Annotated[str, "query", custom]) is custom
+    with pytest.raises(TypeError):
+        field_for_type(object)
+
+
+def test_use_annotations_merges_errors():
+    parser = SanicParser()
+
+    @parser.use_annotations
+    async def handler(request, order: Order, limit: typing.Annotated[int, "query"] = 10):
+        return order, limit
+
+    def make_request(url, payload):
+        req = make_sanic_request(url, {"content-type": "application/json"})
+        req.body = json.dumps(payload).encode()
+        return req
+
+    req = make_request("/", {"id": 1, "placed": "2024-05-01", "address": {"city": "Oslo", "zip_code": "0150"}})
+    order, limit = asyncio.run(handler(req))
+    assert order.address["city"] == "Oslo"
+    assert limit == 10
+
+    req = make_request("/?limit=y", {"id": "x"})
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(handler(req))
+    messages = excinfo.value.exc.messages
+    assert set(messages) == {"json", "query"}
+    assert messages["query"] == {"limit": ["Not a valid integer."]}
+
+
+def test_use_annotations_rejects_conflicts():
+    parser = SanicParser()
+    with pytest.raises(ValueError):
+        @parser.use_annotations
+        async def twice(request, first: Order, second: Order):
+            pass
+    with pytest.raises(ValueError):
+        @parser.use_annotations(location="body_of_water")
+        async def unknown(request, order: Order):
+            pass
+
+
+def test_use_annotations_in_app(app):
+    _, res = app.test_client.post("/echo_use_annotations/5?page=2", json={"name": "Ann", "tags": ["a"]})
+    assert res.status == 200
+    assert res.json == {"user": {"name": "Ann", "tags": ["a"]}, "user_id": 5, "page": 2}
+
+    _, res = app.test_client.post("/echo_use_annotations/x", json={})
+    assert res.status == 422
+    assert res.json == {
+        "json": {"name": ["Missing data for required field."]},
+        "view_args": {"user_id": ["Not a valid integer."]},
+    }
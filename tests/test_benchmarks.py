@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+
+from benchmarks.cases import CASES
+from benchmarks.run import compare
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_benchmark_cases_get_expected_status(tmp_path):
+    # run in a subprocess, the ASGI client leaves the shared test app finalized
+    output = tmp_path / "results.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "run", "-n", "1", "-r", "1", "-o", str(output)],
+        cwd=ROOT, check=True, stdout=subprocess.DEVNULL,
+    )
+
+    results = json.loads(output.read_text())
+    assert set(results["results"]) == {case.name for case in CASES}
+    assert results["environment"]["webargs_sanic"]
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"fast": {"median": 100.0}, "slow": {"median": 100.0}, "gone": {"median": 1.0}}}
+    current = {"results": {"fast": {"median": 105.0}, "slow": {"median": 130.0}, "new": {"median": 1.0}}}
+
+    rows = {row["name"]: row for row in compare(baseline, current, threshold=0.1)}
+
+    assert set(rows) == {"fast", "slow"}
+    assert not rows["fast"]["regression"]
+    assert rows["slow"]["regression"]
+    assert rows["slow"]["ratio"] == 1.3
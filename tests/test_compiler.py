@@ -0,0 +1,255 @@
+import datetime
+
+import marshmallow as ma
+import pytest
+from webargs import fields, validate
+from webargs.multidictproxy import MultiDictProxy
+from multidict import MultiDict
+
+from webargs_sanic.artifacts import ArtifactCache, cache_tag, main as prebuild
+from webargs_sanic.compiler import compile_dump_schema, compile_schema
+from webargs_sanic.records import Record, record_class
+from webargs_sanic.sanicparser import SanicParser
+from .apps.sanic_app import HelloSchema, hello_args, hello_multiple, app as myapp
+
+
+class Email(ma.fields.Field):
+    def _deserialize(self, value, attr, obj, **kwargs):
+        value = value.strip().lower()
+        if "@" not in value:
+            raise self.make_error("validator_failed")
+        return value
+
+
+user_data = {
+    "email": Email(required=True),
+    "password": fields.Str(required=False, validate=lambda value: len(value) >= 8),
+    "first_name": fields.Str(required=True, validate=lambda value: len(value) >= 1),
+    "middle_name": fields.Str(allow_none=True),
+    "gender": fields.Str(required=True, validate=validate.OneOf(["M", "F"])),
+    "birth_date": fields.Date(required=False),
+    "age": fields.Int(validate=validate.Range(min=18), data_key="years"),
+    "strict_age": fields.Int(strict=True),
+    "active": fields.Bool(load_default=True),
+    "opt_in": fields.Bool(truthy={"yes"}, falsy={"no"}),
+    "created": fields.Date(load_default=lambda: datetime.date(2020, 1, 1)),
+}
+
+user_update = {
+    "user_data": fields.Nested({"email": Email(), "first_name": fields.Str()}),
+    "user_id": fields.Str(required=True, validate=lambda x: len(x) == 32),
+}
+
+SCHEMAS = [
+    ma.Schema.from_dict(hello_args)(),
+    ma.Schema.from_dict(hello_multiple)(),
+    HelloSchema(),
+    ma.Schema.from_dict(user_data)(),
+    ma.Schema.from_dict(user_update)(),
+]
+
+INPUTS = [
+    {},
+    {"name": "Ann"},
+    {"name": "Al"},
+    {"name": 42},
+    {"name": None},
+    {"name": b"Bob"},
+    {"name": ["a", "b"]},
+    {"name": "Ann", "extra": 1},
+    {
+        "email": " Ann@Example.COM ", "first_name": "Ann", "gender": "F",
+        "birth_date": "2000-02-29", "years": "21", "strict_age": 3, "active": "false",
+        "opt_in": "yes", "middle_name": None,
+    },
+    {
+        "email": "nope", "first_name": "", "gender": "X", "birth_date": "2000-02-30",
+        "years": 12, "strict_age": "3", "active": "maybe", "opt_in": True, "password": "short",
+    },
+    {"years": True, "strict_age": 3.5, "active": 1, "opt_in": "no", "gender": None},
+    {"user_id": "x" * 32, "user_data": {"email": "a@b.c", "first_name": 1}},
+    {"user_id": "x", "user_data": "nope"},
+    ["not", "a", "mapping"],
+    "not a mapping",
+]
+
+
+def load_with(loader, data, **kwargs):
+    try:
+        return "ok", loader(data, **kwargs)
+    except ma.ValidationError as error:
+        return "error", (error.messages, error.valid_data)
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+@pytest.mark.parametrize("unknown", [None, ma.RAISE, ma.INCLUDE, ma.EXCLUDE])
+def test_compiled_loader_matches_marshmallow(schema, unknown):
+    loader = compile_schema(schema)
+    assert loader is not None
+
+    kwargs = {"unknown": unknown} if unknown else {}
+    for data in INPUTS:
+        assert load_with(loader, data, **kwargs) == load_with(schema.load, data, **kwargs), data
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+@pytest.mark.parametrize("unknown", [None, ma.RAISE, ma.INCLUDE, ma.EXCLUDE])
+def test_compiled_record_loader_matches_marshmallow(schema, unknown):
+    loader = compile_schema(schema, record_class=record_class(schema))
+
+    kwargs = {"unknown": unknown} if unknown else {}
+    for data in INPUTS:
+        status, result = load_with(loader, data, **kwargs)
+        assert (status, result) == load_with(schema.load, data, **kwargs), data
+        assert status == "error" or isinstance(result, Record)
+
+
+def test_compiled_loader_matches_marshmallow_on_multidict():
+    schema = ma.Schema.from_dict(hello_multiple)()
+    data = MultiDictProxy(MultiDict([("name", "a"), ("name", "b"), ("other", "c")]), schema)
+
+    for unknown in (ma.RAISE, ma.INCLUDE, ma.EXCLUDE):
+        assert load_with(compile_schema(schema), data, unknown=unknown) == load_with(
+            schema.load, data, unknown=unknown
+        )
+
+
+def test_unsupported_schemas_are_not_compiled():
+    class WithHook(ma.Schema):
+        name = fields.Str()
+
+        @ma.post_load
+        def upper(self, data, **kwargs):
+            return {"name": data["name"].upper()}
+
+    assert compile_schema(HelloSchema(many=True)) is None
+    assert compile_schema(HelloSchema(partial=True)) is None
+    assert compile_schema(WithHook()) is None
+    assert compile_schema(ma.Schema.from_dict({"name": fields.Str(attribute="a.b")})()) is None
+
+
+def test_parser_uses_compiled_loader():
+    parser = SanicParser(compile_schemas=True)
+    schema = parser._get_schema(hello_args, None)
+
+    loader = parser.get_schema_loader(schema)
+
+    assert loader is not schema.load
+    assert parser.get_schema_loader(schema) is loader
+    many_schema = HelloSchema(many=True)
+    assert parser.get_schema_loader(many_schema) == many_schema.load
+    assert SanicParser().get_schema_loader(schema) == schema.load
+
+
+def test_compiled_parser_in_app():
+    _, res = myapp.test_client.get("/echo_compiled", params={"name": "Ann"})
+    assert res.json == {"name": "Ann"}
+
+    _, res = myapp.test_client.get("/echo_compiled", params={"name": "Al"})
+    assert res.status_code == 422
+    assert res.json == {"query": {"name": ["Invalid value."]}}
+
+
+class User:
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+
+
+dump_fields = {
+    "name": fields.Str(),
+    "age": fields.Int(data_key="years"),
+    "score": fields.Float(dump_default=0.5),
+    "active": fields.Bool(dump_default=lambda: True),
+    "id": fields.Int(as_string=True),
+    "city": fields.Str(attribute="address.city"),
+    "born": fields.Date(),
+    "tags": fields.List(fields.Str()),
+    "label": fields.Function(lambda obj: "user"),
+}
+
+DUMP_OBJECTS = [
+    {},
+    {"name": "Ann", "age": 30, "score": 1.5, "active": False, "id": 7, "tags": ["a"]},
+    {"name": 42, "age": "30", "score": 2, "active": 1, "born": datetime.date(2000, 1, 1)},
+    {"name": None, "age": None, "score": None, "active": None, "address": {"city": "Kyiv"}},
+    User(name="Bob", age=True, address=User(city="Lviv")),
+    User(),
+]
+
+
+@pytest.mark.parametrize("schema", [
+    ma.Schema.from_dict(dump_fields)(),
+    ma.Schema.from_dict(dump_fields)(only=("name", "age")),
+    HelloSchema(),
+])
+def test_compiled_dumper_matches_marshmallow(schema):
+    dump = compile_dump_schema(schema)
+    assert dump is not None
+
+    for obj in DUMP_OBJECTS:
+        assert dump(obj) == schema.dump(obj), obj
+    assert dump(DUMP_OBJECTS, many=True) == schema.dump(DUMP_OBJECTS, many=True)
+
+
+def test_compiled_dumper_many_schema():
+    schema = HelloSchema(many=True)
+    dump = compile_dump_schema(schema)
+
+    assert dump([{"name": "Ann"}, {}]) == schema.dump([{"name": "Ann"}, {}]) == [{"name": "Ann"}, {}]
+    assert dump({"name": "Ann"}, many=False) == {"name": "Ann"}
+
+
+def test_unsupported_schemas_are_not_compiled_for_dump():
+    class WithHook(ma.Schema):
+        name = fields.Str()
+
+        @ma.post_dump
+        def upper(self, data, **kwargs):
+            return {"name": data["name"].upper()}
+
+    class Ordered(ma.Schema):
+        name = fields.Str()
+
+        class Meta:
+            ordered = True
+
+    assert compile_dump_schema(WithHook()) is None
+    assert compile_dump_schema(Ordered()) is None
+
+
+def test_artifact_cache_shares_compiled_code(tmp_path):
+    schema = ma.Schema.from_dict(user_data)()
+    first = SanicParser(compile_schemas=True, artifact_dir=str(tmp_path))
+    first.get_schema_loader(schema)
+    first.get_schema_dumper(schema)
+    assert first.artifacts.stats() == {"hits": 0, "misses": 2, "writes": 2}
+    assert len(list((tmp_path / cache_tag()).iterdir())) == 2
+
+    second = SanicParser(compile_schemas=True, artifact_dir=str(tmp_path))
+    loader = second.get_schema_loader(ma.Schema.from_dict(user_data)())
+    assert second.artifacts.stats() == {"hits": 1, "misses": 0, "writes": 0}
+    for data in INPUTS:
+        assert load_with(loader, data) == load_with(schema.load, data)
+
+    other = ma.Schema.from_dict({**user_data, "age": fields.Int(data_key="age")})()
+    second.get_schema_loader(other)
+    assert second.artifacts.misses == 1
+
+
+def test_artifact_cache_ignores_broken_files(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    source = "def load(data):\n    return data\n"
+    cache.compile(source, "<test>")
+    with open(cache.path(source), "wb") as fp:
+        fp.write(b"garbage")
+
+    namespace = {}
+    exec(ArtifactCache(str(tmp_path)).compile(source, "<test>"), namespace)
+    assert namespace["load"](1) == 1
+
+
+def test_prebuild_command(tmp_path, capsys):
+    assert prebuild(["tests.apps.sanic_app:parser", "--dir", str(tmp_path)]) == 0
+
+    assert "written to {}".format(tmp_path / cache_tag()) in capsys.readouterr().out
+    assert list((tmp_path / cache_tag()).iterdir())
@@ -1,12 +1,26 @@
+import asyncio
 import json
+import subprocess
+import sys
+import threading
+import time
+import weakref
 from http import HTTPStatus
+from types import MappingProxyType, SimpleNamespace
+from urllib.parse import urlencode
 
+import marshmallow as ma
 import pytest
-from webargs import ValidationError
-from sanic import Sanic
+from webargs import ValidationError, fields
+from sanic import Sanic, response
+from sanic.compat import Header
 
-from webargs_sanic.sanicparser import HandleValidationError, abort
-from .apps.sanic_app import app as myapp
+from webargs_sanic.decoders import DecoderRegistry
+from webargs_sanic.limits import LimitExceeded, RequestLimits
+from webargs_sanic.metrics import ParseMetrics
+from webargs_sanic.sanicparser import HandleValidationError, SanicParser, abort
+from webargs_sanic.streaming import JSONStreamDecoder, MultipartDecoder, iter_lines
+from .apps.sanic_app import HelloSchema, app as myapp, hello_args, hello_multiple, metrics as app_metrics
 
 
 @pytest.fixture
@@ -131,3 +145,1294 @@ def test_abort_has_serializable_data():
         error = json.loads(serialized_error)
         assert isinstance(error, dict)
         assert error["message"] == "custom error message"
+
+
+def test_schema_cache_reuses_schema_for_same_dict():
+    parser = SanicParser()
+    args = {"name": fields.Str()}
+
+    schema = parser._get_schema(args, None)
+
+    assert parser._get_schema(args, None) is schema
+    assert parser._get_schema(dict(args), None) is schema
+    assert parser._get_schema({"name": fields.Str()}, None) is not schema
+    assert parser.schema_cache.stats()["hits"] == 2
+    assert parser.schema_cache.stats()["misses"] == 2
+
+
+def test_schema_cache_rebuilds_schema_for_dict_changed_in_place():
+    parser = SanicParser()
+    args = {"name": fields.Str()}
+
+    schema = parser._get_schema(args, None)
+    args["name"] = fields.Int()
+
+    assert parser._get_schema(args, None) is not schema
+    assert parser._get_schema(args, None).load({"name": "1"}) == {"name": 1}
+
+
+def test_schema_cache_evicts_least_recently_used():
+    parser = SanicParser(schema_cache_size=2)
+    first, second, third = ({"name": fields.Str()} for _ in range(3))
+
+    schema = parser._get_schema(first, None)
+    parser._get_schema(second, None)
+    parser._get_schema(third, None)
+
+    assert parser.schema_cache.evictions == 1
+    assert len(parser.schema_cache) == 2
+    assert parser._get_schema(first, None) is not schema
+
+
+def test_schema_cache_disabled():
+    parser = SanicParser(schema_cache_size=0)
+    args = {"name": fields.Str()}
+
+    assert parser._get_schema(args, None) is not parser._get_schema(args, None)
+    assert parser.schema_cache.stats()["misses"] == 2
+
+
+def make_request(**attrs):
+    attrs.setdefault("ctx", SimpleNamespace())
+    return SimpleNamespace(**attrs)
+
+
+def test_json_body_is_decoded_once_per_request():
+    decoded = []
+
+    def load_json():
+        decoded.append(True)
+        return {"name": "Ann"}
+
+    parser = SanicParser()
+    req = make_request(body=b'{"name": "Ann"}', content_type="application/json", load_json=load_json)
+
+    assert parser.load_json(req) == {"name": "Ann"}
+    assert parser.load_json(req, parser._get_schema({"name": fields.Str()}, req)) == {"name": "Ann"}
+    assert len(decoded) == 1
+    assert req.ctx.webargs_cache["json"] == {"name": "Ann"}
+
+
+def test_location_proxies_are_shared_within_request():
+    parser = SanicParser()
+    schema = parser._get_schema({"name": fields.Str()}, None)
+    req = make_request(headers={"name": "Ann"})
+
+    assert parser.load_headers(req, schema) is parser.load_headers(req, schema)
+    assert parser.load_headers(make_request(headers={}), schema) is not parser.load_headers(req, schema)
+
+
+def test_location_cache_disabled():
+    parser = SanicParser(cache_location_data=False)
+    schema = parser._get_schema({"name": fields.Str()}, None)
+    req = make_request(headers={"name": "Ann"})
+
+    assert parser.load_headers(req, schema) is not parser.load_headers(req, schema)
+    assert not hasattr(req.ctx, "webargs_cache")
+
+
+def test_custom_json_loads_receives_raw_body():
+    received = []
+
+    def json_loads(body):
+        received.append(body)
+        return json.loads(body)
+
+    parser = SanicParser(json_loads=json_loads)
+    req = make_request(body=b'{"name": "Ann"}', content_type="application/json; charset=utf-8")
+
+    assert parser.load_json(req) == {"name": "Ann"}
+    assert received == [b'{"name": "Ann"}']
+
+
+def test_custom_json_loads_invalid_body():
+    orjson = pytest.importorskip("orjson")
+    parser = SanicParser(json_loads=orjson.loads)
+    req = make_request(body=b'{"name": ', content_type="application/json")
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        parser.load_json(req)
+
+    assert excinfo.value.status_code == 400
+    assert excinfo.value.exc.message == {"json": ["Invalid JSON body."]}
+
+
+def test_parsing_json_stream(app):
+    _, res = app.test_client.post("/echo_json_stream", json={"name": "Ann", "count": 3})
+
+    assert res.status_code == 200
+    assert res.json == {"name": "Ann", "count": 3}
+
+
+def test_parsing_json_stream_invalid_field(app):
+    _, res = app.test_client.post("/echo_json_stream", json={"count": "many", "name": "Ann"})
+
+    assert res.status_code == 422
+    assert res.json == {"json_stream": {"count": ["Not a valid integer."]}}
+
+
+def test_parsing_json_stream_invalid_json(app):
+    _, res = app.test_client.post(
+        "/echo_json_stream", content='{"name": "Ann",', headers={"Content-Type": "application/json"}
+    )
+
+    assert res.status_code == 400
+    assert res.json == {"json": ["Invalid JSON body."]}
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    async def read(self):
+        return self.chunks.pop(0) if self.chunks else None
+
+
+def test_json_stream_stops_reading_at_first_invalid_key():
+    chunks = [b'{"count": ["x', b'"], "name": ', b'"Ann"}']
+    req = make_request(body=b"", content_type="application/json", stream=FakeStream(chunks))
+    parser = SanicParser()
+    schema = parser._get_schema({"name": fields.Str(), "count": fields.Int()}, req)
+
+    with pytest.raises(ValidationError) as excinfo:
+        asyncio.run(parser.load_json_stream(req, schema))
+
+    assert excinfo.value.messages == {"count": ["Not a valid integer."]}
+    assert req.stream.chunks == [b'"Ann"}']
+
+
+def test_json_stream_validates_values_once():
+    calls = []
+    req = make_request(body=b'{"name": "Ann", "tags": ["a", "b"]}', content_type="application/json")
+    parser = SanicParser()
+    argmap = {"name": fields.Str(validate=calls.append), "tags": fields.List(fields.Str(), validate=calls.append)}
+
+    assert asyncio.run(parser.parse(argmap, req, location="json_stream")) == {"name": "Ann", "tags": ["a", "b"]}
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("field, value", [
+    (fields.Int(), [1]),
+    (fields.Str(), 1),
+    (fields.Bool(), {}),
+    (fields.List(fields.Int()), "1"),
+    (fields.List(fields.Int(), validate=ma.validate.Length(max=2)), [1, 2, 3]),
+    (fields.Dict(), []),
+    (fields.Nested({"a": fields.Int()}), 1),
+    (fields.Nested({"a": fields.Int()}, many=True), {}),
+    (fields.Str(), None),
+])
+def test_json_stream_value_checks_match_schema_errors(field, value):
+    schema = ma.Schema.from_dict({"a": field})()
+    with pytest.raises(ValidationError) as expected:
+        schema.load({"a": value})
+
+    with pytest.raises(ValidationError) as excinfo:
+        SanicParser().get_value_checks(schema)["a"](value)
+
+    assert {"a": excinfo.value.messages} == expected.value.messages
+
+
+@pytest.mark.parametrize("body", [b'{"a": [1, {"b": "}\\\\\\""}], "c": null}', b'[1, "x,y", {"z": []}]'])
+def test_json_stream_decoder_matches_json_loads(body):
+    decoder = JSONStreamDecoder()
+    members = []
+    for index in range(len(body)):
+        members.extend(decoder.feed(body[index:index + 1]))
+    decoder.close()
+
+    expected = json.loads(body)
+    if isinstance(expected, dict):
+        assert dict(members) == expected
+    else:
+        assert [value for _, value in members] == expected
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1,}', b'{"a": 1', b'{"a": 1} x', b'[1, ]', b'"a"', b'{"a" 1}'])
+def test_json_stream_decoder_rejects_invalid_json(body):
+    decoder = JSONStreamDecoder()
+    with pytest.raises(ValueError):
+        decoder.feed(body)
+        decoder.close()
+
+
+@pytest.mark.parametrize("module, dumps, content_type", [
+    ("msgpack", "packb", "application/msgpack"),
+    ("msgpack", "packb", "application/x-msgpack; charset=binary"),
+    ("cbor2", "dumps", "application/cbor"),
+])
+def test_parsing_binary_body(app, module, dumps, content_type):
+    dumps = getattr(pytest.importorskip(module), dumps)
+    headers = {"Content-Type": content_type}
+
+    _, res = app.test_client.post("/echo_body", content=dumps({"name": "Fred"}), headers=headers)
+    assert res.status_code == 200
+    assert res.json == {"name": "Fred"}
+
+    _, res = app.test_client.post("/echo_body", content=dumps({"name": "Al"}), headers=headers)
+    assert res.status_code == 422
+    assert res.json == {"body": {"name": ["Invalid value."]}}
+
+
+def test_parsing_invalid_binary_body(app):
+    pytest.importorskip("msgpack")
+    _, res = app.test_client.post("/echo_body", content=b"\xc1", headers={"Content-Type": "application/msgpack"})
+
+    assert res.status_code == 400
+    assert res.json == {"body": ["Invalid request body."]}
+
+
+def test_parsing_body_falls_back_to_json_and_form(app):
+    _, res = app.test_client.post("/echo_body", json={"name": "Fred"})
+    assert res.json == {"name": "Fred"}
+
+    _, res = app.test_client.post("/echo_body", data={"name": "Joe"})
+    assert res.json == {"name": "Joe"}
+
+
+def test_body_decoders_registry():
+    decoded = []
+
+    def decode(data):
+        decoded.append(type(data))
+        return dict(item.split("=") for item in bytes(data).decode().split("&"))
+
+    parser = SanicParser(body_decoders={"Text/X-Pairs": decode})
+    req = make_request(body=b"name=Ann", content_type="text/x-pairs; charset=utf-8")
+
+    assert asyncio.run(parser.parse(hello_args, req, location="body")) == {"name": "Ann"}
+    assert parser.load_body(req, None) == {"name": "Ann"}
+    assert decoded == [memoryview]
+    assert "text/x-pairs" in parser.body_decoders
+    assert "application/msgpack" not in parser.body_decoders
+    assert isinstance(SanicParser().body_decoders, DecoderRegistry)
+
+
+NDJSON_HEADERS = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest.mark.parametrize("path", ["/echo_ndjson", "/echo_ndjson_stream"])
+def test_parsing_ndjson(app, path):
+    _, res = app.test_client.post(path, content='{"id": 1}\n\n{"id": "2"}\n{"id": 3}', headers=NDJSON_HEADERS)
+
+    assert res.status_code == 200
+    assert res.json == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+@pytest.mark.parametrize("path", ["/echo_ndjson", "/echo_ndjson_stream"])
+def test_parsing_ndjson_errors_keyed_by_line(app, path):
+    _, res = app.test_client.post(path, content='{"id": 1}\n{"id": "x"}\n\n{}\n', headers=NDJSON_HEADERS)
+
+    assert res.status_code == 422
+    assert res.json == {"ndjson": {
+        "2": {"id": ["Not a valid integer."]},
+        "4": {"id": ["Missing data for required field."]},
+    }}
+
+
+def test_parsing_ndjson_invalid_line(app):
+    _, res = app.test_client.post("/echo_ndjson", content='{"id": 1}\n{"id": 2,\n', headers=NDJSON_HEADERS)
+
+    assert res.status_code == 400
+    assert res.json == {"ndjson": {"2": ["Invalid JSON."]}}
+
+
+def test_parsing_ndjson_other_content_type(app):
+    _, res = app.test_client.post("/echo_ndjson", json={"id": 1})
+
+    assert res.status_code == 200
+    assert res.json == []
+
+
+def test_iter_lines_across_chunks():
+    chunks = [b'{"a":', b' 1}\n\r\n{"b"', b": 2}\n", b"\n", b'{"c": 3}']
+    req = make_request(body=b"", content_type="application/x-ndjson", stream=FakeStream(chunks))
+
+    async def consume():
+        return [item async for item in iter_lines(req)]
+
+    assert asyncio.run(consume()) == [(1, b'{"a": 1}'), (3, b'{"b": 2}'), (5, b'{"c": 3}')]
+
+
+def test_iter_args_with_ndjson_stream():
+    chunks = [b'{"id": 1}\n{"id": "x"}\n', b'{"id": 3}\n']
+    req = make_request(body=b"", content_type="application/x-ndjson", stream=FakeStream(chunks))
+    items = SanicParser().iter_args({"id": fields.Int()}, req, location="ndjson", chunk_size=1)
+
+    async def consume():
+        return [chunk async for chunk in items]
+
+    assert asyncio.run(consume()) == [[{"id": 1}], [{"id": 3}]]
+    assert items.errors == {2: {"id": ["Not a valid integer."]}}
+
+
+def test_parsing_files_stream(app):
+    _, res = app.test_client.post("/echo_file_stream", files=[
+        ("myfile", ("a.txt", b"hello", "text/plain")),
+        ("ignored", ("b.bin", b"x" * 10000, "application/octet-stream")),
+        ("other", ("c.txt", b"1", "text/plain")),
+        ("other", ("d.txt", b"22", "text/plain")),
+    ])
+
+    assert res.status_code == 200
+    assert res.json == {
+        "myfile": [{"name": "a.txt", "size": 5, "body": "hello"}],
+        "other": [{"name": "c.txt", "size": 1, "body": "1"}, {"name": "d.txt", "size": 2, "body": "22"}],
+    }
+
+
+def test_parsing_files_stream_invalid_part(app):
+    _, res = app.test_client.post("/echo_file_stream", files={"myfile": ("a.png", b"png", "image/png")})
+
+    assert res.status_code == 422
+    assert res.json == {"files_stream": {"myfile": ["Invalid value."]}}
+
+
+def test_files_stream_validates_part_content_once():
+    body = (
+        b"--xyz\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.png\"\r\n"
+        b"Content-Type: image/png\r\n\r\n\x89PNGrest\r\n--xyz--\r\n"
+    )
+    req = make_request(body=b"", headers={}, content_type="multipart/form-data; boundary=xyz",
+                       stream=FakeStream([body[:50], body[50:]]))
+    seen = []
+
+    def is_png(upload):
+        seen.append(upload.read(4))
+        return seen[-1] == b"\x89PNG"
+
+    result = asyncio.run(SanicParser().parse({"image": fields.Field(validate=is_png)}, req, location="files_stream"))
+
+    assert seen == [b"\x89PNG"]
+    assert result["image"].name == "a.png"
+
+
+def test_files_stream_stops_reading_at_first_oversized_part():
+    body = (
+        b"--xyz\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.png\"\r\n\r\n12345\r\n"
+        b"--xyz\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhi\r\n--xyz--\r\n"
+    )
+    chunks = [body[:90], body[90:110], body[110:]]
+    req = make_request(body=b"", headers={}, content_type="multipart/form-data; boundary=xyz",
+                       stream=FakeStream(chunks))
+    seen = []
+    args = {"image": fields.Field(validate=[ma.validate.Length(max=4), seen.append]), "note": fields.Field()}
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(SanicParser().parse(args, req, location="files_stream"))
+
+    assert excinfo.value.exc.messages == {"files_stream": {"image": ["Longer than maximum length 4."]}}
+    assert req.stream.chunks == chunks[1:]
+    assert seen == []
+
+
+def test_multipart_decoder_spools_large_parts_to_disk():
+    boundary = "xyz"
+    body = (
+        b"--xyz\r\nContent-Disposition: form-data; name=\"big\"; filename=\"big.bin\"\r\n"
+        b"Content-Type: application/octet-stream\r\n\r\n" + b"\r\n-" * 500 + b"\r\n"
+        b"--xyz\r\nContent-Disposition: form-data; name=\"skipped\"\r\n\r\nvalue\r\n"
+        b"--xyz--\r\n"
+    )
+    seen = []
+    decoder = MultipartDecoder(boundary, lambda name: seen.append(name) or name == "big", spool_max_size=100)
+    uploads = []
+    for index in range(0, len(body), 7):
+        uploads.extend(decoder.feed(body[index:index + 7]))
+    decoder.close()
+
+    assert seen == ["big", "skipped"]
+    assert [upload.field_name for upload in uploads] == ["big"]
+    assert uploads[0].size == 1500
+    assert uploads[0].on_disk
+    assert uploads[0].read() == b"\r\n-" * 500
+
+
+def test_multipart_decoder_rejects_truncated_body():
+    decoder = MultipartDecoder("xyz", lambda name: True, spool_max_size=100)
+    decoder.feed(b"--xyz\r\nContent-Disposition: form-data; name=\"a\"\r\n\r\nabc")
+
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+def make_json_request(payload):
+    body = json.dumps(payload).encode()
+    return make_request(body=body, content_type="application/json", headers={}, load_json=lambda: json.loads(body))
+
+
+def test_validation_offloaded_above_threshold():
+    threads = []
+
+    def record_thread(value):
+        threads.append(threading.current_thread())
+
+    args = {"name": fields.Str(validate=record_thread)}
+    parser = SanicParser(offload_threshold=20)
+
+    assert asyncio.run(parser.parse(args, make_json_request({"name": "Ann"}))) == {"name": "Ann"}
+    assert asyncio.run(parser.parse(args, make_json_request({"name": "Ann" * 10}))) == {"name": "Ann" * 10}
+    assert threads[0] is threading.main_thread()
+    assert threads[1] is not threading.main_thread()
+
+
+def test_offloaded_validation_errors_and_timeout():
+    args = {"name": fields.Str(validate=lambda value: time.sleep(0.2) or len(value) > 3)}
+    parser = SanicParser(offload_threshold=0, offload_timeout=0.05)
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, make_json_request({"name": "Ann"})))
+    assert excinfo.value.status_code == 503
+
+    parser.offload_timeout = None
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, make_json_request({"name": "Ann"})))
+    assert excinfo.value.status_code == 422
+    assert excinfo.value.exc.messages == {"json": {"name": ["Invalid value."]}}
+
+
+def test_metrics_record_timings_and_errors():
+    metrics = ParseMetrics()
+    parser = SanicParser(metrics=metrics)
+    args = {"name": fields.Str(validate=lambda value: len(value) >= 3)}
+
+    asyncio.run(parser.parse(args, make_json_request({"name": "Ann"})))
+    with pytest.raises(HandleValidationError):
+        asyncio.run(parser.parse(args, make_json_request({"name": "A"})))
+
+    ((key, data),) = metrics.snapshot().items()
+    assert key == ("", "json")
+    assert data["load_seconds_count"] == data["validation_seconds_count"] == 2
+    assert data["validation_seconds_sum"] > 0
+    assert data["payload_bytes_sum"] == len(b'{"name": "Ann"}') + len(b'{"name": "A"}')
+    assert data["errors"] == {422: 1}
+    assert SanicParser().metrics is None
+
+
+def test_metrics_route():
+    app_metrics.reset()
+    myapp.test_client.post("/echo_metrics", json={"name": "Ann"})
+    myapp.test_client.post("/echo_metrics", json={"name": "A"})
+    myapp.test_client.post("/echo_metrics", content="{", headers={"content-type": "application/json"})
+
+    _, res = myapp.test_client.get("/metrics")
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/plain")
+    labels = 'route="tests_apps_sanic_app.echo_metrics",location="json"'
+    assert "webargs_sanic_load_seconds_count{%s} 2" % labels in res.text
+    assert "webargs_sanic_validation_seconds_count{%s} 2" % labels in res.text
+    assert 'webargs_sanic_errors_total{%s,status="400"} 1' % labels in res.text
+    assert 'webargs_sanic_errors_total{%s,status="422"} 1' % labels in res.text
+
+
+def test_error_messages_are_string_keyed():
+    parser = SanicParser()
+    schema = parser._get_schema({"name": fields.Str()}, None)
+    messages = {"json": {"name": ["Invalid value."]}}
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        parser.handle_error(ValidationError(messages), None, schema, error_status_code=None, error_headers=None)
+    assert excinfo.value.exc.messages is messages
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        parser.handle_error(ValidationError({"json": {"ids": {0: [ValueError("bad")]}}}), None, schema,
+                            error_status_code=None, error_headers=None)
+    assert excinfo.value.exc.messages == {"json": {"ids": {"0": ["bad"]}}}
+    assert excinfo.value.body == b'{"json": {"ids": {"0": ["bad"]}}}'
+    assert excinfo.value.body is excinfo.value.body
+
+
+def test_error_context_is_weak_unless_kept():
+    schema = SanicParser()._get_schema({"name": fields.Str()}, None)
+    req = myapp.request_class(b"/", {}, None, "GET", None, myapp)
+    body = {"name": "x" * 1000}
+
+    def make_error():
+        return ValidationError({"json": {"name": ["Invalid value."]}}, data=body, valid_data={})
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        SanicParser().handle_error(make_error(), req, schema, error_status_code=None, error_headers=None)
+    assert type(excinfo.value.data["req"]) is weakref.ProxyType
+    assert type(excinfo.value.data["schema"]) is weakref.ProxyType
+    assert excinfo.value.schema.fields == schema.fields
+    assert excinfo.value.exc.data is None
+    assert excinfo.value.exc.valid_data is None
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        SanicParser(keep_error_context=True).handle_error(
+            make_error(), req, schema, error_status_code=None, error_headers={"X-Error": "1"})
+    assert excinfo.value.data["req"] is req
+    assert excinfo.value.data["schema"] is schema
+    assert excinfo.value.exc.data is body
+    response = excinfo.value.response()
+    assert response.status == 422
+    assert response.headers["X-Error"] == "1"
+    assert json.loads(response.body) == {"json": {"name": ["Invalid value."]}}
+
+
+def test_invalid_json_error_body_is_prerendered():
+    parser = SanicParser()
+    req = make_request(body=b"{", content_type="application/json", load_json=lambda: json.loads(b"{"))
+
+    with pytest.raises(HandleValidationError) as first:
+        parser.load_json(req)
+    with pytest.raises(HandleValidationError) as second:
+        parser.load_json(make_request(body=b"[", content_type="application/json", load_json=lambda: json.loads(b"[")))
+
+    assert first.value.status_code == 400
+    assert first.value.body == b'{"json": ["Invalid JSON body."]}'
+    assert first.value.body is second.value.body
+    assert first.value.data["req"] is None
+    assert first.value.exc.doc is None
+
+
+def make_sanic_request(url, headers):
+    return myapp.request_class(url.encode(), Header(headers), "1.1", "GET", None, myapp)
+
+
+@pytest.mark.parametrize("url", [
+    "/?name=abc&name=def&x-extra=1&names=2&xname=3",
+    "/?%6Eame=abc&n%61me=d%20f&na%4De=x&name=&name&=1",
+    "/?first+name=Ann&first%20name=Bob&first%2Bname=Eve&caf%C3%A9=1&caf%c3%a9=2",
+    "/?name=a=b&&name=%ZZ+%E2%82",
+    "/",
+])
+def test_lazy_query_loads_declared_keys_like_request_args(url):
+    unknown_keys = {"x-extra-{}".format(index): str(index) for index in range(50)}
+    url += ("&" if "?" in url else "?") + "&".join("{}={}".format(key, value) for key, value in unknown_keys.items())
+    argmap = {"name": fields.List(fields.Str()), "first name": fields.List(fields.Str()),
+              "first+name": fields.List(fields.Str()), "café": fields.List(fields.Str())}
+    expected = asyncio.run(SanicParser().parse(argmap, make_sanic_request(url, {}), location="query"))
+    req = make_sanic_request(url, {})
+    parser = SanicParser(lazy_query=True)
+
+    assert asyncio.run(parser.parse(argmap, req, location="query")) == expected
+    assert not req.parsed_args
+    assert req.ctx.webargs_cache[("lazy_query", parser.DEFAULT_QUERY_MAX_PARAMS)]._raw is None
+
+
+def test_lazy_query_applies_unknown_policy():
+    parser = SanicParser(lazy_query=True)
+    req = make_sanic_request("/?name=Ann&extra=1&extra=2", {})
+
+    assert asyncio.run(parser.parse(hello_args, req, location="query", unknown=ma.INCLUDE)) == {
+        "name": "Ann", "extra": "1"}
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(hello_args, req, location="query", unknown=ma.RAISE))
+    assert excinfo.value.exc.messages == {"query": {"extra": ["Unknown field."]}}
+
+
+def test_use_kwargs_on_blueprint_route():
+    _, res = myapp.test_client.get("/blueprint/echo_use_kwargs/Ann", params={"value": 42})
+    assert res.json == {"name": "Ann", "value": 42}
+
+
+def test_request_position_is_resolved_from_signature():
+    parser = SanicParser()
+    req = make_sanic_request("/", {})
+    other = make_sanic_request("/", {})
+
+    async def handler(request, name):
+        pass
+
+    class View:
+        async def get(self, request):
+            pass
+
+    async def wrapped(*args, **kwargs):
+        pass
+
+    assert parser._request_getter(handler)((req, other), {}) is req
+    assert parser._request_getter(handler)((), {"request": req}) is req
+    assert parser._request_getter(View.get)((View(), req), {}) is req
+    assert parser._request_getter(View().get)((req,), {}) is req
+    # handlers whose signature does not tell fall back to searching the arguments
+    assert parser._request_getter(wrapped)(("x", req), {}) is req
+    assert parser._request_getter(handler)(("x", req), {}) is req
+    with pytest.raises(ValueError):
+        parser._request_getter(handler)(("x",), {})
+
+
+def test_use_kwargs_with_keyword_request():
+    parser = SanicParser()
+
+    @parser.use_kwargs({"name": fields.Str()}, location="query")
+    async def handler(request, name):
+        return name
+
+    assert asyncio.run(handler(request=make_sanic_request("/?name=Ann", {}))) == "Ann"
+
+
+def test_use_args_arg_name():
+    parser = SanicParser()
+
+    @parser.use_args({"name": fields.Str()}, location="query", arg_name="q")
+    @parser.use_args(MappingProxyType({"page": fields.Int()}), location="query", arg_name="p")
+    async def handler(request, q, p):
+        return q, p
+
+    assert asyncio.run(handler(make_sanic_request("/?name=Ann&page=2", {}))) == ({"name": "Ann"}, {"page": 2})
+    assert handler.__webargs_argnames__ == ("p", "q")
+    with pytest.raises(ValueError):
+        parser.use_args({"name": fields.Str()}, location="query", arg_name="p")(handler)
+    with pytest.raises(ValueError):
+        parser.use_args({"name": fields.Str()}, arg_name="q", as_kwargs=True)
+
+
+def test_use_args_keyword_arguments_by_default():
+    class KeywordParser(SanicParser):
+        USE_ARGS_POSITIONAL = False
+
+    parser = KeywordParser()
+
+    @parser.use_args({"name": fields.Str()}, location="query")
+    @parser.use_locations({"query": {"page": fields.Int()}, "headers": {"token": fields.Str()}})
+    async def handler(request, **kwargs):
+        return kwargs
+
+    assert asyncio.run(handler(make_sanic_request("/?name=Ann&page=2", {"token": "t"}))) == {
+        "query_args": {"name": "Ann"}, "query_headers_args": {"page": 2, "token": "t"}}
+
+
+@pytest.mark.parametrize("path", ["/echo_iter_args", "/echo_iter_args_stream"])
+def test_iter_args_yields_valid_items_in_chunks(path):
+    items = [{"id": 1}, {"id": "x"}, {"id": 3}, {}, {"id": 5}, {"id": 6}]
+
+    _, res = myapp.test_client.post(path, json=items)
+
+    assert res.status_code == 200
+    assert res.json == {
+        "chunks": [[{"id": 1}, {"id": 3}], [{"id": 5}, {"id": 6}]],
+        "errors": {"1": {"id": ["Not a valid integer."]}, "3": {"id": ["Missing data for required field."]}},
+    }
+
+
+@pytest.mark.parametrize(
+    "path, location", [("/echo_iter_args", "json"), ("/echo_iter_args_stream", "json_stream")]
+)
+def test_iter_args_stop_on_error(path, location):
+    _, res = myapp.test_client.post(
+        path, params={"stop": "1"}, json=[{"id": 1}, {"id": "x"}, {"id": 3}]
+    )
+    assert res.status_code == 422
+    assert res.json == {location: {"1": {"id": ["Not a valid integer."]}}}
+
+    _, res = myapp.test_client.post(path, json={"id": 1})
+    assert res.status_code == 422
+    assert res.json == {location: {"_schema": ["Invalid input type."]}}
+
+
+def test_iter_args_yields_before_stopping():
+    parser = SanicParser()
+    body = json.dumps([{"id": 1}, {"id": 2}, {"id": "x"}, {"id": 4}]).encode()
+    req = make_json_request(json.loads(body))
+    items = parser.iter_args({"id": fields.Int()}, req, location="json", chunk_size=10, stop_on_error=True)
+    received = []
+
+    async def consume():
+        async for chunk in items:
+            received.append(chunk)
+
+    with pytest.raises(HandleValidationError):
+        asyncio.run(consume())
+    assert received == [[{"id": 1}, {"id": 2}]]
+    assert items.errors == {2: {"id": ["Not a valid integer."]}}
+    assert items.valid_count == 2
+
+
+def test_iter_args_with_many_schema():
+    req = make_json_request([{"name": "Ann"}, {"name": "Al"}])
+    items = SanicParser().iter_args(HelloSchema(many=True), req, location="json")
+
+    async def consume():
+        return [chunk async for chunk in items]
+
+    assert asyncio.run(consume()) == [[{"name": "Ann"}]]
+    assert items.errors == {1: {"name": ["Invalid value."]}}
+
+
+def test_use_response(app):
+    _, res = app.test_client.get("/echo_use_response", params={"name": "Fred"})
+
+    assert res.status_code == 200
+    assert res.headers["X-Count"] == "2"
+    assert res.content_type == "application/json"
+    assert res.json == [{"name": "Fred"}, {}]
+
+
+def test_use_response_passes_responses_through(app):
+    _, res = app.test_client.get("/echo_use_response", params={"raw": "true"})
+
+    assert res.status_code == 202
+    assert res.json == {"raw": True}
+
+
+def test_use_response_with_custom_encoder():
+    parser = SanicParser(json_dumps=lambda data: json.dumps(data, sort_keys=True).encode())
+
+    @parser.use_response({"b": fields.Int(), "a": fields.Str()}, status=201)
+    def handler(request):
+        return SimpleNamespace(a="x", b=1, c=2)
+
+    res = asyncio.run(handler(None))
+    assert res.status == 201
+    assert res.body == b'{"a": "x", "b": 1}'
+
+    schema = parser._build_schema({"a": fields.Str()})
+    assert parser.get_schema_dumper(schema) is parser.get_schema_dumper(schema)
+
+
+@pytest.mark.parametrize("path", ["/echo_limited", "/echo_limited_stream"])
+def test_limits_accept_requests_within_them(app, path):
+    _, res = app.test_client.post(path, json={"tags": ["a"], "data": [1, [2]]})
+
+    assert res.status_code == 200
+    assert res.json == {"tags": ["a"], "data": [1, [2]]}
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"data": [[[1]]]}, "JSON nesting too deep."),
+    ({"data": list(range(6))}, "JSON array too long."),
+    ({"data": {"a": 1, "b": 2, "c": 3, "d": 4, "e": 5}}, "JSON object has too many keys."),
+    ({"data": "[[[[,,,,,,,]]]]"}, None),
+])
+def test_json_limits(app, data, message):
+    _, res = app.test_client.post("/echo_limited", json=data)
+
+    if message is None:
+        assert res.status_code == 200
+    else:
+        assert res.status_code == 400
+        assert res.json == {"json": [message]}
+
+
+def test_json_stream_limits(app):
+    _, res = app.test_client.post("/echo_limited_stream", json={"data": [[[1]]]})
+    assert res.status_code == 400
+    assert res.json == {"json_stream": ["JSON nesting too deep."]}
+
+    _, res = app.test_client.post("/echo_limited_stream", json={"data": "x" * 30})
+    assert res.status_code == 413
+    assert res.json == {"json_stream": ["Request body too large."]}
+
+
+def test_body_size_and_query_limits(app):
+    _, res = app.test_client.post("/echo_limited", json={"data": "x" * 1024})
+    assert res.status_code == 413
+    assert res.json == {"json": ["Request body too large."]}
+
+    _, res = app.test_client.get("/echo_limited", params={"tags": "a", "data": "b"})
+    assert res.status_code == 200
+
+    _, res = app.test_client.get("/echo_limited?tags=a&tags=b&tags=c")
+    assert res.status_code == 400
+    assert res.json == {"query": ["Too many query parameters."]}
+
+
+def test_schema_length_limits(app):
+    _, res = app.test_client.post("/echo_limited", json={"tags": ["a", "b", "c"]})
+
+    assert res.status_code == 422
+    assert res.json == {"json": {"tags": ["Longer than maximum length 2."]}}
+
+
+def test_route_limits_override_parser_limits():
+    limits = RequestLimits(max_body_size=10, max_depth=2)
+    parser = SanicParser(limits=limits, route_limits={"app.upload": RequestLimits(max_body_size=100)})
+
+    assert parser.get_limits(make_request(name="app.other")) is limits
+    route = parser.get_limits(make_request(name="app.upload"))
+    assert (route.max_body_size, route.max_depth) == (100, 2)
+    assert SanicParser().get_limits(make_request(name="app.upload")) is None
+
+
+def test_check_json():
+    limits = RequestLimits(max_depth=2, max_list_length=3, max_keys=2)
+
+    for body, depth in [(b'{"a": [1, 2, "],[,{"], "b": {}}', 0), (b'[1, 2, 3]', 1), (b'"[[[,,,,]]]"', 0)]:
+        limits.check_json(json.loads(body), body, depth)
+        limits.check_json(json.loads(body), depth=depth)
+    for body, depth in [(b'[[[]]]', 0), (b'[[]]', 1), (b'[1, 2, 3, 4]', 0), (b'{"a": 1, "b": 2, "c": 3}', 0)]:
+        with pytest.raises(LimitExceeded):
+            limits.check_json(json.loads(body), body, depth)
+
+
+def test_check_json_skips_documents_too_small_to_go_over_limits():
+    limits = RequestLimits(max_depth=2, max_list_length=3, max_keys=2)
+    document = [[[[]]]]
+
+    limits.check_json(document, b"[1]")
+    with pytest.raises(LimitExceeded):
+        limits.check_json(document, b"[[[[]]]]")
+
+
+@pytest.mark.parametrize("location, content_type", [
+    ("json", "application/json"), ("json_stream", "application/json"), ("ndjson", "application/x-ndjson"),
+])
+def test_deeply_nested_json_is_rejected(location, content_type):
+    body = b'{"data": ' + b"[" * 100000 + b"]" * 100000 + b"}"
+    parser = SanicParser(limits=RequestLimits(max_depth=10))
+    req = make_request(body=body, headers={}, content_type=content_type, load_json=lambda: json.loads(body))
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse({"data": fields.Raw()}, req, location=location))
+
+    assert excinfo.value.status_code == 400
+    assert json.loads(excinfo.value.body) == {"json" if location == "json" else location: ["JSON nesting too deep."]}
+
+
+@pytest.mark.parametrize("location, content_type", [
+    ("json", "application/json"), ("json_stream", "application/json"), ("ndjson", "application/x-ndjson"),
+])
+def test_json_limits_apply_to_data_loaded_by_another_parser(location, content_type):
+    body = b'{"data": ' + b"[" * 20 + b"]" * 20 + b"}"
+    req = make_request(body=body, headers={}, content_type=content_type, load_json=lambda: json.loads(body))
+    args = {"data": fields.Raw()}
+    asyncio.run(SanicParser().parse(args, req, location=location))
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(SanicParser(limits=RequestLimits(max_depth=10)).parse(args, req, location=location))
+
+    assert excinfo.value.status_code == 400
+    assert json.loads(excinfo.value.body) == {location: ["JSON nesting too deep."]}
+
+
+def test_json_limits_apply_to_body_loaded_in_middleware():
+    body = json.dumps({"items": list(range(20))}).encode()
+    req = make_json_request({"items": list(range(20))})
+    assert SanicParser().load_json(req) == json.loads(body)
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(SanicParser(limits=RequestLimits(max_list_length=10)).parse({"items": fields.Raw()}, req))
+    assert json.loads(excinfo.value.body) == {"json": ["JSON array too long."]}
+
+
+def test_lazy_query_max_params_apply_to_query_loaded_by_another_parser():
+    req = make_sanic_request("/?name=Ann&a=1&b=2", {})
+    schema = ma.Schema.from_dict(hello_args)()
+    asyncio.run(SanicParser().parse(schema, req, location="query"))
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(SanicParser(lazy_query=True, query_max_params=2).parse(schema, req, location="query"))
+    assert json.loads(excinfo.value.body) == {"query": ["Too many query parameters."]}
+
+
+def test_warm_up_prepares_recorded_schemas():
+    parser = SanicParser(compile_schemas=True)
+    nested = {"user": fields.Nested({"name": fields.Str()}), "ids": fields.List(fields.Nested(HelloSchema))}
+
+    @parser.use_args(nested)
+    async def handler(request, args):
+        pass
+
+    @parser.use_response(HelloSchema)
+    async def response_handler(request):
+        pass
+
+    asyncio.run(parser.parse({"name": fields.Str()}, make_sanic_request("/?name=Ann", {}), location="query"))
+    schemas = dict(parser.warmup.items())
+    assert len(schemas) == 3
+    nested_schema = next(schema for schema in schemas if "user" in schema.fields)
+    assert nested_schema.fields["user"]._schema is None
+
+    report = parser.warm_up()
+
+    assert report["schemas"] == 3
+    assert report["seconds"] >= 0
+    assert parser.warmup.last_report is report
+    assert isinstance(nested_schema.fields["user"]._schema, ma.Schema)
+    assert isinstance(nested_schema.fields["ids"].inner._schema, HelloSchema)
+    assert nested_schema in parser._compiled_loaders
+
+
+def test_register_warmup_runs_before_server_start():
+    parser = SanicParser()
+    app = Sanic("warmup_app")
+    parser.register_warmup(app)
+
+    @app.route("/")
+    @parser.use_args(hello_args)
+    async def index(request, args):
+        return response.json(parser.warmup.last_report)
+
+    _, res = app.test_client.get("/")
+    assert res.json["schemas"] == 1
+
+
+def test_package_exports_are_lazy():
+    import webargs_sanic
+    from webargs_sanic import sanicparser
+
+    assert webargs_sanic.use_args is sanicparser.use_args
+    assert "use_response" in dir(webargs_sanic)
+    with pytest.raises(AttributeError):
+        webargs_sanic.missing_name
+
+
+def test_optional_modules_are_imported_when_used():
+    code = (
+        "import sys\n"
+        "import webargs_sanic.sanicparser\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    modules = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.split()
+    for name in ("annotations", "artifacts", "compiler", "iteration", "metrics", "querystring", "streaming"):
+        assert "webargs_sanic." + name not in modules
+    assert "argparse" not in modules
+
+
+def test_result_cache_reuses_query_results():
+    parser = SanicParser(result_cache_size=2)
+    schema = parser._build_schema({"page": fields.Int(), "tags": fields.List(fields.Str())})
+    loads = []
+    original_load = schema.load
+    schema.load = lambda *args, **kwargs: loads.append(True) or original_load(*args, **kwargs)
+
+    def parse(url):
+        return asyncio.run(parser.parse(schema, make_sanic_request(url, {}), location="query"))
+
+    first = parse("/?page=2&tags=a&tags=b")
+    first["tags"].append("corrupted")
+    assert parse("/?page=2&tags=a&tags=b") == {"page": 2, "tags": ["a", "b"]}
+    assert parse("/?page=3") == {"page": 3}
+    assert len(loads) == 2
+    assert parser.result_cache.stats()["hits"] == 1
+
+    with pytest.raises(HandleValidationError):
+        parse("/?page=x")
+    with pytest.raises(HandleValidationError):
+        parse("/?page=x")
+    assert len(parser.result_cache) == 2
+
+
+def test_result_cache_ttl(monkeypatch):
+    parser = SanicParser(result_cache_size=10, result_cache_ttl=30)
+    req = make_sanic_request("/?name=Ann", {})
+    asyncio.run(parser.parse(hello_args, req, location="query"))
+    now = time.monotonic()
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 60)
+    asyncio.run(parser.parse(hello_args, req, location="query"))
+
+    assert parser.result_cache.stats()["hits"] == 0
+    assert parser.result_cache.stats()["misses"] == 2
+
+
+def test_result_cache_skips_non_deterministic_schemas():
+    from webargs_sanic.cache import impure
+
+    parser = SanicParser(result_cache_size=10)
+    req = make_sanic_request("/?name=Ann", {})
+    for argmap, validate in [
+        ({"name": fields.Str(), "at": fields.Float(load_default=time.time)}, None),
+        ({"name": fields.Str(validate=impure(lambda value: True))}, None),
+        ({"nested": fields.List(fields.Nested({"at": fields.Float(load_default=time.time)}))}, None),
+        (hello_args, impure(lambda args: True)),
+    ]:
+        asyncio.run(parser.parse(argmap, req, location="query", validate=validate))
+        asyncio.run(parser.parse(argmap, req, location="json"))
+    assert len(parser.result_cache) == 0
+
+    asyncio.run(parser.parse(hello_args, req, location="query"))
+    assert len(parser.result_cache) == 1
+
+
+def test_result_cache_for_view_args(app):
+    parser = SanicParser(result_cache_size=10)
+    req = make_sanic_request("/echo_view_arg/42", {})
+    req.match_info = {"view_arg": "42"}
+    args = {"view_arg": fields.Int()}
+
+    assert asyncio.run(parser.parse(args, req, location="view_args")) == {"view_arg": 42}
+    assert asyncio.run(parser.parse(args, req, location="view_args")) == {"view_arg": 42}
+    assert parser.result_cache.stats()["hits"] == 1
+
+
+class AsyncUpper(fields.Str):
+    async def _deserialize(self, value, attr, data, **kwargs):
+        await asyncio.sleep(0)
+        value = super()._deserialize(value, attr, data, **kwargs)
+        if value == "taken":
+            raise ValidationError("Already taken.")
+        return value.upper()
+
+
+def slow_check(message):
+    async def check(value):
+        await asyncio.sleep(0.1)
+        if value == "bad":
+            raise ValidationError(message)
+    return check
+
+
+def test_async_validators_run_concurrently():
+    parser = SanicParser()
+    args = {
+        "name": fields.Str(validate=slow_check("Bad name.")),
+        "email": fields.Str(validate=[slow_check("Bad email."), lambda value: "@" in value]),
+        "city": fields.Str(validate=slow_check("Bad city.")),
+    }
+
+    started = time.perf_counter()
+    data = {"name": "Ann", "email": "ann@example.com", "city": "Oslo"}
+    assert asyncio.run(parser.parse(args, make_json_request(data))) == data
+    assert time.perf_counter() - started < 0.25
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, make_json_request({"name": "bad", "email": "bad", "city": 1})))
+    assert excinfo.value.status_code == 422
+    assert excinfo.value.exc.messages == {"json": {
+        "name": ["Bad name."],
+        "email": ["Invalid value."],
+        "city": ["Not a valid string."],
+    }}
+
+
+def test_async_deserializer():
+    parser = SanicParser(compile_schemas=True)
+    args = {"login": AsyncUpper(validate=ma.validate.Length(max=3)), "id": fields.Int()}
+
+    assert asyncio.run(parser.parse(args, make_json_request({"login": "ann", "id": 1}))) == {"login": "ANN", "id": 1}
+    for login, message in [("taken", "Already taken."), ("anna", "Longer than maximum length 3.")]:
+        with pytest.raises(HandleValidationError) as excinfo:
+            asyncio.run(parser.parse(args, make_json_request({"login": login, "id": 1})))
+        assert excinfo.value.exc.messages == {"json": {"login": [message]}}
+
+
+def test_async_validation_timeout():
+    parser = SanicParser(async_validation_timeout=0.05)
+    args = {"name": fields.Str(validate=slow_check("Bad name."))}
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, make_json_request({"name": "Ann"})))
+    assert excinfo.value.status_code == 503
+
+
+def test_async_checks_leave_the_schema_unchanged():
+    parser = SanicParser(compile_schemas=True)
+    check = slow_check("Bad name.")
+    length = ma.validate.Length(max=3)
+    schema = parser._build_schema({"name": fields.Str(validate=check), "login": AsyncUpper(validate=length)})
+    parser.warm_up()
+    asyncio.run(parser.parse(schema, make_json_request({"name": "Ann", "login": "ann"})))
+
+    assert schema.fields["name"].validators == [check]
+    assert schema.load_fields["login"].validators == [length]
+    assert parser.get_sync_schema(schema).fields["name"].validators == []
+
+
+def test_iter_args_runs_async_validators():
+    chunks = [b'{"name": "Ann"}\n{"name": "bad"}\n{"name": "Bob"}\n']
+    req = make_request(body=b"", content_type="application/x-ndjson", stream=FakeStream(chunks))
+    items = SanicParser().iter_args({"name": fields.Str(validate=slow_check("Bad name."))}, req, location="ndjson")
+
+    async def consume():
+        return [chunk async for chunk in items]
+
+    assert asyncio.run(consume()) == [[{"name": "Ann"}, {"name": "Bob"}]]
+    assert items.errors == {2: {"name": ["Bad name."]}}
+
+
+async def known_user(value):
+    await asyncio.sleep(0)
+    if value == "bad":
+        raise ValidationError("Unknown user.")
+
+
+def test_async_validators_check_each_item_of_many_schemas():
+    parser = SanicParser()
+    schema = ma.Schema.from_dict({"user_id": fields.Str(validate=known_user), "n": fields.Int()})(many=True)
+
+    assert asyncio.run(parser.parse(schema, make_json_request([{"user_id": "a"}, {"user_id": "b"}]))) == [
+        {"user_id": "a"}, {"user_id": "b"}]
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(schema, make_json_request([{"user_id": "a"}, {"user_id": "bad", "n": "x"}])))
+    assert excinfo.value.exc.messages == {"json": {"1": {"user_id": ["Unknown user."], "n": ["Not a valid integer."]}}}
+
+
+def test_async_checks_run_on_each_ndjson_record():
+    body = b'{"user_id": "a", "login": "ann"}\n{"user_id": "bad", "login": "bob"}\n{"user_id": "c", "login": "x"}\n'
+    args = {"user_id": fields.Str(validate=known_user), "login": AsyncUpper()}
+    parser = SanicParser()
+
+    def parse(body):
+        req = make_request(body=body, headers={}, content_type="application/x-ndjson")
+        return asyncio.run(parser.parse(args, req, location="ndjson"))
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        parse(body)
+    assert excinfo.value.exc.messages == {"ndjson": {"2": {"user_id": ["Unknown user."]}}}
+    assert parse(body.replace(b"bad", b"b")) == [
+        {"user_id": "a", "login": "ANN"}, {"user_id": "b", "login": "BOB"}, {"user_id": "c", "login": "X"}]
+
+
+def test_schemas_with_post_load_hooks_are_loaded_as_they_are():
+    class UserSchema(ma.Schema):
+        name = fields.Str(validate=lambda value: value != "bad")
+
+        @ma.post_load
+        def make_user(self, data, **kwargs):
+            return SimpleNamespace(**data)
+
+    parser = SanicParser()
+    schema = UserSchema()
+
+    assert parser.get_sync_schema(schema) is schema
+    assert asyncio.run(parser.parse(schema, make_json_request({"name": "Ann"}))).name == "Ann"
+    with pytest.raises(HandleValidationError):
+        asyncio.run(parser.parse(schema, make_json_request({"name": "bad"})))
+
+
+async def non_empty(value):
+    if not value.strip():
+        raise ValidationError("Blank.")
+
+
+@pytest.mark.parametrize("location, make_req", [
+    ("json", lambda data: make_json_request(data)),
+    ("query", lambda data: make_sanic_request("/?" + urlencode(data), {})),
+])
+def test_async_validators_skip_load_defaults(location, make_req):
+    parser = SanicParser()
+    args = {"name": fields.Str(load_default=None, validate=non_empty), "id": fields.Int()}
+
+    assert asyncio.run(parser.parse(args, make_req({"id": 1}), location=location)) == {"name": None, "id": 1}
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, make_req({"name": " ", "id": 1}), location=location))
+    assert excinfo.value.exc.messages == {location: {"name": ["Blank."]}}
+
+
+def test_use_locations(app):
+    _, res = app.test_client.post(
+        "/echo_use_locations/7?page=2", json={"name": "Ann"}, headers={"X-Token": "t"},
+    )
+    assert res.status == 200
+    assert res.json == {"user_id": 7, "page": 2, "x_token": "t", "name": "Ann"}
+
+    _, res = app.test_client.post("/echo_use_locations/x?page=y", json={"name": "A"})
+    assert res.status == 422
+    assert res.json == {
+        "view_args": {"user_id": ["Not a valid integer."]},
+        "query": {"page": ["Not a valid integer."]},
+        "headers": {"X-Token": ["Missing data for required field."]},
+        "json": {"name": ["Shorter than minimum length 3."]},
+    }
+
+
+def test_parse_locations_validate_and_metrics():
+    metrics = ParseMetrics()
+    parser = SanicParser(metrics=metrics)
+    argmaps = {"query": {"start": fields.Int()}, "json": {"end": fields.Int()}}
+
+    def parse(url, payload):
+        req = make_sanic_request(url, {"content-type": "application/json"})
+        req.body = json.dumps(payload).encode()
+        return asyncio.run(parser.async_parse_locations(
+            argmaps, req, validate=lambda args: args["start"] < args["end"],
+        ))
+
+    assert parse("/?start=1", {"end": 2}) == {"start": 1, "end": 2}
+    with pytest.raises(HandleValidationError) as excinfo:
+        parse("/?start=3", {"end": 2})
+    assert excinfo.value.exc.messages == {"_schema": ["Invalid value."]}
+    with pytest.raises(HandleValidationError) as excinfo:
+        parse("/?start=a", {"end": "b"})
+    assert excinfo.value.exc.messages == {
+        "query": {"start": ["Not a valid integer."]}, "json": {"end": ["Not a valid integer."]},
+    }
+    assert metrics.snapshot()[("", "json")]["errors"] == {422: 1}
+
+
+def test_use_locations_rejects_duplicate_names():
+    with pytest.raises(ValueError):
+        SanicParser().use_locations({"query": {"id": fields.Int()}, "json": {"id": fields.Int()}})
+
+
+def test_record_results():
+    from webargs_sanic.records import Record
+
+    args = {"name": fields.Str(), "count": fields.Int(load_default=0), "label": fields.Str(data_key="Label")}
+    for compile_schemas in (False, True):
+        parser = SanicParser(result_records=True, compile_schemas=compile_schemas)
+        record = asyncio.run(parser.parse(args, make_json_request({"name": "Ann", "Label": "x"})))
+        assert isinstance(record, Record)
+        assert set(type(record).__slots__) == {"name", "count", "label"}
+        assert (record.name, record.count, record["label"]) == ("Ann", 0, "x")
+        assert record == {"name": "Ann", "count": 0, "label": "x"}
+        assert dict(**record) == record.to_dict()
+        assert "count" in record and len(record) == 3
+
+        record = asyncio.run(parser.parse(args, make_json_request({"extra": 1}), unknown=ma.INCLUDE))
+        assert record.to_dict() == {"count": 0, "extra": 1}
+        with pytest.raises(AttributeError):
+            record.name
+        assert record.get("name") is None
+
+        with pytest.raises(HandleValidationError):
+            asyncio.run(parser.parse(args, make_json_request({"count": "x"})))
+        assert type(parser.get_record_class(parser._get_schema(args, None))) is type
+
+
+def test_record_results_fall_back_to_dicts():
+    parser = SanicParser(result_records=True)
+    for argmap in ({"keys": fields.List(fields.Str())}, {"X-Token": fields.Str()}, HelloSchema(many=True)):
+        assert parser.get_record_class(parser._get_schema(argmap, None)) is None
+    result = asyncio.run(parser.parse({"keys": fields.List(fields.Str())}, make_json_request({"keys": ["a"]})))
+    assert type(result) is dict
+
+
+def test_record_results_in_app(app):
+    _, res = app.test_client.post("/echo_wide_records", json={"field_0": "a", "field_1": "b"})
+    assert res.json == {"count": 2, "first": "a"}
+
+
+@pytest.mark.parametrize("query_string", [
+    "", "name=Ann", "name=Ann&name=Bob&x=1", "a+b=c+d&%6Eame=%41nn", "blank=&flag&name=A%20B",
+    "name=%E2%82%AC&name=%ZZ", "=nokey&&name=1",
+])
+def test_lazy_query_matches_request_args(query_string):
+    from webargs_sanic.querystring import LazyQuery
+
+    args = make_sanic_request("/?" + query_string, {}).args
+    lazy = LazyQuery(query_string)
+    assert sorted(lazy) == sorted(args)
+    for key in args:
+        assert lazy.getlist(key) == args.getlist(key)
+        assert lazy.get(key) == args.get(key)
+
+
+def test_lazy_query_decodes_declared_values_only():
+    from webargs_sanic.querystring import LazyQuery
+
+    parser = SanicParser(lazy_query=True)
+    req = make_sanic_request("/?utm_source=a%20b&tag=x&tag=y%21&name=Ann", {})
+    args = {"tag": fields.List(fields.Str()), "name": fields.Str()}
+
+    assert asyncio.run(parser.parse(args, req, location="query")) == {"tag": ["x", "y!"], "name": "Ann"}
+    lazy = req.ctx.webargs_cache[("lazy_query", parser.DEFAULT_QUERY_MAX_PARAMS)]
+    assert isinstance(lazy, LazyQuery)
+    assert set(lazy._decoded) == {"tag", "name"}
+
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(args, req, location="query", unknown=ma.RAISE))
+    assert excinfo.value.exc.messages == {"query": {"utm_source": ["Unknown field."]}}
+
+
+def test_lazy_query_max_params():
+    from webargs_sanic.querystring import LazyQuery
+
+    assert len(LazyQuery("a=1&b=2&c=3", max_params=3)) == 3
+    with pytest.raises(LimitExceeded):
+        LazyQuery("a=1&b=2&c=3&d=4", max_params=3)
+
+    parser = SanicParser(lazy_query=True, query_max_params=2)
+    with pytest.raises(HandleValidationError) as excinfo:
+        asyncio.run(parser.parse(hello_args, make_sanic_request("/?name=Ann&a=1&b=2", {}), location="query"))
+    assert excinfo.value.status_code == 400
+    assert json.loads(excinfo.value.body) == {"query": ["Too many query parameters."]}
+
+
+def test_lazy_query_in_app(app):
+    _, res = app.test_client.get("/echo_query_lazy", params=[("name", "Ann Lee"), ("tags", "a"), ("tags", "b")])
+    assert res.json == {"name": "Ann Lee", "tags": ["a", "b"]}
@@ -1,2 +1,31 @@
 """Version definition to track changes"""
+import importlib
+
 __version__ = "2.3.5"
+
+#: names importable from the package, resolved from their module on first access
+_LAZY_ATTRIBUTES = {
+    "SanicParser": "sanicparser",
+    "parser": "sanicparser",
+    "use_args": "sanicparser",
+    "use_kwargs": "sanicparser",
+    "use_response": "sanicparser",
+    "use_locations": "sanicparser",
+    "use_annotations": "sanicparser",
+    "iter_args": "sanicparser",
+    "RequestLimits": "limits",
+    "ParseMetrics": "metrics",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    value = getattr(importlib.import_module("{}.{}".format(__name__, module)), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Schemas built from type annotations, for `SanicParser.use_annotations`.
+
+Supported types are the ones of ``Schema.TYPE_MAPPING`` (``int``, ``str``,
+``datetime``, ``UUID``...), ``typing.Any``, ``Optional``, ``List``/``list``,
+``Dict``/``dict``, dataclasses and ``TypedDict`` classes, which may nest
+each other. ``Annotated`` metadata gives the location of an argument and
+may hold a marshmallow field used instead of the one derived from the type.
+"""
+import dataclasses
+import threading
+import types
+import typing
+
+from marshmallow import Schema, fields, missing, post_load
+
+_NONE_TYPE = type(None)
+#: type of ``X | Y`` unions, Python 3.10+
+_UNION_TYPE = getattr(types, "UnionType", None)
+_LIST_TYPES = (list, typing.List)
+_DICT_TYPES = (dict, typing.Dict)
+
+#: schemas built for dataclasses and TypedDict classes, shared by all parsers
+_schemas = {}
+_schemas_lock = threading.RLock()
+
+
+class RecordSchema(Schema):
+    """Base of the schemas built for dataclasses and ``TypedDict`` classes."""
+
+    #: the class the schema loads, dataclasses are instantiated by `make_record`
+    record_type = dict
+
+    @post_load
+    def make_record(self, data, **kwargs):
+        if self.record_type is dict:
+            return data
+        return self.record_type(**data)
+
+
+def split_annotated(annotation) -> typing.Tuple[typing.Any, tuple]:
+    """Return the type and the metadata of an ``Annotated`` annotation,
+    ``(annotation, ())`` for other annotations."""
+    metadata = getattr(annotation, "__metadata__", None)
+    if metadata is None:
+        return annotation, ()
+    return annotation.__origin__, tuple(metadata)
+
+
+def is_record_type(tp) -> bool:
+    """Whether ``tp`` is a dataclass or a ``TypedDict`` class."""
+    if not isinstance(tp, type):
+        return False
+    return dataclasses.is_dataclass(tp) or (issubclass(tp, dict) and hasattr(tp, "__required_keys__"))
+
+
+def _optional_type(tp):
+    """Return ``T`` for ``Optional[T]``, ``None`` for other types."""
+    if getattr(tp, "__origin__", None) is not typing.Union and (_UNION_TYPE is None or type(tp) is not _UNION_TYPE):
+        return None
+    args = [arg for arg in tp.__args__ if arg is not _NONE_TYPE]
+    if len(args) != 1 or len(args) == len(tp.__args__):
+        return None
+    return args[0]
+
+
+def field_for_type(annotation, default=missing, required: typing.Optional[bool] = None) -> fields.Field:
+    """Return a field loading ``annotation``.
+
+    A ``default`` makes the field optional with that ``load_default``; a
+    callable default (a dataclass ``default_factory``) is called for every
+    load. Without one the field is required unless ``required`` says
+    otherwise.
+    """
+    tp, metadata = split_annotated(annotation)
+    field = next((item for item in metadata if isinstance(item, fields.Field)), None)
+    if field is not None:
+        return field
+    kwargs = {}
+    if default is not missing:
+        kwargs["load_default"] = default
+    elif required is not False:
+        kwargs["required"] = True
+    inner = _optional_type(tp)
+    if inner is not None:
+        tp = inner
+        kwargs["allow_none"] = True
+        if default is missing and not required:
+            kwargs.pop("required", None)
+            kwargs["load_default"] = None
+    return _field_class_for(tp)(**kwargs)
+
+
+def _field_class_for(tp) -> typing.Callable[..., fields.Field]:
+    if tp is typing.Any:
+        return fields.Raw
+    if is_record_type(tp):
+        return lambda **kwargs: fields.Nested(schema_for_type(tp), **kwargs)
+    origin = getattr(tp, "__origin__", None)
+    args = getattr(tp, "__args__", None) or ()
+    if origin in _LIST_TYPES or tp in _LIST_TYPES:
+        item = field_for_type(args[0], required=False) if args and args[0] is not typing.Any else fields.Raw()
+        return lambda **kwargs: fields.List(item, **kwargs)
+    if origin in _DICT_TYPES or tp in _DICT_TYPES:
+        if len(args) == 2 and args[1] is not typing.Any:
+            values = field_for_type(args[1], required=False)
+            return lambda **kwargs: fields.Dict(keys=fields.Str(), values=values, **kwargs)
+        return fields.Dict
+    try:
+        return Schema.TYPE_MAPPING[tp]
+    except (KeyError, TypeError):
+        raise TypeError("No field for the annotation {!r}".format(tp)) from None
+
+
+def _record_fields(tp) -> typing.Dict[str, fields.Field]:
+    hints = get_type_hints(tp)
+    if dataclasses.is_dataclass(tp):
+        declared = {}
+        for item in dataclasses.fields(tp):
+            if not item.init:
+                continue
+            if item.default is not dataclasses.MISSING:
+                default = item.default
+            elif item.default_factory is not dataclasses.MISSING:
+                default = item.default_factory
+            else:
+                default = missing
+            declared[item.name] = field_for_type(hints[item.name], default)
+        return declared
+    required_keys = tp.__required_keys__
+    return {
+        name: field_for_type(annotation, required=name in required_keys)
+        for name, annotation in hints.items()
+    }
+
+
+def schema_for_type(tp) -> Schema:
+    """Return the schema loading the dataclass or ``TypedDict`` class ``tp``.
+
+    It is built on first use and shared by every caller, so the compiled
+    loaders and other per-schema data of a parser are built once per type.
+    Recursive types are not supported.
+    """
+    schema = _schemas.get(tp)
+    if schema is not None:
+        return schema
+    with _schemas_lock:
+        schema = _schemas.get(tp)
+        if schema is None:
+            declared = _record_fields(tp)
+            schema_class = RecordSchema.from_dict(declared, name="{}Schema".format(tp.__name__))
+            schema_class.record_type = tp if dataclasses.is_dataclass(tp) else dict
+            schema = _schemas[tp] = schema_class()
+    return schema
+
+
+def get_type_hints(obj) -> typing.Dict[str, typing.Any]:
+    """``typing.get_type_hints`` keeping ``Annotated`` metadata where Python supports it."""
+    try:
+        return typing.get_type_hints(obj, include_extras=True)
+    except TypeError:
+        return typing.get_type_hints(obj)
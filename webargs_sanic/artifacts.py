@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache of the code generated for schemas, shared by processes.
+
+The functions generated by :mod:`webargs_sanic.compiler` are keyed by a
+hash of their source, which changes with every field, data key, default or
+validator that the generated code depends on. Their compiled code objects
+are stored with `marshal` under a directory named after the library
+version and the Python implementation, so a worker loads them instead of
+compiling them and an upgrade starts from an empty cache.
+
+The cache can be filled at deploy time with::
+
+    python -m webargs_sanic.artifacts myapp.server:parser --dir /var/cache/webargs
+
+which imports the module holding the parser, so that its decorated
+handlers are registered, and builds the code of every recorded schema.
+"""
+import argparse
+import hashlib
+import importlib
+import marshal
+import os
+import sys
+import tempfile
+import time
+import typing
+
+from webargs_sanic import __version__
+
+#: first bytes of every artifact file
+MAGIC = b"WASC1\n"
+
+
+def cache_tag() -> str:
+    """Name of the subdirectory holding the artifacts usable by this process."""
+    return "{}-{}".format(__version__, sys.implementation.cache_tag)
+
+
+class ArtifactCache:
+    """Directory of compiled schema code, safe to share between processes.
+
+    Files are written atomically; unreadable or stale files are ignored and
+    rewritten. ``hits``, ``misses`` and ``writes`` count the lookups done by
+    this process.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.join(os.fspath(directory), cache_tag())
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    def path(self, source: str) -> str:
+        digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".bin")
+
+    def compile(self, source: str, filename: str):
+        """Return the code object of ``source``, from the cache when it is there."""
+        path = self.path(source)
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+            if data.startswith(MAGIC):
+                code = marshal.loads(data[len(MAGIC):])
+                self.hits += 1
+                return code
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        self.misses += 1
+        code = compile(source, filename, "exec")
+        self._write(path, MAGIC + marshal.dumps(code))
+        return code
+
+    def _write(self, path: str, data: bytes):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    fp.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            # a read-only or full cache directory only costs the compilation
+            return
+        self.writes += 1
+
+    def stats(self) -> typing.Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+def _load_object(path: str):
+    module_name, _, attr = path.partition(":")
+    obj = importlib.import_module(module_name)
+    for name in (attr or "parser").split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    cli = argparse.ArgumentParser(
+        prog="python -m webargs_sanic.artifacts",
+        description="Prebuild the compiled schema cache of SanicParser instances.",
+    )
+    cli.add_argument("parsers", nargs="+", metavar="MODULE:PARSER",
+                     help="parser to prebuild, e.g. myapp.server:parser (defaults to the `parser` attribute)")
+    cli.add_argument("--dir", help="cache directory, instead of the artifact_dir of each parser")
+    args = cli.parse_args(argv)
+
+    for path in args.parsers:
+        parser = _load_object(path)
+        if args.dir:
+            parser.artifacts = ArtifactCache(args.dir)
+            # code compiled while the application was imported did not go to this cache
+            parser._compiled_loaders.clear()
+            parser._compiled_dumpers.clear()
+        if parser.artifacts is None:
+            cli.error("{} has no artifact_dir, pass --dir".format(path))
+        started = time.perf_counter()
+        report = parser.warm_up()
+        stats = parser.artifacts.stats()
+        print("{}: {} schemas, {} compiled, {} cached, {} written to {} in {:.1f} ms".format(
+            path, report["schemas"], stats["misses"], stats["hits"], stats["writes"],
+            parser.artifacts.directory, (time.perf_counter() - started) * 1000,
+        ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
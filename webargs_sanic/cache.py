@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""Small thread-safe caches used by the parser internals."""
+import copy
+import datetime
+import decimal
+import threading
+import time
+import typing
+import uuid
+from collections import OrderedDict
+
+from marshmallow import Schema, fields
+
+#: attribute set by `impure` on validators and schema hooks
+IMPURE_ATTR = "__webargs_impure__"
+#: types of the values shared between cached results as they are
+_IMMUTABLE_TYPES = frozenset((
+    str, int, float, bool, type(None), bytes, decimal.Decimal,
+    datetime.date, datetime.datetime, datetime.time, datetime.timedelta, uuid.UUID,
+))
+
+
+class LRUCache:
+    """Size-bounded, thread-safe LRU mapping with hit/miss/eviction counters.
+
+    A ``maxsize`` of ``0`` (or ``None``) disables storage, every lookup is
+    then a miss.
+    """
+
+    def __init__(self, maxsize: typing.Optional[int] = 128):
+        self.maxsize = maxsize or 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the value stored for ``key`` and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store ``value`` under ``key``, evicting the least recently used entries."""
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._store(key, value)
+
+    def clear(self):
+        """Drop all entries. Counters are kept."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> typing.Dict[str, int]:
+        """Return the cache counters, e.g. to export them as metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def _store(self, key, value):
+        # must be called with the lock held
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            old_key, old_value = self._data.popitem(last=False)
+            self.evictions += 1
+            self._on_evict(old_key, old_value)
+
+    def _on_evict(self, key, value):
+        """Hook called (with the lock held) for every evicted entry."""
+
+
+class SchemaCache(LRUCache):
+    """LRU cache of schemas compiled from ``dict`` argmaps.
+
+    Lookups are keyed by the field names and field identities of the dict,
+    so different dict objects holding the same field objects (e.g.
+    ``{**base_args}`` built per call) share a schema, and a dict changed in
+    place gets a new one. The cached schema class references the field
+    objects, so their ids cannot be reused while the entry is alive.
+    """
+
+    @staticmethod
+    def structural_key(argmap: typing.Mapping) -> tuple:
+        return tuple((name, id(field)) for name, field in argmap.items())
+
+    def get_or_build(self, argmap: typing.Mapping, factory: typing.Callable):
+        """Return the schema cached for ``argmap``, building it with ``factory`` on a miss."""
+        if not self.maxsize:
+            self.misses += 1
+            return factory(argmap)
+
+        key = self.structural_key(argmap)
+        schema = self.get(key)
+        if schema is not None:
+            return schema
+        schema = factory(argmap)
+        with self._lock:
+            # another thread may have built the schema meanwhile
+            schema = self._data.setdefault(key, schema)
+            self._store(key, schema)
+        return schema
+
+
+class ResultCache(LRUCache):
+    """LRU cache of parsed arguments whose entries expire after ``ttl`` seconds.
+
+    A ``ttl`` of ``None`` keeps entries until they are evicted. Expired
+    entries count as misses.
+    """
+
+    def __init__(self, maxsize: typing.Optional[int] = 128, ttl: typing.Optional[float] = None):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        entry = super().get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires is not None and expires < time.monotonic():
+            with self._lock:
+                self._data.pop(key, None)
+                self.hits -= 1
+                self.misses += 1
+            return default
+        return value
+
+    def put(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        super().put(key, (expires, value))
+
+
+def impure(func: typing.Callable) -> typing.Callable:
+    """Mark a validator or a schema hook whose outcome does not only depend on
+    its input (current time, database lookups...). Results of schemas using
+    it are not kept in the parser's result cache.
+    """
+    setattr(func, IMPURE_ATTR, True)
+    return func
+
+
+def is_impure(func) -> bool:
+    return getattr(func, IMPURE_ATTR, False)
+
+
+def is_deterministic(schema: Schema, _seen: typing.Optional[set] = None) -> bool:
+    """Whether loading the same data with ``schema`` always gives the same result.
+
+    False when a field, including those of nested schemas, has a callable
+    ``load_default`` or a validator marked with `impure`, or when a schema
+    hook is marked with `impure`.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(schema) in seen:
+        return True
+    seen.add(id(schema))
+    for hooks in schema._hooks.values():
+        if any(is_impure(getattr(schema, name)) for name in hooks):
+            return False
+    pending = list(schema.fields.values())
+    while pending:
+        field = pending.pop()
+        if callable(field.load_default) or any(is_impure(validator) for validator in field.validators):
+            return False
+        if isinstance(field, fields.Nested):
+            if not is_deterministic(field.schema, seen):
+                return False
+        elif isinstance(field, fields.List):
+            pending.append(field.inner)
+        elif isinstance(field, fields.Tuple):
+            pending.extend(field.tuple_fields)
+        elif isinstance(field, fields.Mapping):
+            pending.extend(f for f in (field.key_field, field.value_field) if f is not None)
+    return True
+
+
+def copy_result(value):
+    """Copy the containers of a parsed result, sharing its immutable values."""
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+    if type(value) is dict:
+        return {key: copy_result(item) for key, item in value.items()}
+    if type(value) is list:
+        return [copy_result(item) for item in value]
+    return copy.deepcopy(value)
@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+"""Code-generated fast paths for loading and dumping flat schemas.
+
+:func:`compile_schema` turns a schema made of plain fields into a
+specialized function equivalent to ``schema.load(data, unknown=...)``.
+``String``, ``Integer`` and ``Boolean`` values of the expected Python type
+are accepted inline; every other value and every other field type goes
+through the field's own ``deserialize``, so results and error messages are
+the ones marshmallow produces. Schemas using features the generated code
+does not implement (``many``, ``partial``, hooks, dotted ``attribute``...)
+are not compiled and keep using ``Schema.load``.
+
+:func:`compile_dump_schema` does the same for ``schema.dump``: ``String``,
+``Integer``, ``Float`` and ``Boolean`` values of the expected Python type
+are copied inline and the other fields are serialized by marshmallow.
+"""
+import functools
+import typing
+from collections.abc import Mapping
+
+import marshmallow as ma
+from marshmallow import EXCLUDE, INCLUDE, RAISE, ValidationError
+from marshmallow.utils import missing
+
+from webargs_sanic.records import as_record
+
+#: field classes with an inline fast path, mapped to the check of the raw value
+_FAST_CHECKS = {
+    ma.fields.String: "type(raw) is str",
+    ma.fields.Integer: "type(raw) is int",
+    ma.fields.Boolean: "raw is True or raw is False",
+}
+
+#: field classes with an inline dump path, mapped to the check of the attribute value
+_DUMP_FAST_CHECKS = {
+    ma.fields.String: "type(value) is str",
+    ma.fields.Integer: "type(value) is int",
+    ma.fields.Float: "type(value) is float",
+    ma.fields.Boolean: "value is True or value is False",
+}
+
+
+def _schema_is_supported(schema: ma.Schema) -> bool:
+    if schema.many or schema.partial or schema.dict_class is not dict:
+        return False
+    if type(schema).handle_error is not ma.Schema.handle_error:
+        return False
+    return not any(schema._hooks.values())
+
+
+def _fast_check(field: ma.fields.Field) -> typing.Optional[str]:
+    check = _FAST_CHECKS.get(type(field))
+    if check is None:
+        return None
+    if isinstance(field, ma.fields.Boolean) and field.truthy and (
+            True not in field.truthy or False not in field.falsy):
+        return None
+    return check
+
+
+def generate_source(schema: ma.Schema, record: bool = False) -> typing.Optional[str]:
+    """Return the source of the ``load`` function for ``schema``, or ``None``
+    when the schema is not supported.
+
+    Field objects are referenced by position (``f0``, ``f1``...) and bound
+    by :func:`build_loader`. With ``record``, values are stored straight
+    into an instance of the ``record_class`` bound by :func:`build_loader`
+    (see :mod:`webargs_sanic.records`) instead of a dict.
+    """
+    if not _schema_is_supported(schema):
+        return None
+
+    if record:
+        def store(attr):
+            return "result.{}".format(attr)
+        valid_data = "result.to_dict()"
+    else:
+        def store(attr):
+            return "result[{!r}]".format(attr)
+        valid_data = "result"
+    lines = [
+        "def load(data, unknown=None):",
+        "    if unknown is None:",
+        "        unknown = schema_unknown",
+        "    elif unknown not in (RAISE, INCLUDE, EXCLUDE):",
+        "        return as_record(record_class, schema.load(data, unknown=unknown))",
+        "    result = {}".format("object_new(record_class)" if record else "{}"),
+        "    errors = {}",
+        "    if not isinstance(data, Mapping):",
+        "        errors['_schema'] = [type_message]",
+        "        raise ValidationError(errors, data=data, valid_data={})".format(valid_data),
+    ]
+    for index, (attr_name, field) in enumerate(schema.load_fields.items()):
+        if field.attribute is not None and "." in field.attribute:
+            return None
+        key = field.data_key if field.data_key is not None else attr_name
+        attr = field.attribute or attr_name
+        name = "f{}".format(index)
+        check = _fast_check(field)
+        if check is None:
+            lines += [
+                "    try:",
+                "        value = {0}.deserialize(data.get({1!r}, missing), {1!r}, data, partial=schema_partial)"
+                .format(name, key),
+                "    except ValidationError as error:",
+                "        errors[{!r}] = error.messages".format(key),
+                "        value = error.valid_data or missing",
+                "    if value is not missing:",
+                "        {} = value".format(store(attr)),
+            ]
+            continue
+
+        lines += [
+            "    raw = data.get({!r}, missing)".format(key),
+            "    if raw is missing:",
+        ]
+        if field.required:
+            lines.append("        errors[{!r}] = {}.make_error('required').messages".format(key, name))
+        elif callable(field.load_default):
+            lines.append("        {} = {}.load_default()".format(store(attr), name))
+        elif field.load_default is not missing:
+            lines.append("        {} = {}.load_default".format(store(attr), name))
+        else:
+            lines.append("        pass")
+        lines.append("    elif raw is None:")
+        if field.allow_none:
+            lines.append("        {} = None".format(store(attr)))
+        else:
+            lines.append("        errors[{!r}] = {}.make_error('null').messages".format(key, name))
+        lines += [
+            "    else:",
+            "        try:",
+            "            if {}:".format(check),
+            "                value = raw",
+            "            else:",
+            "                value = {}._deserialize(raw, {!r}, data)".format(name, key),
+        ]
+        if field.validators:
+            lines.append("            {}._validate(value)".format(name))
+        lines += [
+            "        except ValidationError as error:",
+            "            errors[{!r}] = error.messages".format(key),
+            "            if error.valid_data:",
+            "                {} = error.valid_data".format(store(attr)),
+            "        else:",
+            "            {} = value".format(store(attr)),
+        ]
+    lines += [
+        "    if unknown != EXCLUDE:",
+        "        for key in set(data) - field_keys:",
+        "            value = data[key]",
+        "            if unknown == INCLUDE:",
+        "                result[key] = value",
+        "            elif unknown == RAISE:",
+        "                errors[key] = [unknown_message]",
+        "    if errors:",
+        "        raise ValidationError(errors, data=data, valid_data={})".format(valid_data),
+        "    return result",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def build_loader(schema: ma.Schema, source: str, code=None, record_class=None) -> typing.Callable:
+    """Bind the generated ``source`` (or its compiled ``code``) to ``schema``'s fields."""
+    namespace = {
+        "schema": schema,
+        "record_class": record_class,
+        "object_new": object.__new__,
+        "as_record": as_record,
+        "schema_unknown": schema.unknown,
+        "schema_partial": schema.partial,
+        "field_keys": {
+            field.data_key if field.data_key is not None else attr_name
+            for attr_name, field in schema.load_fields.items()
+        },
+        "type_message": schema.error_messages["type"],
+        "unknown_message": schema.error_messages["unknown"],
+        "missing": missing,
+        "Mapping": Mapping,
+        "ValidationError": ValidationError,
+        "RAISE": RAISE,
+        "INCLUDE": INCLUDE,
+        "EXCLUDE": EXCLUDE,
+    }
+    for index, field in enumerate(schema.load_fields.values()):
+        namespace["f{}".format(index)] = field
+    if code is None:
+        code = compile(source, "<webargs_sanic {}>".format(type(schema).__name__), "exec")
+    exec(code, namespace)  # pylint: disable=exec-used
+    return namespace["load"]
+
+
+def _compile(source: str, filename: str):
+    return compile(source, filename, "exec")
+
+
+def compile_schema(
+        schema: ma.Schema,
+        compile_source: typing.Optional[typing.Callable] = None,
+        record_class: typing.Optional[type] = None
+) -> typing.Optional[typing.Callable]:
+    """Return a function behaving like ``schema.load(data, unknown=unknown)``
+    for flat schemas, or ``None`` if the schema has to be loaded by marshmallow.
+
+    ``compile_source(source, filename)`` replaces the builtin ``compile``,
+    e.g. `webargs_sanic.artifacts.ArtifactCache.compile`. With a
+    ``record_class`` (see :func:`webargs_sanic.records.record_class`) the
+    function returns instances of it.
+    """
+    source = generate_source(schema, record=record_class is not None)
+    if source is None:
+        return None
+    code = None
+    if compile_source is not None:
+        code = compile_source(source, "<webargs_sanic {}>".format(type(schema).__name__))
+    return build_loader(schema, source, code, record_class)
+
+
+def _dump_fast_check(field: ma.fields.Field) -> typing.Optional[str]:
+    if getattr(field, "as_string", False):
+        return None
+    if field.attribute is not None and "." in field.attribute:
+        return None
+    return _DUMP_FAST_CHECKS.get(type(field))
+
+
+def generate_dump_source(schema: ma.Schema) -> typing.Optional[str]:
+    """Return the source of the ``dump`` function for ``schema``, or ``None``
+    when the schema is not supported.
+
+    Unlike loading, ``many`` schemas are supported.
+    """
+    if schema.dict_class is not dict or any(schema._hooks.values()):
+        return None
+    if type(schema).get_attribute is not ma.Schema.get_attribute:
+        return None
+
+    lines = [
+        "def dump_one(obj):",
+        "    result = {}",
+        "    if type(obj) is dict:",
+        "        get = obj.get",
+        "    else:",
+        "        get = partial(get_attribute, obj)",
+    ]
+    for index, (attr_name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key if field.data_key is not None else attr_name
+        name = "f{}".format(index)
+        check = _dump_fast_check(field)
+        if check is None:
+            lines += [
+                "    value = {}.serialize({!r}, obj, accessor=get_attribute)".format(name, attr_name),
+                "    if value is not missing:",
+                "        result[{!r}] = value".format(key),
+            ]
+            continue
+
+        attr = field.attribute or attr_name
+        lines += [
+            "    value = get({!r}, missing)".format(attr),
+            "    if value is missing:",
+        ]
+        if callable(field.dump_default):
+            lines.append("        value = {}.dump_default()".format(name))
+        elif field.dump_default is not missing:
+            lines.append("        value = {}.dump_default".format(name))
+        else:
+            lines.append("        pass")
+        lines += [
+            "    if value is None or {}:".format(check),
+            "        result[{!r}] = value".format(key),
+            "    elif value is not missing:",
+            "        result[{!r}] = {}._serialize(value, {!r}, obj)".format(key, name, attr_name),
+        ]
+    lines += [
+        "    return result",
+        "",
+        "def dump(obj, many=None):",
+        "    if many is None:",
+        "        many = schema_many",
+        "    if many and obj is not None:",
+        "        return [dump_one(item) for item in obj]",
+        "    return dump_one(obj)",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def compile_dump_schema(
+        schema: ma.Schema, compile_source: typing.Optional[typing.Callable] = None
+) -> typing.Optional[typing.Callable]:
+    """Return a function behaving like ``schema.dump(obj, many=many)``, or
+    ``None`` if the schema has to be dumped by marshmallow.
+    """
+    source = generate_dump_source(schema)
+    if source is None:
+        return None
+    namespace = {
+        "schema_many": schema.many,
+        "get_attribute": schema.get_attribute,
+        "partial": functools.partial,
+        "missing": missing,
+    }
+    for index, field in enumerate(schema.dump_fields.values()):
+        namespace["f{}".format(index)] = field
+    filename = "<webargs_sanic dump {}>".format(type(schema).__name__)
+    code = (compile_source or _compile)(source, filename)
+    exec(code, namespace)  # pylint: disable=exec-used
+    return namespace["dump"]
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Decoders of binary request bodies, keyed by content type."""
+import functools
+import importlib
+import importlib.util
+import typing
+
+#: A decoder receives a ``memoryview`` of the request body and raises ``ValueError`` on invalid input
+BodyDecoder = typing.Callable[[memoryview], typing.Any]
+
+
+def mimetype_of(content_type: typing.Optional[str]) -> str:
+    """Return the lowercased mimetype of a Content-Type header, without parameters."""
+    if not content_type:
+        return ""
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+@functools.lru_cache(maxsize=None)
+def _module(name: str):
+    # the decoder libraries are only imported when a body needs them
+    return importlib.import_module(name)
+
+
+@functools.lru_cache(maxsize=None)
+def _available(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+
+def preload_decoders():
+    """Import the installed libraries of the built-in decoders, e.g. before a worker serves requests."""
+    for name in ("msgpack", "cbor2"):
+        if _available(name):
+            _module(name)
+
+
+def msgpack_loads(data: memoryview):
+    """Decode a MessagePack document, straight from the buffer."""
+    msgpack = _module("msgpack")
+    try:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    except (msgpack.UnpackException, ValueError, TypeError) as error:
+        raise ValueError(str(error)) from error
+
+
+def cbor_loads(data: memoryview):
+    """Decode a CBOR document."""
+    return _module("cbor2").loads(data)
+
+
+class DecoderRegistry:
+    """Mapping of mimetypes to body decoders.
+
+    Lookups ignore the Content-Type parameters and case. The built-in
+    registry holds MessagePack and CBOR decoders when ``msgpack`` and
+    ``cbor2`` are installed.
+    """
+
+    def __init__(self, decoders: typing.Optional[typing.Mapping[str, BodyDecoder]] = None):
+        self._decoders = {}
+        for mimetype, decoder in (decoders or {}).items():
+            self.register(mimetype, decoder)
+
+    def __contains__(self, mimetype: str) -> bool:
+        return mimetype_of(mimetype) in self._decoders
+
+    def register(self, mimetype: str, decoder: BodyDecoder):
+        """Decode bodies of ``mimetype`` with ``decoder``, replacing a previous one."""
+        self._decoders[mimetype_of(mimetype)] = decoder
+
+    def unregister(self, mimetype: str):
+        self._decoders.pop(mimetype_of(mimetype), None)
+
+    def get(self, content_type: typing.Optional[str]) -> typing.Optional[BodyDecoder]:
+        """Return the decoder for a Content-Type header, ``None`` if there is none."""
+        return self._decoders.get(mimetype_of(content_type))
+
+    def copy(self) -> "DecoderRegistry":
+        return DecoderRegistry(self._decoders)
+
+    def mimetypes(self) -> typing.List[str]:
+        return list(self._decoders)
+
+
+def default_registry() -> DecoderRegistry:
+    """Return a registry with the built-in decoders whose library is installed."""
+    registry = DecoderRegistry()
+    if _available("msgpack"):
+        for mimetype in ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack"):
+            registry.register(mimetype, msgpack_loads)
+    if _available("cbor2"):
+        registry.register("application/cbor", cbor_loads)
+    return registry
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Item by item validation of list payloads."""
+import typing
+
+from marshmallow import ValidationError
+
+
+class ArgsIterator:
+    """Asynchronous iterator yielding lists of up to ``chunk_size`` validated items.
+
+    Items failing validation are left out and their messages are collected in
+    :attr:`errors`, keyed by item index. With ``stop_on_error``, the items
+    validated so far are yielded and ``on_error(index, error)`` is awaited
+    on the next iteration; it is expected to raise. ``check(value, item)``,
+    if given, is awaited with each loaded value and its raw item and may
+    raise a `ValidationError` too.
+
+    Created by :meth:`webargs_sanic.sanicparser.SanicParser.iter_args`.
+    """
+
+    def __init__(
+            self,
+            items: typing.AsyncIterator[typing.Tuple[int, typing.Any]],
+            load: typing.Callable,
+            chunk_size: int,
+            stop_on_error: bool,
+            on_error: typing.Callable,
+            check: typing.Optional[typing.Callable[[typing.Any, typing.Any], typing.Awaitable]] = None,
+    ):
+        self.errors = {}
+        self.valid_count = 0
+        self._items = items
+        self._load = load
+        self._chunk_size = chunk_size
+        self._stop_on_error = stop_on_error
+        self._on_error = on_error
+        self._check = check
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        chunk = []
+        async for index, item in self._items:
+            try:
+                value = self._load(item)
+                if self._check is not None:
+                    await self._check(value, item)
+            except ValidationError as error:
+                self.errors[index] = error.messages
+                if self._stop_on_error:
+                    if chunk:
+                        yield chunk
+                    await self._on_error(index, error)
+                    return
+                continue
+            chunk.append(value)
+            self.valid_count += 1
+            if len(chunk) >= self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Limits checked on requests before their arguments are loaded."""
+import typing
+from itertools import chain, compress
+
+from marshmallow import Schema, fields, validate
+
+_OBJECT = ord("{")
+_is_dict = frozenset((dict,)).__contains__
+_is_list = frozenset((list,)).__contains__
+
+
+class LimitExceeded(Exception):
+    """Raised when a request goes over one of its `RequestLimits`."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class RequestLimits:
+    """Limits of the requests handled by a parser or by a route.
+
+    ``None`` means no limit.
+
+    :param int max_body_size: Maximum size of the body in bytes, rejected with
+        a 413 error. Checked against the ``Content-Length`` header and, for
+        streaming routes, while the body is read.
+    :param int max_depth: Maximum nesting depth of the containers of a JSON body.
+    :param int max_list_length: Maximum number of items of a JSON array.
+    :param int max_keys: Maximum number of keys of a JSON object.
+    :param int max_query_params: Maximum number of query string parameters.
+    :param bool schema_lengths: Check the values of fields with a
+        `marshmallow.validate.Length` validator before they are deserialized,
+        so that a list or a string too long is rejected without its items
+        being loaded.
+
+    The JSON limits are checked on the decoded body, and only when its
+    size does not rule out going over them, and rejected with a 400 error.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_body_size: typing.Optional[int] = None,
+            max_depth: typing.Optional[int] = None,
+            max_list_length: typing.Optional[int] = None,
+            max_keys: typing.Optional[int] = None,
+            max_query_params: typing.Optional[int] = None,
+            schema_lengths: bool = False
+    ):
+        self.max_body_size = max_body_size
+        self.max_depth = max_depth
+        self.max_list_length = max_list_length
+        self.max_keys = max_keys
+        self.max_query_params = max_query_params
+        self.schema_lengths = schema_lengths
+
+    def __repr__(self):
+        return "<RequestLimits {}>".format(", ".join(
+            "{}={!r}".format(name, value) for name, value in vars(self).items() if value
+        ))
+
+    def merge(self, other: "RequestLimits") -> "RequestLimits":
+        """Return these limits overridden by the ones set in ``other``."""
+        merged = RequestLimits()
+        for name, value in vars(self).items():
+            override = getattr(other, name)
+            setattr(merged, name, value if override is None else override)
+        merged.schema_lengths = self.schema_lengths or other.schema_lengths
+        return merged
+
+    @property
+    def limits_json(self) -> bool:
+        return not (self.max_depth is None and self.max_list_length is None and self.max_keys is None)
+
+    def check_body_size(self, size: int):
+        if self.max_body_size is not None and size > self.max_body_size:
+            raise LimitExceeded("Request body too large.", 413)
+
+    def check_query_params(self, count: int):
+        if self.max_query_params is not None and count > self.max_query_params:
+            raise LimitExceeded("Too many query parameters.")
+
+    def check_json_members(self, container: typing.Optional[int], count: int):
+        """Check the number of members of a JSON container opened with ``container``."""
+        limit = self.max_keys if container == _OBJECT else self.max_list_length
+        if limit is not None and count > limit:
+            raise LimitExceeded(
+                "JSON object has too many keys." if container == _OBJECT else "JSON array too long."
+            )
+
+    def check_json(self, document, raw: typing.Optional[bytes] = None, depth: int = 0):
+        """Check the structure of the decoded JSON ``document``.
+
+        ``depth`` is the number of containers ``document`` is nested in.
+        The containers are checked level by level, from the top, so that a
+        document going over a limit is rejected early. When the encoded
+        document ``raw`` has too few brackets and commas to go over the
+        limits, the document is not walked at all.
+        """
+        if raw is not None and not self._may_exceed_json(raw, depth):
+            return
+        max_depth, max_keys, max_list_length = self.max_depth, self.max_keys, self.max_list_length
+        level = [document]
+        types = [type(document)]
+        while True:
+            dicts = list(compress(level, map(_is_dict, types)))
+            lists = list(compress(level, map(_is_list, types)))
+            if not (dicts or lists):
+                return
+            depth += 1
+            if max_depth is not None and depth > max_depth:
+                raise LimitExceeded("JSON nesting too deep.")
+            if max_keys is not None and dicts and max(map(len, dicts)) > max_keys:
+                raise LimitExceeded("JSON object has too many keys.")
+            if max_list_length is not None and lists and max(map(len, lists)) > max_list_length:
+                raise LimitExceeded("JSON array too long.")
+            level = list(chain(chain.from_iterable(map(dict.values, dicts)), chain.from_iterable(lists)))
+            types = list(map(type, level))
+
+    def _may_exceed_json(self, raw: bytes, depth: int) -> bool:
+        """Whether a document encoded as ``raw`` has enough brackets and commas,
+        counted in its strings too, to go over the JSON limits."""
+        if self.max_depth is not None and raw.count(b"[") + raw.count(b"{") + depth > self.max_depth:
+            return True
+        lengths = [limit for limit in (self.max_keys, self.max_list_length) if limit is not None]
+        return bool(lengths) and raw.count(b",") + 1 > min(lengths)
+
+
+#: fields whose length can be checked on the raw value, mapped to the type of that value
+_SIZED_FIELDS = ((fields.List, list), (fields.String, str))
+
+
+def length_validators(schema: Schema) -> typing.Tuple[typing.Tuple[str, type, validate.Length], ...]:
+    """Return ``(key, raw type, validator)`` for the list and string fields of
+    ``schema`` with a maximum `Length`."""
+    checks = []
+    for name, field in schema.load_fields.items():
+        raw_type = next((raw for cls, raw in _SIZED_FIELDS if isinstance(field, cls)), None)
+        if raw_type is None:
+            continue
+        key = field.data_key if field.data_key is not None else name
+        for validator in field.validators:
+            if isinstance(validator, validate.Length) and (validator.max is not None or validator.equal is not None):
+                checks.append((key, raw_type, validator))
+    return tuple(checks)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""In-process metrics for request argument parsing.
+
+A :class:`ParseMetrics` instance passed to ``SanicParser(metrics=...)``
+receives one call per parsed location. Subclass it and override the
+``observe_*``/``count_error`` hooks to forward the measurements elsewhere,
+or keep the defaults and expose :meth:`ParseMetrics.render_prometheus` on a
+route.
+"""
+import threading
+import typing
+
+from sanic import response
+
+#: Prometheus metric names and help texts, in rendering order
+_SUMMARIES = (
+    ("load_seconds", "Time spent loading request data per location."),
+    ("validation_seconds", "Time spent deserializing and validating request data per location."),
+    ("payload_bytes", "Size of the request body when arguments were parsed."),
+)
+
+
+class _Series:
+    __slots__ = (
+        "load_seconds_count", "load_seconds_sum",
+        "validation_seconds_count", "validation_seconds_sum",
+        "payload_bytes_count", "payload_bytes_sum",
+        "errors",
+    )
+
+    def __init__(self):
+        for name in self.__slots__[:-1]:
+            setattr(self, name, 0)
+        self.errors = {}
+
+    def as_dict(self) -> dict:
+        data = {name: getattr(self, name) for name in self.__slots__[:-1]}
+        data["errors"] = dict(self.errors)
+        return data
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class ParseMetrics:
+    """Thread-safe registry of parsing timings, payload sizes and error
+    counts, keyed by route name and location.
+
+    :param str namespace: Prefix of the rendered Prometheus metric names.
+    """
+
+    def __init__(self, namespace: str = "webargs_sanic"):
+        self.namespace = namespace
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _get(self, route: str, location: str) -> _Series:
+        key = (route, location)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series.setdefault(key, _Series())
+        return series
+
+    def observe_load(self, route: str, location: str, seconds: float, size: int):
+        """Called after the data of ``location`` was read from the request."""
+        with self._lock:
+            series = self._get(route, location)
+            series.load_seconds_count += 1
+            series.load_seconds_sum += seconds
+            series.payload_bytes_count += 1
+            series.payload_bytes_sum += size
+
+    def observe_validation(self, route: str, location: str, seconds: float):
+        """Called after the loaded data went through the schema and validators,
+        whether validation succeeded or not."""
+        with self._lock:
+            series = self._get(route, location)
+            series.validation_seconds_count += 1
+            series.validation_seconds_sum += seconds
+
+    def count_error(self, route: str, location: str, status_code: int):
+        """Called for every error raised through ``abort()`` while parsing."""
+        with self._lock:
+            errors = self._get(route, location).errors
+            errors[status_code] = errors.get(status_code, 0) + 1
+
+    def snapshot(self) -> typing.Dict[typing.Tuple[str, str], dict]:
+        """Return a copy of the recorded values keyed by ``(route, location)``."""
+        with self._lock:
+            return {key: series.as_dict() for key, series in self._series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self) -> str:
+        """Render the recorded values in the Prometheus text exposition format."""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        for name, help_text in _SUMMARIES:
+            metric = "{}_{}".format(self.namespace, name)
+            lines += ["# HELP {} {}".format(metric, help_text), "# TYPE {} summary".format(metric)]
+            for (route, location), data in snapshot:
+                labels = 'route="{}",location="{}"'.format(_escape(route), _escape(location))
+                lines.append("{}_count{{{}}} {}".format(metric, labels, data[name + "_count"]))
+                lines.append("{}_sum{{{}}} {}".format(metric, labels, data[name + "_sum"]))
+        metric = "{}_errors_total".format(self.namespace)
+        lines += [
+            "# HELP {} Validation errors raised while parsing, by status code.".format(metric),
+            "# TYPE {} counter".format(metric),
+        ]
+        for (route, location), data in snapshot:
+            for status_code, count in sorted(data["errors"].items()):
+                lines.append('{}{{route="{}",location="{}",status="{}"}} {}'.format(
+                    metric, _escape(route), _escape(location), status_code, count))
+        return "\n".join(lines) + "\n"
+
+    async def handler(self, request):
+        """Sanic handler serving :meth:`render_prometheus`, e.g.
+        ``app.add_route(metrics.handler, "/metrics")``."""
+        return response.text(self.render_prometheus(), content_type="text/plain; version=0.0.4")
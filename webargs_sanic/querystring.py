@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""Query string read without decoding the values nobody asks for."""
+import functools
+import re
+import typing
+from collections.abc import Mapping
+from urllib.parse import unquote_plus
+
+from webargs_sanic.limits import LimitExceeded
+
+
+def _decode(text: str, encoding: str) -> str:
+    if "%" not in text and "+" not in text:
+        return text
+    return unquote_plus(text, encoding=encoding, errors="replace")
+
+
+class LazyQuery(Mapping):
+    """Read-only multidict over a raw query string.
+
+    The values of a key are searched for in the raw query string the first
+    time the key is read, and only then percent-decoded, so the parameters a
+    schema does not declare are neither split nor decoded. The query string
+    is split into all its parameters only when the keys are listed, e.g. to
+    report unknown fields. Pairs with a blank value are dropped, like Sanic's
+    ``request.args`` does. More than ``max_params`` parameters raise
+    `LimitExceeded` before any is decoded.
+    """
+
+    __slots__ = ("query_string", "encoding", "_raw", "_decoded")
+
+    def __init__(self, query_string: str, max_params: typing.Optional[int] = None, encoding: str = "utf-8"):
+        if max_params is not None and query_string.count("&") >= max_params:
+            raise LimitExceeded("Too many query parameters.")
+        self.query_string = query_string
+        self.encoding = encoding
+        self._raw = None
+        self._decoded = {}
+
+    def _split(self) -> typing.Dict[str, typing.List[str]]:
+        raw = self._raw
+        if raw is None:
+            raw = self._raw = {}
+            for pair in self.query_string.split("&") if self.query_string else ():
+                key, _, value = pair.partition("=")
+                if not value:
+                    continue
+                key = _decode(key, self.encoding)
+                values = raw.get(key)
+                if values is None:
+                    raw[key] = [value]
+                else:
+                    values.append(value)
+        return raw
+
+    def getlist(self, key: str, default=None) -> typing.Optional[typing.List[str]]:
+        """Return all the values of ``key``, decoded on first access."""
+        values = self._decoded.get(key)
+        if values is None:
+            if self._raw is not None:
+                raw = self._raw.get(key)
+            else:
+                raw = query_pattern(key).findall("&" + self.query_string) if self.query_string else None
+            if not raw:
+                return default
+            values = self._decoded[key] = [_decode(value, self.encoding) for value in raw]
+        return values
+
+    getall = getlist
+
+    def get(self, key: str, default=None):
+        values = self.getlist(key)
+        return values[0] if values else default
+
+    def __getitem__(self, key: str) -> str:
+        values = self.getlist(key)
+        if values is None:
+            raise KeyError(key)
+        return values[0]
+
+    def __contains__(self, key) -> bool:
+        return self.getlist(key) is not None
+
+    def __iter__(self):
+        return iter(self._split())
+
+    def __len__(self) -> int:
+        return len(self._split())
+
+    def __repr__(self):
+        return "<LazyQuery {!r}>".format(self.query_string)
+
+
+def _hex_pattern(byte: int) -> str:
+    return "%" + "".join("[{}{}]".format(digit, digit.lower()) if digit.isalpha() else digit
+                         for digit in "{:02X}".format(byte))
+
+
+def _key_pattern(key: str) -> str:
+    """Return a regular expression matching ``key`` as written in a raw query
+    string, where any of its characters may be percent-encoded."""
+    chars = []
+    for char in key:
+        encoded = "".join(_hex_pattern(byte) for byte in char.encode("utf-8"))
+        if char == " ":
+            chars.append(r"(?:\+|{})".format(encoded))
+        elif char in "&=+%#":
+            chars.append(encoded)
+        else:
+            chars.append("(?:{}|{})".format(re.escape(char), encoded))
+    return "".join(chars)
+
+
+@functools.lru_cache(maxsize=1024)
+def query_pattern(key: str) -> typing.Pattern:
+    """Return the regular expression finding the raw values of ``key`` in
+    ``"&" + query_string``."""
+    return re.compile("&{}=([^&]+)".format(_key_pattern(key)))
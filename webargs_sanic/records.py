@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Slotted record classes returned instead of dicts by parsers with ``result_records``.
+
+A record class is generated once per schema, with one slot per loaded
+field. Records support attribute access, ``record["name"]``, ``keys()`` (so
+they can be splatted into keyword arguments) and `Record.to_dict`. Fields
+absent from the input are unset: reading them raises ``AttributeError``, or
+``KeyError`` with item access, like a missing dict key.
+"""
+import keyword
+import typing
+
+from marshmallow import Schema
+
+
+class Record:
+    """Base class of the generated record classes."""
+
+    __slots__ = ("_extra",)
+
+    #: attribute names of the loaded fields, in schema order
+    _fields = ()
+    _field_set = frozenset()
+
+    @classmethod
+    def from_mapping(cls, data: typing.Mapping) -> "Record":
+        """Build a record from loaded data. Keys which are not fields, e.g. kept by
+        ``unknown=INCLUDE``, are stored aside and returned by `to_dict`."""
+        record = object.__new__(cls)
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def to_dict(self) -> dict:
+        data = {}
+        for name in self._fields:
+            try:
+                data[name] = getattr(self, name)
+            except AttributeError:
+                pass
+        extra = getattr(self, "_extra", None)
+        if extra:
+            data.update(extra)
+        return data
+
+    def keys(self) -> typing.List[str]:
+        return list(self)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        try:
+            if key in self._field_set:
+                return getattr(self, key)
+            return self._extra[key]
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            setattr(self, key, value)
+            return
+        extra = getattr(self, "_extra", None)
+        if extra is None:
+            extra = self._extra = {}
+        extra[key] = value
+
+    def __delitem__(self, key):
+        try:
+            if key in self._field_set:
+                delattr(self, key)
+            else:
+                del self._extra[key]
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        for name in self._fields:
+            if hasattr(self, name):
+                yield name
+        yield from getattr(self, "_extra", None) or ()
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            other = other.to_dict()
+        elif not isinstance(other, typing.Mapping):
+            return NotImplemented
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "<{} {}>".format(type(self).__name__, ", ".join(
+            "{}={!r}".format(key, value) for key, value in self.to_dict().items()
+        ))
+
+
+def record_class(schema: Schema) -> typing.Optional[typing.Type[Record]]:
+    """Return a new record class for the loaded fields of ``schema``, ``None``
+    when the schema cannot be loaded into records: ``many`` schemas and
+    fields whose attribute is not a valid slot name, or is a name used by
+    `Record`, e.g. ``keys``.
+    """
+    if schema.many:
+        return None
+    names = []
+    for name, field in schema.load_fields.items():
+        attr = field.attribute or name
+        if not attr.isidentifier() or keyword.iskeyword(attr) or attr.startswith("__") or hasattr(Record, attr):
+            return None
+        if attr not in names:
+            names.append(attr)
+    return type("{}Record".format(type(schema).__name__), (Record,), {
+        "__slots__": tuple(names),
+        "_fields": tuple(names),
+        "_field_set": frozenset(names),
+    })
+
+
+def as_record(record_type: typing.Optional[typing.Type[Record]], data):
+    """Return loaded ``data`` as a ``record_type`` instance when it is a plain dict."""
+    if record_type is None or type(data) is not dict:
+        return data
+    return record_type.from_mapping(data)
@@ -19,19 +19,45 @@ Example: ::
     async def index(args):
         return 'Hello ' + args['name']
 """
+import asyncio
+import concurrent.futures
 import contextlib
+import functools
+import inspect
+import json
+import time
 import typing
+import weakref
+from collections.abc import Mapping
 import sanic
+from sanic.log import logger
 from sanic.request import Request
+from sanic.response import HTTPResponse
 from sanic.exceptions import InvalidUsage
 
 from webargs import core
 from webargs.asyncparser import AsyncParser
 from webargs.multidictproxy import MultiDictProxy
+from multidict import MultiDict
 from marshmallow import Schema, RAISE, ValidationError
 
 from functools import singledispatch
 
+from webargs_sanic.cache import ResultCache, SchemaCache, copy_result, is_deterministic, is_impure
+from webargs_sanic.decoders import DecoderRegistry, default_registry, preload_decoders
+from webargs_sanic.limits import LimitExceeded, RequestLimits, length_validators
+from webargs_sanic.records import Record, as_record, record_class
+from webargs_sanic.validation import AsyncFieldCheck, async_checks, run_async_checks, run_async_item_checks, sync_schema
+from webargs_sanic.warmup import DUMP, LOAD, WarmupRegistry, bind_nested
+
+# the modules of optional features (annotations, artifacts, compiled loaders,
+# iteration, metrics, query strings, streaming) are imported when first used
+if typing.TYPE_CHECKING:
+    from webargs_sanic.iteration import ArgsIterator
+    from webargs_sanic.metrics import ParseMetrics
+    from webargs_sanic.querystring import LazyQuery
+    from webargs_sanic.streaming import JSONStreamDecoder
+
 
 @singledispatch
 def keys_to_strings(ob):
@@ -53,6 +79,21 @@ def _handle_list(ob: ValueError):
     return str(ob)
 
 
+def _needs_string_keys(ob) -> bool:
+    """Whether `keys_to_strings` would change ``ob``. Does not allocate."""
+    if isinstance(ob, dict):
+        for key, value in ob.items():
+            if type(key) is not str or _needs_string_keys(value):
+                return True
+        return False
+    if isinstance(ob, list):
+        for value in ob:
+            if _needs_string_keys(value):
+                return True
+        return False
+    return isinstance(ob, ValueError)
+
+
 class HandleValidationError(sanic.exceptions.SanicException):
     """Define default status code to process"""
 
@@ -63,15 +104,25 @@ class HandleValidationError(sanic.exceptions.SanicException):
     data = None
     schema = None
     error_headers = None
+    _message = None
+    _body = None
 
+    @property
+    def body(self) -> bytes:
+        """The error message encoded as JSON, rendered on first access."""
+        if self._body is None:
+            self._body = json.dumps(keys_to_strings(self._message)).encode()
+        return self._body
 
-def abort(http_status_code, exc=None, **kwargs):
-    """Raise a HTTPException for the given http_status_code. Attach any keyword
-    arguments to the exception for later processing.
+    def response(self) -> HTTPResponse:
+        """Return a JSON response with the error message, status code and headers."""
+        return HTTPResponse(
+            self.body, status=self.status_code, headers=self.error_headers,
+            content_type="application/json",
+        )
 
-    From Flask-Restful. See NOTICE file for license information.
-    """
 
+def _make_error(http_status_code, exc=None, **kwargs) -> HandleValidationError:
     if kwargs.get('message'):
         message = kwargs.get('message')
     else:
@@ -86,36 +137,925 @@ def abort(http_status_code, exc=None, **kwargs):
     err.exc = exc or err
     if not isinstance(err.exc, str):
         err.exc.message = message
+    err._message = message
     err.data = kwargs
     if kwargs.get('schema'):
         err.schema = kwargs.get('schema')
 
     if kwargs.get('error_headers'):
         err.error_headers = kwargs.get('error_headers')
-    raise err
+    return err
 
 
-def is_json_request(req):
-    """check the validity of json via core functionality"""
-    content_type = req.content_type
+def abort(http_status_code, exc=None, **kwargs):
+    """Raise a HTTPException for the given http_status_code. Attach any keyword
+    arguments to the exception for later processing.
+
+    From Flask-Restful. See NOTICE file for license information.
+    """
+    raise _make_error(http_status_code, exc, **kwargs)
+
+
+@functools.lru_cache(maxsize=None)
+def _static_error_body(location: str, text: str) -> bytes:
+    return json.dumps({location: [text]}).encode()
+
+
+def _weak(ob):
+    if ob is None:
+        return None
+    try:
+        return weakref.proxy(ob)
+    except TypeError:
+        return None
+
+
+def _drop_input(exc):
+    """Drop the request input held by ``exc``: the data of a `ValidationError`,
+    the document of a ``JSONDecodeError``."""
+    if isinstance(exc, ValidationError):
+        exc.data = exc.valid_data = None
+    elif isinstance(exc, json.JSONDecodeError):
+        exc.doc = None
+
+
+#: Name of the ``request.ctx`` attribute holding the per-request parser cache
+REQUEST_CACHE_ATTR = "webargs_cache"
+
+
+def get_request_cache(req) -> typing.Optional[dict]:
+    """Return the per-request cache stored on ``request.ctx``, creating it on first use.
+
+    Returns ``None`` for request objects without ``ctx``.
+    """
+    ctx = getattr(req, "ctx", None)
+    if ctx is None:
+        return None
+    cache = getattr(ctx, REQUEST_CACHE_ATTR, None)
+    if cache is None:
+        cache = {}
+        setattr(ctx, REQUEST_CACHE_ATTR, cache)
+    return cache
+
+
+@functools.lru_cache(maxsize=256)
+def _is_json_content_type(content_type: typing.Optional[str]) -> bool:
     return core.is_json(content_type)
 
 
+def _route_name(req) -> str:
+    return getattr(req, "name", None) or ""
+
+
+def is_json_request(req):
+    """check the validity of json via core functionality, cached per content type"""
+    return _is_json_content_type(req.content_type)
+
+
+#: Content types accepted by the ``ndjson`` location
+NDJSON_MIMETYPES = frozenset((
+    "application/x-ndjson",
+    "application/ndjson",
+    "application/jsonl",
+    "application/jsonlines",
+    "application/x-jsonlines",
+))
+
+
+@functools.lru_cache(maxsize=256)
+def _is_ndjson_content_type(content_type: typing.Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";", 1)[0].strip().lower() in NDJSON_MIMETYPES
+
+
+def is_ndjson_request(req):
+    """Whether the request body is newline-delimited JSON, cached per content type"""
+    return _is_ndjson_content_type(req.content_type)
+
+
+def _load_records(load: typing.Callable, records: typing.Mapping, **kwargs) -> list:
+    """Load each value of ``{line_number: record}``, keying error messages by line number.
+
+    The ``valid_data`` of the raised error maps line numbers to the data
+    loaded from them."""
+    loaded = {}
+    errors = {}
+    for line_number, record in records.items():
+        try:
+            loaded[line_number] = load(record, **kwargs)
+        except ValidationError as error:
+            errors[line_number] = error.messages
+            loaded[line_number] = error.valid_data
+    if errors:
+        raise ValidationError(errors, valid_data=loaded)
+    return list(loaded.values())
+
+
 class SanicParser(AsyncParser):
-    """Sanic request argument parser."""
+    """Sanic request argument parser.
+
+    :param int schema_cache_size: How many schemas built from ``dict`` argmaps
+        passed to ``parse`` are kept in the parser's LRU cache. Pass ``0`` to
+        rebuild the schema on every call. Counters are available via
+        ``parser.schema_cache.stats()``.
+    :param bool cache_location_data: Keep the decoded JSON body and the loaded
+        location mappings on ``request.ctx`` for the lifetime of the request,
+        so parsing the same location several times decodes it only once.
+    :param callable json_loads: Decoder used for JSON bodies instead of
+        ``request.load_json()``, e.g. ``orjson.loads`` or ``ujson.loads``.
+        It receives the raw ``request.body`` bytes and must raise
+        ``ValueError`` (or a subclass) on invalid input.
+    :param callable json_dumps: Encoder used by `use_response` instead of
+        ``json.dumps``, e.g. ``orjson.dumps``. It may return ``str`` or
+        ``bytes``.
+    :param int spool_max_size: Size in bytes above which a part read by the
+        ``files_stream`` location is moved from memory to a temporary file.
+    :param bool compile_schemas: Load flat schemas with a generated function
+        (see :mod:`webargs_sanic.compiler`) instead of ``Schema.load``. Fields
+        the generated code does not handle fall back to marshmallow.
+    :param int offload_threshold: Payload size in bytes from which schema
+        loading runs in ``offload_executor`` instead of on the event loop.
+        ``None`` (the default) never offloads. Use a dedicated parser for
+        routes that need a different setting.
+    :param offload_executor: A `concurrent.futures.Executor` used for offloaded
+        loading, the loop's default thread pool if ``None``. With a
+        ``ProcessPoolExecutor`` the schema and the data must be picklable.
+    :param float offload_timeout: Seconds to wait for offloaded loading before
+        aborting with a 503 error. ``None`` waits indefinitely.
+    :param ParseMetrics metrics: Receives loading and validation timings,
+        payload sizes and error counts per route and location. ``None`` (the
+        default) disables instrumentation.
+    :param bool keep_error_context: Store the request and the schema in the
+        ``data`` of raised `HandleValidationError` as is, and keep the input
+        data of the wrapped error. By default the request and the schema are
+        stored as weak proxies, and the ``data`` and ``valid_data`` of a
+        `ValidationError` and the ``doc`` of a ``JSONDecodeError`` are cleared,
+        so that exceptions kept around (in logs, error trackers...) do not
+        keep requests and their bodies alive.
+    :param body_decoders: Decoders used by the ``body`` location, as a
+        `webargs_sanic.decoders.DecoderRegistry` or a mapping of mimetypes to
+        callables. Defaults to MessagePack and CBOR when ``msgpack`` and
+        ``cbor2`` are installed.
+    :param RequestLimits limits: Body size, JSON structure and query string
+        limits checked before arguments are decoded, see
+        `webargs_sanic.limits.RequestLimits`.
+    :param dict route_limits: Limits of single routes by route name (e.g.
+        ``"app.upload"``), overriding the ones set in ``limits``.
+    :param str artifact_dir: Directory where the code generated for compiled
+        loaders and `use_response` dumpers is cached, so that other workers
+        and later runs load it instead of compiling it. See
+        :mod:`webargs_sanic.artifacts` to fill it at deploy time.
+    :param int result_cache_size: How many parsed results of the ``query``,
+        ``path``, ``view_args`` and ``match_info`` locations are kept, keyed
+        by schema and raw query string or match info. ``0`` (the default)
+        disables the cache. Schemas with callable ``load_default`` values or
+        validators and hooks marked with `webargs_sanic.cache.impure` are
+        never cached. Handlers receive copies of the cached results.
+    :param float result_cache_ttl: Seconds after which a cached result is
+        loaded again. ``None`` keeps results until they are evicted.
+    :param float async_validation_timeout: Seconds to wait for the awaitable
+        validators and deserializers of a schema before aborting with a 503
+        error. ``None`` (the default) waits indefinitely.
+    :param bool result_records: Return the arguments loaded by single-object
+        schemas as instances of a slotted record class generated once per
+        schema (see :mod:`webargs_sanic.records`) instead of dicts. They
+        take less memory than dicts, support attribute and item access and
+        can be splatted by ``use_kwargs``. With ``compile_schemas`` the
+        compiled loaders fill the records directly.
+    :param bool lazy_query: Read the query string with a
+        `webargs_sanic.querystring.LazyQuery` instead of ``request.args``:
+        the values of the keys the schemas read are searched for in the raw
+        query string and percent-decoded, the other parameters are left
+        as they are.
+    :param int query_max_params: Number of query parameters above which the
+        ``lazy_query`` source rejects a request with a 400 error, before
+        decoding any of them. Defaults to ``DEFAULT_QUERY_MAX_PARAMS``.
+
+    Coroutine functions can be used as validators, and as the
+    ``_deserialize`` method of custom fields, of the top-level fields of
+    the parsed schemas. They run once the rest of the schema has loaded,
+    concurrently for all fields and for all the items of ``many`` schemas
+    and of the ``ndjson`` location, and their errors are merged with the
+    others in the 422 response. Schemas with ``post_load`` hooks are loaded
+    as they are, without awaiting them.
+    """
+
+    #: Default size of the LRU cache of schemas built from dict argmaps
+    DEFAULT_SCHEMA_CACHE_SIZE = 128
+    #: Default in-memory size limit of a part read by the ``files_stream`` location
+    DEFAULT_SPOOL_MAX_SIZE = 1024 * 1024
+    #: Default number of parameters accepted by the ``lazy_query`` source
+    DEFAULT_QUERY_MAX_PARAMS = 1000
 
     DEFAULT_UNKNOWN_BY_LOCATION = {
         "view_args": RAISE,
         "match_info": RAISE,
         "path": RAISE,
+        "json_stream": None,
+        "ndjson": None,
+        "body": None,
+        "files_stream": core.Parser.DEFAULT_UNKNOWN_BY_LOCATION["files"],
         **core.Parser.DEFAULT_UNKNOWN_BY_LOCATION,
     }
     __location_map__ = dict(
         view_args="load_view_args",
         path="load_view_args",
+        json_stream="load_json_stream",
+        ndjson="load_ndjson",
+        body="load_body",
+        files_stream="load_files_stream",
         **core.Parser.__location_map__,
     )
 
+    def __init__(
+            self,
+            *args,
+            schema_cache_size: typing.Optional[int] = None,
+            cache_location_data: bool = True,
+            json_loads: typing.Optional[typing.Callable[[bytes], typing.Any]] = None,
+            json_dumps: typing.Optional[typing.Callable[[typing.Any], typing.Union[str, bytes]]] = None,
+            spool_max_size: typing.Optional[int] = None,
+            compile_schemas: bool = False,
+            offload_threshold: typing.Optional[int] = None,
+            offload_executor: typing.Optional[concurrent.futures.Executor] = None,
+            offload_timeout: typing.Optional[float] = None,
+            metrics: typing.Optional["ParseMetrics"] = None,
+            keep_error_context: bool = False,
+            body_decoders: typing.Optional[typing.Union[DecoderRegistry, typing.Mapping]] = None,
+            limits: typing.Optional[RequestLimits] = None,
+            route_limits: typing.Optional[typing.Mapping[str, RequestLimits]] = None,
+            artifact_dir: typing.Optional[str] = None,
+            result_cache_size: int = 0,
+            result_cache_ttl: typing.Optional[float] = None,
+            async_validation_timeout: typing.Optional[float] = None,
+            result_records: bool = False,
+            lazy_query: bool = False,
+            query_max_params: typing.Optional[int] = None,
+            **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        if schema_cache_size is None:
+            schema_cache_size = self.DEFAULT_SCHEMA_CACHE_SIZE
+        self.schema_cache = SchemaCache(schema_cache_size)
+        self.cache_location_data = cache_location_data
+        self.json_loads = json_loads
+        self.json_dumps = json_dumps
+        self.spool_max_size = spool_max_size or self.DEFAULT_SPOOL_MAX_SIZE
+        self.compile_schemas = compile_schemas
+        self._compiled_loaders = weakref.WeakKeyDictionary()
+        self._compiled_dumpers = weakref.WeakKeyDictionary()
+        self.offload_threshold = offload_threshold
+        self.offload_executor = offload_executor
+        self.offload_timeout = offload_timeout
+        self.metrics = metrics
+        self.keep_error_context = keep_error_context
+        if body_decoders is None:
+            body_decoders = default_registry()
+        elif not isinstance(body_decoders, DecoderRegistry):
+            body_decoders = DecoderRegistry(body_decoders)
+        self.body_decoders = body_decoders
+        self.limits = limits
+        self.route_limits = {
+            name: limits.merge(route) if limits is not None else route
+            for name, route in (route_limits or {}).items()
+        }
+        self._length_validators = weakref.WeakKeyDictionary()
+        self.warmup = WarmupRegistry()
+        self.artifacts = None
+        if artifact_dir:
+            from webargs_sanic.artifacts import ArtifactCache
+            self.artifacts = ArtifactCache(artifact_dir)
+        self.result_cache = ResultCache(result_cache_size, result_cache_ttl) if result_cache_size else None
+        self._deterministic = weakref.WeakKeyDictionary()
+        self.async_validation_timeout = async_validation_timeout
+        self._async_checks = weakref.WeakKeyDictionary()
+        self._sync_schemas = weakref.WeakKeyDictionary()
+        self.result_records = result_records
+        self._record_classes = weakref.WeakKeyDictionary()
+        self._record_loaders = weakref.WeakKeyDictionary()
+        self._value_checks = weakref.WeakKeyDictionary()
+        self._upload_checks = weakref.WeakKeyDictionary()
+        self.lazy_query = lazy_query
+        self.query_max_params = query_max_params or self.DEFAULT_QUERY_MAX_PARAMS
+
+    def _get_schema(self, argmap, req) -> Schema:
+        """Return a schema for the argmap, reusing the ones built from dicts."""
+        if isinstance(argmap, dict):
+            return self.schema_cache.get_or_build(argmap, self._build_schema)
+        return super()._get_schema(argmap, req)
+
+    def _build_schema(self, argmap: typing.Mapping) -> Schema:
+        schema = self.schema_class.from_dict(argmap)()
+        self.warmup.add(schema, LOAD)
+        return schema
+
+    def warm_up(self) -> typing.Dict[str, typing.Any]:
+        """Prepare the schemas recorded in ``self.warmup`` for their first request.
+
+        Nested schemas are instantiated and the compiled loaders and dumpers,
+        declared keys and length checks the parser settings call for are
+        built. The optional body decoder libraries are imported. Returns the
+        number of schemas and the time spent, also kept in
+        ``self.warmup.last_report``.
+        """
+        started = time.perf_counter()
+        preload_decoders()
+        schemas = self.warmup.items()
+        for schema, uses in schemas:
+            bind_nested(schema)
+            if LOAD in uses:
+                self.get_schema_loader(schema)
+                if self.limits is not None or self.route_limits:
+                    self._length_validators.setdefault(schema, length_validators(schema))
+            if DUMP in uses:
+                self.get_schema_dumper(schema)
+        report = {"schemas": len(schemas), "seconds": time.perf_counter() - started}
+        self.warmup.last_report = report
+        return report
+
+    def register_warmup(self, app: sanic.Sanic):
+        """Run `warm_up` in every worker of ``app`` before it starts serving, logging its duration."""
+
+        async def warm_up(app, loop):
+            report = self.warm_up()
+            logger.info(
+                "webargs-sanic warmed up %d schemas in %.1f ms", report["schemas"], report["seconds"] * 1000,
+            )
+
+        app.register_listener(warm_up, "before_server_start")
+
+    def get_schema_loader(self, schema: Schema) -> typing.Callable:
+        """Return the function used to load data with ``schema``.
+
+        This is the compiled fast path when ``compile_schemas`` is enabled and
+        the schema supports it, ``schema.load`` otherwise. With
+        ``result_records`` the function returns records. The awaitable
+        validators of the schema are left out, see `get_sync_schema`.
+        """
+        record_type = self.get_record_class(schema) if self.result_records else None
+        if self.compile_schemas:
+            try:
+                loader = self._compiled_loaders[schema]
+            except KeyError:
+                from webargs_sanic.compiler import compile_schema
+                loader = self._compiled_loaders[schema] = compile_schema(
+                    self.get_sync_schema(schema), self._compile_source, record_type,
+                )
+            if loader is not None:
+                return loader
+        if record_type is None:
+            return self.get_sync_schema(schema).load
+        try:
+            return self._record_loaders[schema]
+        except KeyError:
+            loader = self._record_loaders[schema] = functools.partial(
+                _load_record, self.get_sync_schema(schema).load, record_type,
+            )
+            return loader
+
+    def get_sync_schema(self, schema: Schema) -> Schema:
+        """Return the schema loaded in place of ``schema``: a copy without its
+        awaitable validators, made once per schema (see
+        :func:`webargs_sanic.validation.sync_schema`), or ``schema`` itself
+        when it has none."""
+        try:
+            copied = self._sync_schemas[schema]
+        except KeyError:
+            copied = sync_schema(schema, self.get_async_checks(schema))
+            # storing the schema itself would keep its weak key alive
+            self._sync_schemas[schema] = copied if copied is not schema else None
+        return copied if copied is not None else schema
+
+    def get_value_checks(self, schema: Schema) -> typing.Dict[str, typing.Callable[[typing.Any], None]]:
+        """Return the checks run by the ``json_stream`` location on the values of
+        ``schema`` as they are decoded, built once per schema (see
+        :func:`webargs_sanic.streaming.value_checks`)."""
+        try:
+            return self._value_checks[schema]
+        except KeyError:
+            from webargs_sanic.streaming import value_checks
+            checks = self._value_checks[schema] = value_checks(schema)
+            return checks
+
+    def get_upload_checks(self, schema: Schema) -> typing.Dict[str, typing.Callable[[typing.Any], None]]:
+        """Return the checks run by the ``files_stream`` location on the parts of
+        ``schema`` as they are complete, built once per schema (see
+        :func:`webargs_sanic.streaming.upload_checks`)."""
+        try:
+            return self._upload_checks[schema]
+        except KeyError:
+            from webargs_sanic.streaming import upload_checks
+            checks = self._upload_checks[schema] = upload_checks(schema)
+            return checks
+
+    def get_record_class(self, schema: Schema) -> typing.Optional[typing.Type[Record]]:
+        """Return the record class of ``schema``, generated once per schema,
+        ``None`` if the schema cannot be loaded into records."""
+        try:
+            return self._record_classes[schema]
+        except KeyError:
+            cls = self._record_classes[schema] = record_class(schema)
+            return cls
+
+    @property
+    def _compile_source(self) -> typing.Optional[typing.Callable]:
+        return self.artifacts.compile if self.artifacts is not None else None
+
+    def get_schema_dumper(self, schema: Schema) -> typing.Callable:
+        """Return the function used by `use_response` to dump data with ``schema``.
+
+        The dump function is generated once per schema (see
+        :func:`webargs_sanic.compiler.compile_dump_schema`), ``schema.dump``
+        is used for the schemas it does not support.
+        """
+        try:
+            dumper = self._compiled_dumpers[schema]
+        except KeyError:
+            from webargs_sanic.compiler import compile_dump_schema
+            dumper = self._compiled_dumpers[schema] = compile_dump_schema(schema, self._compile_source)
+        return dumper or schema.dump
+
+    def get_limits(self, req) -> typing.Optional[RequestLimits]:
+        """Return the limits applying to ``req``, ``None`` if there are none."""
+        if self.route_limits:
+            limits = self.route_limits.get(_route_name(req))
+            if limits is not None:
+                return limits
+        return self.limits
+
+    def _check_limits(self, req, location: str, limits: RequestLimits):
+        loader_name = self.__location_map__.get(location)
+        if loader_name == "load_querystring":
+            query_string = req.query_string
+            limits.check_query_params(query_string.count("&") + 1 if query_string else 0)
+        elif loader_name in _BODY_LOADERS:
+            limits.check_body_size(self._payload_size(req))
+
+    def _check_lengths(self, location_data, schema: Schema):
+        """Run the `Length` validators of list and string fields on the raw values."""
+        try:
+            checks = self._length_validators[schema]
+        except KeyError:
+            checks = self._length_validators[schema] = length_validators(schema)
+        if not checks or not isinstance(location_data, typing.Mapping):
+            return
+        errors = {}
+        for key, raw_type, validator in checks:
+            value = location_data.get(key)
+            if type(value) is raw_type:
+                try:
+                    validator(value)
+                except ValidationError as error:
+                    errors[key] = error.messages
+        if errors:
+            raise ValidationError(errors)
+
+    def _get_location_loader(self, loader: typing.Callable, schema: Schema, location: str) -> typing.Callable:
+        """Wrap ``loader`` for locations holding one record per line."""
+        if self.__location_map__.get(location) != "load_ndjson":
+            return loader
+        if schema.many:
+            return functools.partial(_load_records, self.get_sync_schema(schema).load, many=False)
+        return functools.partial(_load_records, loader)
+
+    def _resolve_unknown(self, location: str, unknown) -> typing.Optional[str]:
+        # precedence order: explicit, instance setting, default per location
+        if unknown != core._UNKNOWN_DEFAULT_PARAM:
+            return unknown
+        if self.unknown != core._UNKNOWN_DEFAULT_PARAM:
+            return self.unknown
+        return self.DEFAULT_UNKNOWN_BY_LOCATION.get(location)
+
+    def _prepare_location_data(self, location_data, schema: Schema, req, location: str, unknown):
+        if location_data is core.missing:
+            location_data = {}
+        unknown = self._resolve_unknown(location, unknown)
+        load_kwargs = {"unknown": unknown} if unknown else {}
+        preprocessed_data = self.pre_load(location_data, schema=schema, req=req, location=location)
+        return preprocessed_data, load_kwargs
+
+    def _process_location_data(
+            self, location_data, schema: Schema, req, location: str, unknown, validators
+    ):
+        data = self._load_location(location_data, schema, req, location, unknown)
+        self._validate_arguments(data, validators)
+        return data
+
+    def _load_location(self, location_data, schema: Schema, req, location: str, unknown):
+        preprocessed_data, load_kwargs = self._prepare_location_data(
+            location_data, schema, req, location, unknown,
+        )
+        loader = self._get_location_loader(self.get_schema_loader(schema), schema, location)
+        return loader(preprocessed_data, **load_kwargs)
+
+    async def _async_process_location_data(
+            self, location_data, schema: Schema, req, location: str, unknown, validators
+    ):
+        checks = self.get_async_checks(schema)
+        preprocessed_data, load_kwargs = self._prepare_location_data(
+            location_data, schema, req, location, unknown,
+        )
+        try:
+            data = await self._async_load_location(preprocessed_data, load_kwargs, schema, req, location)
+        except ValidationError as error:
+            if checks:
+                await self._check_loaded(checks, error.valid_data, preprocessed_data, req, location, error.messages)
+            raise
+        if checks:
+            await self._check_loaded(checks, data, preprocessed_data, req, location)
+        self._validate_arguments(data, validators)
+        return data
+
+    async def _check_loaded(self, checks, data, raw, req, location: str, messages=None):
+        """Run the awaitable ``checks`` on ``data`` loaded from ``raw``.
+
+        A list loaded from a ``many`` schema or from the ``ndjson`` location is
+        checked item by item, its messages keyed by index or line number.
+        """
+        if isinstance(data, (dict, Record)) and self.__location_map__.get(location) != "load_ndjson":
+            raw = raw if isinstance(raw, Mapping) else None
+            run = run_async_checks(checks, data, messages, raw)
+        elif isinstance(data, (list, dict)):
+            if self.__location_map__.get(location) == "load_ndjson":
+                # the data of the lines, by line number, when their loading failed
+                items = data if isinstance(data, dict) else dict(zip(raw, data))
+            else:
+                items = dict(enumerate(data))
+                raw = dict(enumerate(raw)) if isinstance(raw, list) else None
+            items = {key: item for key, item in items.items() if isinstance(item, (dict, Record))}
+            run = run_async_item_checks(checks, items, messages, raw)
+        else:
+            return
+        await self._run_async_checks(run, req, location)
+
+    def get_async_checks(self, schema: Schema) -> typing.Tuple[AsyncFieldCheck, ...]:
+        """Return the awaitable validators and deserializers of ``schema``,
+        found once per schema (see :func:`webargs_sanic.validation.async_checks`)."""
+        checks = self._async_checks.get(schema)
+        if checks is None:
+            checks = self._async_checks[schema] = async_checks(schema)
+        return checks
+
+    async def _run_async_checks(self, run: typing.Awaitable, req, location: str):
+        try:
+            await asyncio.wait_for(run, self.async_validation_timeout)
+        except asyncio.TimeoutError:
+            self._abort_static(503, location, "Validation timed out.", req)
+
+    async def _async_load_location(self, preprocessed_data, load_kwargs: dict, schema: Schema, req, location: str):
+        if self.offload_threshold is None or self._payload_size(req) < self.offload_threshold:
+            loader = self._get_location_loader(self.get_schema_loader(schema), schema, location)
+            return loader(preprocessed_data, **load_kwargs)
+
+        in_process = isinstance(self.offload_executor, concurrent.futures.ProcessPoolExecutor)
+        if in_process:
+            # compiled loaders, records and proxies cannot be pickled
+            loader = self.get_sync_schema(schema).load
+            if isinstance(preprocessed_data, MultiDictProxy):
+                preprocessed_data = dict(preprocessed_data)
+        else:
+            loader = self.get_schema_loader(schema)
+        loader = self._get_location_loader(loader, schema, location)
+        future = asyncio.get_event_loop().run_in_executor(
+            self.offload_executor, functools.partial(loader, preprocessed_data, **load_kwargs),
+        )
+        try:
+            data = await asyncio.wait_for(future, self.offload_timeout)
+        except asyncio.TimeoutError:
+            self._abort_static(503, location, "Validation timed out.", req)
+        if in_process and self.result_records:
+            data = as_record(self.get_record_class(schema), data)
+        return data
+
+    @staticmethod
+    def _payload_size(req) -> int:
+        if req.body:
+            return len(req.body)
+        try:
+            return int(req.headers.get("content-length", 0))
+        except (AttributeError, ValueError):
+            return 0
+
+    async def async_parse(
+            self,
+            argmap,
+            req=None,
+            *,
+            location: typing.Optional[str] = None,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            validate=None,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Optional[typing.Mapping]:
+        """Coroutine variant of `webargs.core.Parser.parse`.
+
+        Schema loading runs in ``offload_executor`` for payloads of at least
+        ``offload_threshold`` bytes, on the event loop otherwise. Timings and
+        errors are reported to ``metrics`` when it is set.
+        """
+        data, req, location, validators, schema = self._prepare_for_parse(
+            argmap, req, location, unknown, validate
+        )
+        try:
+            return await self._async_parse_location(
+                schema, req, location, unknown, validators, error_status_code, error_headers
+            )
+        except HandleValidationError as error:
+            if self.metrics is not None:
+                self.metrics.count_error(_route_name(req), location, error.status_code)
+            raise
+
+    async def async_parse_locations(
+            self,
+            argmaps: typing.Mapping[str, typing.Any],
+            req=None,
+            *,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            validate=None,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Dict[str, typing.Any]:
+        """Parse several locations of a request in one pass.
+
+        ``argmaps`` maps locations to argmaps. The locations are loaded
+        concurrently and their arguments are returned merged in one dict,
+        which ``validate`` receives once all of them are valid. The messages
+        of every invalid location are reported together, in a single error
+        keyed by location; those of ``validate`` are keyed by ``_schema``.
+        """
+        req = req if req is not None else self.get_default_request()
+        if req is None:
+            raise ValueError("Must pass req object")
+        validators = core._ensure_list_of_callables(validate)
+        schemas = {location: self._get_schema(argmap, req) for location, argmap in argmaps.items()}
+        loaded, errors = await self._async_load_locations(schemas, req, unknown)
+        data = {}
+        for result in loaded.values():
+            data.update(result)
+        if not errors:
+            try:
+                self._validate_arguments(data, validators)
+                return data
+            except ValidationError as error:
+                errors["_schema"] = error.messages
+        await self._async_on_locations_error(errors, data, schemas, req, error_status_code, error_headers)
+
+    async def _async_load_locations(
+            self, schemas: typing.Mapping[str, Schema], req, unknown
+    ) -> typing.Tuple[dict, dict]:
+        """Load the locations of ``schemas`` concurrently, returning the results of
+        the valid ones and the messages of the invalid ones, keyed by location."""
+        results = await asyncio.gather(*(
+            self._async_load_args(schema, req, location, unknown, ())
+            for location, schema in schemas.items()
+        ), return_exceptions=True)
+
+        loaded, errors = {}, {}
+        for location, result in zip(schemas, results):
+            if isinstance(result, ValidationError):
+                errors[location] = result.messages
+            elif isinstance(result, BaseException):
+                if isinstance(result, HandleValidationError) and self.metrics is not None:
+                    self.metrics.count_error(_route_name(req), location, result.status_code)
+                raise result
+            else:
+                loaded[location] = result
+        return loaded, errors
+
+    async def _async_on_locations_error(
+            self, errors: dict, data, schemas: typing.Mapping[str, Schema], req, error_status_code, error_headers
+    ) -> typing.NoReturn:
+        error_handler = self.error_callback or self.handle_error
+        try:
+            result = error_handler(
+                ValidationError(errors, valid_data=data), req,
+                next((schemas[location] for location in errors if location in schemas), None),
+                error_status_code=error_status_code, error_headers=error_headers,
+            )
+            if inspect.isawaitable(result):
+                await result
+        except HandleValidationError as error:
+            if self.metrics is not None:
+                for location in errors:
+                    self.metrics.count_error(_route_name(req), location, error.status_code)
+            raise
+        raise ValueError("error handler did not raise an exception")
+
+    async def _async_parse_location(
+            self, schema: Schema, req, location: str, unknown, validators, error_status_code, error_headers
+    ):
+        try:
+            return await self._async_load_args(schema, req, location, unknown, validators)
+        except ValidationError as error:
+            await self._async_on_validation_error(
+                error,
+                req,
+                schema,
+                location,
+                error_status_code=error_status_code,
+                error_headers=error_headers,
+            )
+            raise ValueError(
+                "_on_validation_error hook did not raise an exception"
+            ) from error
+
+    async def _async_load_args(self, schema: Schema, req, location: str, unknown, validators):
+        """Load and validate the arguments of ``location``, raising `ValidationError`
+        with the messages of that location when they are invalid."""
+        metrics = self.metrics
+        limits = self.get_limits(req)
+        try:
+            if metrics is not None:
+                route = _route_name(req)
+                started = time.perf_counter()
+            if limits is not None:
+                self._check_limits(req, location, limits)
+            result_key = None
+            if self.result_cache is not None:
+                result_key = self._result_cache_key(schema, req, location, unknown, validators)
+                if result_key is not None:
+                    cached = self.result_cache.get(result_key, core.missing)
+                    if cached is not core.missing:
+                        return copy_result(cached)
+            location_data = await self._async_load_location_data(
+                schema=schema, req=req, location=location
+            )
+            if metrics is not None:
+                loaded = time.perf_counter()
+                metrics.observe_load(route, location, loaded - started, self._payload_size(req))
+            if limits is not None and limits.schema_lengths:
+                self._check_lengths(location_data, schema)
+            try:
+                data = await self._async_process_location_data(
+                    location_data, schema, req, location, unknown, validators
+                )
+            finally:
+                if metrics is not None:
+                    metrics.observe_validation(route, location, time.perf_counter() - loaded)
+            if result_key is not None:
+                self.result_cache.put(result_key, copy_result(data))
+        except LimitExceeded as error:
+            self._abort_static(error.status_code, location, error.message, req, exc=error)
+        return data
+
+    def _result_cache_key(self, schema: Schema, req, location: str, unknown, validators) -> typing.Optional[tuple]:
+        """Return the result cache key of a parse call, ``None`` if its result cannot be cached."""
+        loader_name = self.__location_map__.get(location)
+        if loader_name not in _RESULT_CACHE_LOADERS:
+            return None
+        # overridden loaders and hooks may read more than the raw value used as key
+        if getattr(type(self), loader_name) is not getattr(SanicParser, loader_name):
+            return None
+        if type(self).pre_load is not core.Parser.pre_load:
+            return None
+        if any(is_impure(validator) for validator in validators) or self.get_async_checks(schema):
+            return None
+        try:
+            deterministic = self._deterministic[schema]
+        except KeyError:
+            deterministic = self._deterministic[schema] = is_deterministic(schema)
+        if not deterministic:
+            return None
+        if loader_name == "load_querystring":
+            raw = req.query_string
+        else:
+            raw = tuple(req.match_info.items())
+        return schema, location, unknown, tuple(validators), raw
+
+    def iter_args(
+            self,
+            argmap,
+            req,
+            *,
+            location: typing.Optional[str] = None,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            chunk_size: int = 100,
+            stop_on_error: bool = False,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> "ArgsIterator":
+        """Validate a list payload item by item.
+
+        ``argmap`` describes one item. Returns an `ArgsIterator` yielding lists
+        of at most ``chunk_size`` validated items; invalid items are skipped and
+        their messages collected in its ``errors``. With ``stop_on_error``, the
+        first invalid item aborts the request like `parse` does, after the
+        items validated before it were yielded.
+
+        With the ``json_stream`` and ``ndjson`` locations items are validated
+        while the body is being received, so a handler can store them before
+        the end of the upload. ``ndjson`` items are keyed by line number. A
+        payload which is not a list is rejected when iterating.
+        """
+        location = location or self.location
+        schema = self._get_schema(argmap, req)
+        unknown = self._resolve_unknown(location, unknown)
+        load_kwargs = {"unknown": unknown} if unknown else {}
+        if schema.many:
+            load_kwargs["many"] = False
+            loader = self.get_sync_schema(schema).load
+        else:
+            loader = self.get_schema_loader(schema)
+        checks = self.get_async_checks(schema)
+        check = functools.partial(self._check_item, checks, req, location) if checks else None
+
+        async def on_error(index, error):
+            await self._async_on_validation_error(
+                ValidationError({str(index): error.messages}), req, schema, location,
+                error_status_code=error_status_code, error_headers=error_headers,
+            )
+            raise ValueError("_on_validation_error hook did not raise an exception") from error
+
+        if location == "json_stream":
+            items = self._iter_json_stream(req, schema, on_error)
+        elif self.__location_map__.get(location) == "load_ndjson":
+            items = self._iter_ndjson(req, schema)
+        else:
+            items = self._iter_location(req, schema, location, on_error)
+        limits = self.get_limits(req)
+        if limits is not None:
+            items = self._iter_within_limits(items, req, location, limits)
+        from webargs_sanic.iteration import ArgsIterator
+        return ArgsIterator(
+            items, functools.partial(loader, **load_kwargs), chunk_size, stop_on_error, on_error, check,
+        )
+
+    async def _check_item(self, checks, req, location: str, data, item):
+        if isinstance(data, (dict, Record)):
+            raw = item if isinstance(item, Mapping) else None
+            await self._run_async_checks(run_async_checks(checks, data, raw=raw), req, location)
+
+    async def _iter_location(self, req, schema: Schema, location: str, on_error):
+        data = await self._async_load_location_data(schema=schema, req=req, location=location)
+        if data is core.missing:
+            return
+        data = self.pre_load(data, schema=schema, req=req, location=location)
+        if not isinstance(data, list):
+            await on_error("_schema", ValidationError([schema.error_messages["type"]]))
+        for index, item in enumerate(data):
+            yield index, item
+
+    async def _iter_within_limits(self, items, req, location: str, limits: RequestLimits):
+        try:
+            self._check_limits(req, location, limits)
+            async for item in items:
+                yield item
+        except LimitExceeded as error:
+            self._abort_static(error.status_code, location, error.message, req, exc=error)
+
+    def _json_stream_decoder(self, limits: typing.Optional[RequestLimits]) -> "JSONStreamDecoder":
+        from webargs_sanic.streaming import JSONStreamDecoder
+        if limits is not None and not limits.limits_json:
+            limits = None
+        return JSONStreamDecoder(self.json_loads or json.loads, limits)
+
+    @staticmethod
+    def _max_body_size(limits: typing.Optional[RequestLimits]) -> typing.Optional[int]:
+        return limits.max_body_size if limits is not None else None
+
+    async def _iter_json_stream(self, req, schema: Schema, on_error):
+        if not is_json_request(req):
+            return
+        from webargs_sanic.streaming import iter_body
+        limits = self.get_limits(req)
+        decoder = self._json_stream_decoder(limits)
+        body = iter_body(req, self._max_body_size(limits))
+        while True:
+            try:
+                chunk = await body.__anext__()
+                members = decoder.feed(chunk)
+            except StopAsyncIteration:
+                break
+            except (UnicodeDecodeError, ValueError) as json_exception:
+                self._handle_invalid_json_error(json_exception, req, schema)
+            if decoder.container == ord("{"):
+                await on_error("_schema", ValidationError([schema.error_messages["type"]]))
+            for member in members:
+                yield member
+        try:
+            decoder.close()
+        except ValueError as json_exception:
+            self._handle_invalid_json_error(json_exception, req, schema)
+
+    async def _iter_ndjson(self, req, schema: Schema):
+        if not is_ndjson_request(req):
+            return
+        from webargs_sanic.streaming import iter_lines
+        loads = self.json_loads or json.loads
+        limits = self.get_limits(req)
+        json_limits = limits if limits is not None and limits.limits_json else None
+        async for line_number, line in iter_lines(req, self._max_body_size(limits)):
+            try:
+                record = loads(line)
+            except (UnicodeDecodeError, ValueError) as json_exception:
+                self._handle_invalid_ndjson_error(json_exception, req, schema, line_number)
+            except RecursionError:
+                raise LimitExceeded("JSON nesting too deep.") from None
+            if json_limits is not None:
+                json_limits.check_json(record, line)
+            yield line_number, record
+
     def load_json_or_form(
         self, req, schema: Schema,
     ) -> typing.Union[typing.Dict, MultiDictProxy]:
@@ -124,18 +1064,151 @@ class SanicParser(AsyncParser):
             return data
         return self.load_form(req, schema)
 
-    def load_json(self, req, schema: Schema):
-        """Return a parsed json payload from the request."""
+    def _cached(self, req, key, build: typing.Callable):
+        """Return ``build()``, memoized under ``key`` for the lifetime of the request."""
+        cache = get_request_cache(req) if self.cache_location_data else None
+        if cache is None:
+            return build()
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = build()
+            return value
+
+    def load_json(self, req, schema: typing.Optional[Schema] = None):
+        """Return a parsed json payload from the request.
+
+        The decoded body is kept on ``request.ctx``, so middleware can call
+        ``parser.load_json(request)`` and share the result with the handlers.
+        The JSON limits of the parser are checked on it all the same.
+        """
+        json_data = self._cached(req, "json", lambda: self._decode_json(req, schema))
+        if json_data is not core.missing:
+            try:
+                self._check_decoded_json(req, "json", (json_data,), req.body)
+            except LimitExceeded as error:
+                self._abort_static(error.status_code, "json", error.message, req, exc=error)
+        return json_data
+
+    def _check_decoded_json(self, req, location: str, documents: typing.Iterable, raw: typing.Optional[bytes] = None):
+        """Check the JSON limits applying to ``req`` on documents of ``location``
+        decoded earlier in the request, possibly by a parser with other limits.
+
+        The check runs once per request, location and limits.
+        """
+        limits = self.get_limits(req)
+        if limits is None or not limits.limits_json:
+            return
+        key = ("json_limits", location, limits.max_depth, limits.max_keys, limits.max_list_length)
+        self._cached(req, key, lambda: [limits.check_json(document, raw) for document in documents])
+
+    def _decode_json(self, req, schema: typing.Optional[Schema]):
         if not (req.body and is_json_request(req)):
             return core.missing
 
         try:
-            json_data = req.load_json()
+            if self.json_loads is None:
+                json_data = req.load_json()
+            else:
+                json_data = self.json_loads(req.body)
         except (UnicodeDecodeError, InvalidUsage, ValueError) as json_exception:
             self._handle_invalid_json_error(json_exception, req, schema)
-
+        except RecursionError as error:
+            self._abort_static(400, "json", "JSON nesting too deep.", req, exc=error)
         return json_data
 
+    def load_body(self, req, schema: Schema):
+        """Return the request body decoded according to its content type.
+
+        Content types registered in ``body_decoders`` are decoded from a
+        ``memoryview`` of ``request.body``, JSON bodies are loaded like the
+        ``json`` location and anything else like the ``form`` location.
+        """
+        decoder = self.body_decoders.get(req.content_type)
+        if decoder is not None:
+            return self._cached(req, "body", lambda: self._decode_body(req, decoder))
+        if is_json_request(req):
+            return self.load_json(req, schema)
+        return self.load_form(req, schema)
+
+    def _decode_body(self, req, decoder: typing.Callable):
+        if not req.body:
+            return core.missing
+        try:
+            return decoder(memoryview(req.body))
+        except ValueError as error:
+            self._abort_static(400, "body", "Invalid request body.", req, exc=error)
+
+    async def load_json_stream(self, req, schema: Schema):
+        """Return a json payload decoded incrementally from ``request.stream``.
+
+        Meant for routes declared with ``stream=True``. Top-level values of a
+        JSON object are checked as soon as they are decoded, with the cheap
+        checks of `get_value_checks`, and the rest of the body is not read
+        once a value fails them. The schema deserializes and validates the
+        values once the whole body is read.
+        """
+        cache = get_request_cache(req) if self.cache_location_data else None
+        if cache is not None and "json_stream" in cache:
+            data = cache["json_stream"]
+            if data is not core.missing:
+                self._check_decoded_json(req, "json_stream", (data,))
+            return data
+        if not is_json_request(req):
+            return core.missing
+
+        from webargs_sanic.streaming import iter_body
+        checks = self.get_value_checks(schema)
+        limits = self.get_limits(req)
+        decoder = self._json_stream_decoder(limits)
+        data = {}
+        try:
+            async for chunk in iter_body(req, self._max_body_size(limits)):
+                for key, value in decoder.feed(chunk):
+                    data[key] = value
+                    check = checks.get(key)
+                    if check is not None and decoder.container == ord("{"):
+                        try:
+                            check(value)
+                        except ValidationError as error:
+                            raise ValidationError({key: error.messages}) from error
+            decoder.close()
+        except (UnicodeDecodeError, ValueError) as json_exception:
+            self._handle_invalid_json_error(json_exception, req, schema)
+
+        if decoder.container is None:
+            data = core.missing
+        elif decoder.container == ord("["):
+            data = [data[index] for index in range(decoder.count)]
+        if cache is not None:
+            cache["json_stream"] = data
+        return data
+
+    async def load_ndjson(self, req, schema: Schema):
+        """Return the records of a newline-delimited JSON body as ``{line_number: record}``.
+
+        Lines are decoded one at a time from the buffered body or from
+        ``request.stream`` on ``stream=True`` routes, so only the current line
+        is held besides the decoded records. Each record is loaded with the
+        schema and error messages are keyed by line number, starting at 1.
+        Blank lines are skipped.
+        """
+        cache = get_request_cache(req) if self.cache_location_data else None
+        if cache is not None and "ndjson" in cache:
+            data = cache["ndjson"]
+            if data is not core.missing:
+                self._check_decoded_json(req, "ndjson", data.values())
+            return data
+        if not is_ndjson_request(req):
+            return core.missing
+
+        data = {}
+        async for line_number, record in self._iter_ndjson(req, schema):
+            data[line_number] = record
+        if cache is not None:
+            cache["ndjson"] = data
+        return data
+
     def load_match_info(self, req, schema: Schema) -> typing.Mapping:
         """Load the request's ``match_info``."""
         # pylint: disable=unused-argument, no-self-use
@@ -145,31 +1218,339 @@ class SanicParser(AsyncParser):
             self, view: typing.Callable, args: typing.Iterable, kwargs: typing.Mapping
     ):
         """Get request object from a handler function or method. Used internally by
-        ``use_args`` and ``use_kwargs``.
+        ``use_args`` and ``use_kwargs`` when the request is not where the handler's
+        signature says it is.
         """
         req = next((arg for arg in args if isinstance(arg, Request)), None)
+        if req is None:
+            req = next((arg for arg in kwargs.values() if isinstance(arg, Request)), None)
         if not isinstance(req, Request):
             raise ValueError("Request argument not found for handler")
         return req
 
+    def _request_getter(self, func: typing.Callable, req=None) -> typing.Callable:
+        """Return a function finding the request in the ``(args, kwargs)`` of ``func``,
+        returning ``req`` when one was given to the decorator.
+
+        The request is the first parameter of a handler, or the second one when the
+        first is ``self``/``cls`` (`HTTPMethodView` methods). Its position is read
+        from the signature once, when the decorator is applied.
+        """
+        if req is not None:
+            return lambda args, kwargs: req
+        try:
+            params = list(inspect.signature(func).parameters.values())
+        except (TypeError, ValueError):
+            params = []
+        index = 1 if params and params[0].name in ("self", "cls") else 0
+        if index >= len(params) or params[index].kind not in (
+                inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD):
+            return functools.partial(self.get_request_from_view_args, func)
+        name = params[index].name
+
+        def get_request(args, kwargs):
+            req = args[index] if len(args) > index else kwargs.get(name)
+            if isinstance(req, Request):
+                return req
+            return self.get_request_from_view_args(func, args, kwargs)
+
+        return get_request
+
+    def use_args(
+            self,
+            argmap,
+            req=None,
+            *,
+            location: typing.Optional[str] = None,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            as_kwargs: bool = False,
+            arg_name: typing.Optional[str] = None,
+            validate=None,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Callable[..., typing.Callable]:
+        """Decorator that injects parsed arguments into a handler function or
+        method, see `webargs.core.Parser.use_args`.
+
+        Where the handler receives the request is resolved once per decorated
+        handler, so the wrapper does not search its arguments on each call.
+        """
+        location = location or self.location
+        if arg_name is not None and as_kwargs:
+            raise ValueError("arg_name and as_kwargs are mutually exclusive")
+        if arg_name is None and not self.USE_ARGS_POSITIONAL:
+            arg_name = "{}_args".format(location)
+        # mapping argmaps only need to be turned into a schema once
+        if isinstance(argmap, typing.Mapping):
+            argmap = self.schema_class.from_dict(dict(argmap))()
+        if isinstance(argmap, Schema):
+            self.warmup.add(argmap, LOAD)
+
+        def decorator(func: typing.Callable) -> typing.Callable:
+            _check_arg_name(func, arg_name, as_kwargs)
+            get_request = self._request_getter(func, req)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                parsed_args = await self.async_parse(
+                    argmap,
+                    req=get_request(args, kwargs),
+                    location=location,
+                    unknown=unknown,
+                    validate=validate,
+                    error_status_code=error_status_code,
+                    error_headers=error_headers,
+                )
+                args, kwargs = self._update_args_kwargs(args, kwargs, parsed_args, as_kwargs, arg_name)
+                response = func(*args, **kwargs)
+                if inspect.isawaitable(response):
+                    response = await response
+                return response
+
+            wrapper.__wrapped__ = func
+            core._record_arg_name(wrapper, arg_name)
+            return wrapper
+
+        return decorator
+
+    def use_locations(
+            self,
+            argmaps: typing.Mapping[str, typing.Any],
+            req=None,
+            *,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            as_kwargs: bool = False,
+            arg_name: typing.Optional[str] = None,
+            validate=None,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Callable[..., typing.Callable]:
+        """Decorator injecting the arguments of several locations, parsed with
+        `async_parse_locations`, into a handler as one dict.
+
+        Replaces stacked `use_args` decorators: the request is looked up once
+        and a request invalid in several locations gets a single error listing
+        all of them. ``argmaps`` maps locations to argmaps, e.g.
+        ``{"view_args": {...}, "query": {...}, "json": UserSchema()}``. An
+        argument name used in two locations raises ``ValueError`` here. The
+        other arguments are the ones of `use_args`; without ``arg_name`` and
+        with ``USE_ARGS_POSITIONAL`` false, the dict is passed as
+        ``<location>_..._args``, e.g. ``view_args_query_json_args``.
+        """
+        if arg_name is not None and as_kwargs:
+            raise ValueError("arg_name and as_kwargs are mutually exclusive")
+        if arg_name is None and not self.USE_ARGS_POSITIONAL:
+            arg_name = "{}_args".format("_".join(argmaps))
+        schemas = {}
+        for location, argmap in argmaps.items():
+            if isinstance(argmap, typing.Mapping):
+                argmap = self.schema_class.from_dict(dict(argmap))()
+            if isinstance(argmap, Schema):
+                self.warmup.add(argmap, LOAD)
+            schemas[location] = argmap
+        _check_distinct_names(schemas)
+
+        def decorator(func: typing.Callable) -> typing.Callable:
+            _check_arg_name(func, arg_name, as_kwargs)
+            get_request = self._request_getter(func, req)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                parsed_args = await self.async_parse_locations(
+                    schemas,
+                    req=get_request(args, kwargs),
+                    unknown=unknown,
+                    validate=validate,
+                    error_status_code=error_status_code,
+                    error_headers=error_headers,
+                )
+                args, kwargs = self._update_args_kwargs(args, kwargs, parsed_args, as_kwargs, arg_name)
+                response = func(*args, **kwargs)
+                if inspect.isawaitable(response):
+                    response = await response
+                return response
+
+            wrapper.__wrapped__ = func
+            core._record_arg_name(wrapper, arg_name)
+            return wrapper
+
+        return decorator
+
+    def use_annotations(
+            self,
+            func: typing.Optional[typing.Callable] = None,
+            *,
+            location: typing.Optional[str] = None,
+            unknown: typing.Optional[str] = core._UNKNOWN_DEFAULT_PARAM,
+            error_status_code: typing.Optional[int] = None,
+            error_headers: typing.Optional[typing.Mapping[str, str]] = None
+    ) -> typing.Callable:
+        """Decorator injecting arguments described by the type annotations of
+        a handler's parameters, used with or without arguments.
+
+        A parameter annotated with a dataclass or a ``TypedDict`` class
+        receives its location loaded into that type: ``location`` (the
+        parser's default location) or the one given with
+        ``Annotated[User, "query"]``. Other parameters are loaded only when
+        their annotation names a location, e.g.
+        ``page: Annotated[int, "query"] = 1``, and the ones sharing a location
+        are loaded with one schema. See :mod:`webargs_sanic.annotations` for
+        the supported types.
+
+        Schemas are built when the decorator is applied; the ones of
+        dataclasses and ``TypedDict`` classes are shared by every handler
+        using them. The locations are parsed in one pass, like
+        `use_locations` does.
+        """
+        if func is None:
+            return functools.partial(
+                self.use_annotations, location=location, unknown=unknown,
+                error_status_code=error_status_code, error_headers=error_headers,
+            )
+        schemas, targets = self._annotation_schemas(func, location or self.location)
+        get_request = self._request_getter(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            req = get_request(args, kwargs)
+            loaded, errors = await self._async_load_locations(schemas, req, unknown)
+            if errors:
+                await self._async_on_locations_error(errors, {}, schemas, req, error_status_code, error_headers)
+            for location_name, result in loaded.items():
+                target = targets[location_name]
+                if target is None:
+                    kwargs.update(result)
+                else:
+                    kwargs[target] = result
+            response = func(*args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+            return response
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def _annotation_schemas(
+            self, func: typing.Callable, default_location: str
+    ) -> typing.Tuple[typing.Dict[str, Schema], typing.Dict[str, typing.Optional[str]]]:
+        """Return the schemas of the annotated parameters of ``func`` by location,
+        and the parameter receiving each location, ``None`` when the location
+        holds separate arguments."""
+        from webargs_sanic.annotations import (
+            field_for_type, get_type_hints, is_record_type, schema_for_type, split_annotated,
+        )
+        hints = get_type_hints(func)
+        schemas, targets, arguments = {}, {}, {}
+        for name, param in inspect.signature(func).parameters.items():
+            if name not in hints:
+                continue
+            tp, metadata = split_annotated(hints[name])
+            location = next((item for item in metadata if isinstance(item, str)), None)
+            if is_record_type(tp):
+                location = location or default_location
+                if location in targets:
+                    raise ValueError("{!r} and {!r} both load the {!r} location".format(
+                        targets[location] or next(iter(arguments[location])), name, location,
+                    ))
+                schemas[location] = schema_for_type(tp)
+                targets[location] = name
+            elif location is not None:
+                if targets.get(location, None) is not None:
+                    raise ValueError("{!r} and {!r} both load the {!r} location".format(
+                        targets[location], name, location,
+                    ))
+                default = param.default if param.default is not param.empty else core.missing
+                arguments.setdefault(location, {})[name] = field_for_type(hints[name], default)
+                targets[location] = None
+        for location, argmap in arguments.items():
+            schemas[location] = self.schema_class.from_dict(argmap)()
+        for location, schema in schemas.items():
+            if location not in self.__location_map__:
+                raise ValueError("Invalid location argument: {}".format(location))
+            self.warmup.add(schema, LOAD)
+        return schemas, targets
+
+    def use_response(
+            self,
+            schema,
+            *,
+            many: typing.Optional[bool] = None,
+            status: int = 200,
+            headers: typing.Optional[typing.Mapping[str, str]] = None,
+            content_type: str = "application/json",
+            dumps: typing.Optional[typing.Callable[[typing.Any], typing.Union[str, bytes]]] = None
+    ) -> typing.Callable[..., typing.Callable]:
+        """Decorator serializing what a handler returns with ``schema``.
+
+        ``schema`` is a `Schema` instance or class, or a dict of fields like
+        the argmaps of `use_args`. The return value is dumped with
+        `get_schema_dumper`, encoded with ``dumps``, the parser's
+        ``json_dumps`` or ``json.dumps`` and sent with ``status`` and
+        ``headers``. ``many`` overrides ``schema.many``. A handler returning
+        an `HTTPResponse` bypasses serialization.
+        """
+        if isinstance(schema, dict):
+            schema = self.schema_class.from_dict(schema)()
+        elif isinstance(schema, type):
+            schema = schema()
+        self.warmup.add(schema, DUMP)
+        dump = self.get_schema_dumper(schema)
+        encode = dumps or self.json_dumps or json.dumps
+
+        def decorator(func: typing.Callable) -> typing.Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = await result
+                if isinstance(result, HTTPResponse):
+                    return result
+                return HTTPResponse(
+                    encode(dump(result, many=many)), status=status, headers=headers,
+                    content_type=content_type,
+                )
+
+            wrapper.__wrapped__ = func
+            return wrapper
+
+        return decorator
+
     def load_view_args(self, req, schema):
         """Return the request's ``view_args`` or ``missing`` if there are none."""
-        # pylint: disable=no-self-use
-        return MultiDictProxy(req.match_info, schema) or core.missing
+        return self._cached(
+            req, ("view_args", schema),
+            lambda: MultiDictProxy(req.match_info, schema) or core.missing,
+        )
 
     def load_querystring(self, req, schema):
-        """Return query params from the request as a MultiDictProxy."""
-        return MultiDictProxy(req.args, schema)
+        """Return query params from the request as a MultiDictProxy.
+
+        With ``lazy_query`` the params come from a `LazyQuery` shared by the
+        schemas parsing the request.
+        """
+        if self.lazy_query:
+            # built, and checked against query_max_params, once per request and cap
+            query = self._lazy_query(req)
+            return self._cached(req, ("query", schema), lambda: MultiDictProxy(query, schema))
+        return self._cached(req, ("query", schema), lambda: MultiDictProxy(req.args, schema))
+
+    def _lazy_query(self, req) -> "LazyQuery":
+        from webargs_sanic.querystring import LazyQuery
+        return self._cached(req, ("lazy_query", self.query_max_params), lambda: LazyQuery(req.query_string, self.query_max_params))
 
     def load_form(self, req, schema):
         """Return form values from the request as a MultiDictProxy."""
+        return self._cached(req, ("form", schema), lambda: self._form_proxy(req, schema))
+
+    @staticmethod
+    def _form_proxy(req, schema):
         with contextlib.suppress(AttributeError):
             return MultiDictProxy(req.form, schema)
         return core.missing
 
     def load_headers(self, req, schema):
         """Return headers from the request as a MultiDictProxy."""
-        return MultiDictProxy(req.headers, schema)
+        return self._cached(req, ("headers", schema), lambda: MultiDictProxy(req.headers, schema))
 
     def load_cookies(self, req, schema):
         """Return cookies from the request."""
@@ -177,7 +1558,60 @@ class SanicParser(AsyncParser):
 
     def load_files(self, req, schema):
         """Return files from the request as a MultiDictProxy."""
-        return MultiDictProxy(req.files, schema)
+        return self._cached(req, ("files", schema), lambda: MultiDictProxy(req.files, schema))
+
+    async def load_files_stream(self, req, schema):
+        """Return files from a ``multipart/form-data`` body read from ``request.stream``.
+
+        Meant for routes declared with ``stream=True``. Each part declared by
+        the schema is spooled to a temporary file once it grows over
+        ``spool_max_size`` and is passed to the field as a
+        :class:`~webargs_sanic.streaming.SpooledUpload`, with ``size`` and
+        ``type`` set. The size of single-value parts is checked against the
+        ``Length`` validators of their field as soon as they are complete,
+        their content is validated by the schema. Parts the schema does not
+        declare are dropped unread.
+        """
+        cache = get_request_cache(req) if self.cache_location_data else None
+        if cache is not None and "files_stream" in cache:
+            return cache["files_stream"]
+
+        keys = {
+            field.data_key if field.data_key is not None else name
+            for name, field in schema.load_fields.items()
+        }
+        checks = self.get_upload_checks(schema)
+        from webargs_sanic.streaming import MultipartDecoder, iter_body
+        decoder = MultipartDecoder.from_content_type(req.content_type, keys.__contains__, self.spool_max_size)
+        if decoder is None:
+            return core.missing
+
+        data = MultiDict()
+        proxy = MultiDictProxy(data, schema)
+        try:
+            async for chunk in iter_body(req, self._max_body_size(self.get_limits(req))):
+                for upload in decoder.feed(chunk):
+                    key = upload.field_name
+                    data.add(key, upload)
+                    check = checks.get(key)
+                    if check is not None and key not in proxy.multiple_keys:
+                        try:
+                            check(upload)
+                        except ValidationError as error:
+                            raise ValidationError({key: error.messages}) from error
+                if decoder.finished:
+                    break
+            decoder.close()
+        except (ValidationError, ValueError, LimitExceeded) as error:
+            for upload in data.values():
+                upload.close()
+            if not isinstance(error, ValueError):
+                raise
+            self._abort_static(400, "files_stream", "Invalid multipart body.", req, exc=error)
+
+        if cache is not None:
+            cache["files_stream"] = proxy
+        return proxy
 
     def handle_error(
             self,
@@ -194,10 +1628,23 @@ class SanicParser(AsyncParser):
         status_code = error_status_code or getattr(
             error, "status_code", self.DEFAULT_VALIDATION_STATUS,
         )
-        error.messages = keys_to_strings(error.messages)
+        if _needs_string_keys(error.messages):
+            error.messages = keys_to_strings(error.messages)
+        if not self.keep_error_context:
+            schema, req = _weak(schema), _weak(req)
+            _drop_input(error)
         abort(status_code, exc=error, message=error.messages,
               schema=schema, status_code=status_code, error_headers=error_headers, req=req)
 
+    def _abort_static(self, http_status_code: int, location: str, text: str, req, exc=None) -> typing.NoReturn:
+        # these messages do not depend on the input, their body is rendered once
+        if not self.keep_error_context:
+            _drop_input(exc)
+        err = _make_error(http_status_code, exc=exc, message={location: [text]},
+                          status_code=http_status_code, req=req if self.keep_error_context else _weak(req))
+        err._body = _static_error_body(location, text)
+        raise err
+
     def _handle_invalid_json_error(
             self,
             error: typing.Union[UnicodeDecodeError, InvalidUsage, ValueError],
@@ -205,11 +1652,57 @@ class SanicParser(AsyncParser):
             *args,
             **kwargs
     ) -> typing.NoReturn:
-        http_status_code=400
-        abort(http_status_code, exc=error, message={"json": ["Invalid JSON body."]},
-              status_code=http_status_code, req=req)
+        self._abort_static(400, "json", "Invalid JSON body.", req, exc=error)
+
+    def _handle_invalid_ndjson_error(
+            self, error: ValueError, req, schema: Schema, line_number: int
+    ) -> typing.NoReturn:
+        if not self.keep_error_context:
+            _drop_input(error)
+        abort(400, exc=error, message={"ndjson": {str(line_number): ["Invalid JSON."]}},
+              status_code=400, req=req if self.keep_error_context else _weak(req))
+
+
+def _load_record(load: typing.Callable, record_type: typing.Type[Record], data, **kwargs):
+    return as_record(record_type, load(data, **kwargs))
+
+
+def _check_arg_name(func: typing.Callable, arg_name: typing.Optional[str], as_kwargs: bool):
+    """Raise ``ValueError`` when stacked decorators pass their arguments as the same ``arg_name``."""
+    if arg_name is not None and not as_kwargs and arg_name in getattr(func, "__webargs_argnames__", ()):
+        raise ValueError(
+            "Attempted to pass `arg_name='{}'` via use_args() but that name was already used. If this came "
+            "from stacked webargs decorators, try setting `arg_name` to distinguish usages.".format(arg_name)
+        )
+
+
+def _check_distinct_names(schemas: typing.Mapping[str, typing.Any]):
+    """Raise ``ValueError`` when two locations load an argument of the same name."""
+    owners = {}
+    for location, schema in schemas.items():
+        if not isinstance(schema, Schema):
+            continue
+        for name, field in schema.load_fields.items():
+            name = field.attribute or name
+            owner = owners.setdefault(name, location)
+            if owner != location:
+                raise ValueError("Argument {!r} is loaded from both {!r} and {!r}".format(name, owner, location))
+
+
+#: loaders whose parsed result can be cached, keyed by the raw query string or match info
+_RESULT_CACHE_LOADERS = frozenset(("load_querystring", "load_view_args", "load_match_info"))
+
+#: loaders reading the request body
+_BODY_LOADERS = frozenset((
+    "load_json", "load_json_or_form", "load_form", "load_files", "load_body",
+    "load_json_stream", "load_ndjson", "load_files_stream",
+))
 
 
 parser = SanicParser()
 use_args = parser.use_args
 use_kwargs = parser.use_kwargs
+use_response = parser.use_response
+use_locations = parser.use_locations
+use_annotations = parser.use_annotations
+iter_args = parser.iter_args
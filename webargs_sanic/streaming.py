@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""Incremental readers for request bodies of streaming Sanic routes."""
+import functools
+import json
+import re
+import tempfile
+import typing
+
+from marshmallow import Schema, ValidationError, fields, validate
+from sanic.headers import parse_content_header
+
+from webargs_sanic.limits import LimitExceeded, RequestLimits
+
+_STRUCTURAL = re.compile(rb'["{}\[\],]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_QUOTE, _BACKSLASH, _COMMA = ord('"'), ord("\\"), ord(",")
+_CLOSING = {ord("{"): ord("}"), ord("["): ord("]")}
+
+
+async def iter_body(req, max_size: typing.Optional[int] = None) -> typing.AsyncIterator[bytes]:
+    """Yield the request body in chunks.
+
+    Buffered bodies are yielded at once, otherwise chunks are read from
+    ``request.stream`` as they arrive (routes declared with ``stream=True``).
+    `LimitExceeded` is raised as soon as more than ``max_size`` bytes are read.
+    """
+    if req.body:
+        if max_size is not None and len(req.body) > max_size:
+            raise LimitExceeded("Request body too large.", 413)
+        yield req.body
+        return
+    stream = getattr(req, "stream", None)
+    if stream is None:
+        return
+    size = 0
+    while True:
+        chunk = await stream.read()
+        if chunk is None:
+            return
+        if chunk:
+            size += len(chunk)
+            if max_size is not None and size > max_size:
+                raise LimitExceeded("Request body too large.", 413)
+            yield chunk
+
+
+async def iter_lines(req, max_size: typing.Optional[int] = None) -> typing.AsyncIterator[typing.Tuple[int, bytes]]:
+    """Yield the non-blank lines of the request body with their line number, starting at 1.
+
+    Only the line being read is buffered, the line terminators are not
+    included.
+    """
+    pending = bytearray()
+    line_number = 0
+    async for chunk in iter_body(req, max_size):
+        start = 0
+        end = chunk.find(b"\n")
+        if pending:
+            if end == -1:
+                pending += chunk
+                continue
+            pending += chunk[:end]
+            line, pending = bytes(pending), bytearray()
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        while end != -1:
+            line_number += 1
+            line = chunk[start:end]
+            if line.strip():
+                yield line_number, line
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        pending += chunk[start:]
+    if pending.strip():
+        yield line_number + 1, bytes(pending)
+
+
+class JSONStreamDecoder:
+    """Incremental decoder for the members of a top-level JSON object or array.
+
+    Bytes are fed in chunks of any size. :meth:`feed` returns the members
+    completed so far, as ``(key, value)`` pairs for an object and as
+    ``(index, value)`` pairs for an array. Only the member being read is
+    kept in memory. Invalid input raises ``ValueError``. Members going over
+    ``limits`` raise `LimitExceeded`: their count is checked before each of
+    them is decoded, their structure once it is.
+    """
+
+    def __init__(self, loads: typing.Callable = json.loads, limits: typing.Optional[RequestLimits] = None):
+        self.loads = loads
+        self.limits = limits
+        self.container = None
+        self.closed = False
+        self.count = 0
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._after_comma = False
+
+    def feed(self, chunk: bytes) -> typing.List[typing.Tuple[typing.Any, typing.Any]]:
+        buf = self._buf
+        buf += chunk
+        members = []
+        if self.container is None:
+            start = len(buf) - len(buf.lstrip())
+            if start == len(buf):
+                buf.clear()
+                return members
+            if buf[start] not in _CLOSING:
+                raise ValueError("Expected a JSON object or array")
+            self.container = buf[start]
+            del buf[:start + 1]
+        if self.closed:
+            self._check_tail(buf)
+            return members
+
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if buf[match.start()] == _BACKSLASH:
+                    if match.end() >= len(buf):
+                        # the escaped character has not arrived yet
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self._in_string = False
+                continue
+
+            match = _STRUCTURAL.search(buf, pos)
+            if match is None:
+                pos = len(buf)
+                break
+            char = buf[match.start()]
+            pos = match.end()
+            if char == _QUOTE:
+                self._in_string = True
+            elif char in _CLOSING:
+                self._depth += 1
+            elif char == _COMMA:
+                if self._depth:
+                    continue
+                members.append(self._decode(buf[:match.start()]))
+                self._after_comma = True
+                del buf[:pos]
+                pos = 0
+            elif self._depth:
+                self._depth -= 1
+            else:
+                if char != _CLOSING[self.container]:
+                    raise ValueError("Mismatched closing bracket")
+                member = buf[:match.start()]
+                if member.strip() or self._after_comma:
+                    members.append(self._decode(member))
+                self.closed = True
+                del buf[:pos]
+                self._check_tail(buf)
+                pos = 0
+                break
+        self._pos = pos
+        return members
+
+    def close(self):
+        """Signal the end of input, raising ``ValueError`` for a truncated document."""
+        if self.container is not None and not self.closed:
+            raise ValueError("Unexpected end of JSON input")
+
+    @staticmethod
+    def _check_tail(buf: bytearray):
+        if buf.strip():
+            raise ValueError("Extra data after JSON document")
+        buf.clear()
+
+    def _decode(self, member: bytearray):
+        if self.limits is not None:
+            self.limits.check_json_members(self.container, self.count + 1)
+        try:
+            if self.container == ord("{"):
+                ((key, value),) = self.loads(b"{" + member + b"}").items()
+            else:
+                (value,) = self.loads(b"[" + member + b"]")
+                key = self.count
+        except RecursionError:
+            raise LimitExceeded("JSON nesting too deep.") from None
+        if self.limits is not None:
+            self.limits.check_json(value, member, depth=1)
+        self.count += 1
+        return key, value
+
+
+#: marshmallow fields whose streamed values are type checked, with the JSON types they accept
+_VALUE_TYPES = (
+    (fields.List, list),
+    (fields.Tuple, list),
+    (fields.Mapping, dict),
+    (fields.String, str),
+    (fields.Number, (int, float, str)),
+    (fields.Boolean, (bool, int, float, str)),
+)
+
+
+def _value_types(field) -> typing.Optional[typing.Union[type, tuple]]:
+    if isinstance(field, fields.Nested):
+        if type(field)._deserialize is not fields.Nested._deserialize:
+            return None
+        return list if field.many else dict
+    for cls, types in _VALUE_TYPES:
+        # subclasses deserializing on their own may accept other types
+        if isinstance(field, cls) and type(field)._deserialize is cls._deserialize:
+            return types
+    return None
+
+
+def _check_value(field, types, lengths, value):
+    if value is None:
+        if not field.allow_none:
+            raise field.make_error("null")
+        return
+    if not isinstance(value, types):
+        if isinstance(field, fields.Nested) and not field.many:
+            raise ValidationError({"_schema": [field.schema.error_messages["type"]]})
+        raise field.make_error("type" if isinstance(field, fields.Nested) else "invalid")
+    for validator in lengths:
+        validator(value)
+
+
+def value_checks(schema: Schema) -> typing.Dict[str, typing.Callable[[typing.Any], None]]:
+    """Return cheap checks of the decoded top-level values of ``schema``, by key.
+
+    A check rejects a value of the wrong JSON type, ``null`` for fields not
+    allowing it, and runs the `~marshmallow.validate.Length` validators of
+    the field, raising `ValidationError` with the messages the schema would
+    give. Values are not deserialized: that is left to the schema once the
+    whole body is read. Fields of custom types are not checked.
+    """
+    checks = {}
+    for name, field in schema.load_fields.items():
+        types = _value_types(field)
+        if types is None:
+            continue
+        lengths = tuple(validator for validator in field.validators if isinstance(validator, validate.Length))
+        key = field.data_key if field.data_key is not None else name
+        checks[key] = functools.partial(_check_value, field, types, lengths)
+    return checks
+
+
+def _check_upload(lengths: tuple, upload: "SpooledUpload"):
+    for validator in lengths:
+        validator(upload)
+
+
+def upload_checks(schema: Schema) -> typing.Dict[str, typing.Callable[["SpooledUpload"], None]]:
+    """Return cheap checks of the complete parts of ``schema``, by key.
+
+    A check runs the `~marshmallow.validate.Length` validators of the field,
+    which bound the size of a part. The content is left to the schema's
+    validators, run once the whole body is read.
+    """
+    checks = {}
+    for name, field in schema.load_fields.items():
+        lengths = tuple(validator for validator in field.validators if isinstance(validator, validate.Length))
+        if lengths:
+            key = field.data_key if field.data_key is not None else name
+            checks[key] = functools.partial(_check_upload, lengths)
+    return checks
+
+
+class SpooledUpload:
+    """A multipart part stored in a spooled temporary file.
+
+    The part is kept in memory up to ``max_size`` bytes and moved to a
+    temporary file on disk beyond that. ``name`` is the client file name,
+    like ``sanic.request.File.name``. ``len()`` of an upload is its size in
+    bytes, so `~marshmallow.validate.Length` validators bound it.
+    """
+
+    def __init__(self, field_name: str, name: typing.Optional[str], content_type: str, max_size: int):
+        self.field_name = field_name
+        self.name = name
+        self.type = content_type
+        self.size = 0
+        self.file = tempfile.SpooledTemporaryFile(max_size=max_size)
+
+    def __repr__(self):
+        return "<SpooledUpload {!r} {!r} {} bytes>".format(self.field_name, self.name, self.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return True
+
+    @property
+    def on_disk(self) -> bool:
+        """Whether the part went over the memory threshold and was moved to disk."""
+        return bool(getattr(self.file, "_rolled", False))
+
+    @property
+    def body(self) -> bytes:
+        """The whole part content, read into memory."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def write(self, data: bytes):
+        self.size += len(data)
+        self.file.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.file.seek(offset, whence)
+
+    def close(self):
+        self.file.close()
+
+
+class MultipartDecoder:
+    """Incremental ``multipart/form-data`` decoder spooling part bodies to files.
+
+    Parts for which ``accept(field_name)`` is false are skipped without being
+    buffered. :meth:`feed` returns the parts completed so far as
+    :class:`SpooledUpload` objects rewound to their start. Malformed input
+    raises ``ValueError``.
+    """
+
+    #: Maximum size of the headers block of a single part
+    MAX_HEADERS_SIZE = 16 * 1024
+
+    _PREAMBLE, _HEADERS, _BODY, _DELIMITER, _END = range(5)
+
+    def __init__(self, boundary: str, accept: typing.Callable[[str], bool], spool_max_size: int):
+        self.delimiter = b"\r\n--" + boundary.encode("latin-1")
+        self.accept = accept
+        self.spool_max_size = spool_max_size
+        self.current = None
+        self._state = self._PREAMBLE
+        # a leading CRLF makes the first boundary look like all the others
+        self._buf = bytearray(b"\r\n")
+
+    @classmethod
+    def from_content_type(cls, content_type: str, accept, spool_max_size: int):
+        """Return a decoder for the given Content-Type or ``None`` if it is not multipart."""
+        mimetype, options = parse_content_header(content_type or "")
+        if mimetype != "multipart/form-data" or not options.get("boundary"):
+            return None
+        return cls(options["boundary"], accept, spool_max_size)
+
+    @property
+    def finished(self) -> bool:
+        return self._state == self._END
+
+    def feed(self, chunk: bytes) -> typing.List[SpooledUpload]:
+        buf = self._buf
+        buf += chunk
+        completed = []
+        while True:
+            if self._state == self._PREAMBLE:
+                index = buf.find(self.delimiter)
+                if index == -1:
+                    del buf[:max(0, len(buf) - len(self.delimiter))]
+                    break
+                del buf[:index + len(self.delimiter)]
+                self._state = self._DELIMITER
+            elif self._state == self._DELIMITER:
+                if len(buf) < 2:
+                    break
+                if buf[:2] == b"--":
+                    self._state = self._END
+                    buf.clear()
+                    break
+                index = buf.find(b"\r\n")
+                if index == -1:
+                    break
+                if buf[:index].strip(b" \t"):
+                    raise ValueError("Invalid multipart boundary")
+                del buf[:index + 2]
+                self._state = self._HEADERS
+            elif self._state == self._HEADERS:
+                index = buf.find(b"\r\n\r\n")
+                if index == -1:
+                    if len(buf) > self.MAX_HEADERS_SIZE:
+                        raise ValueError("Multipart part headers too large")
+                    break
+                self.current = self._start_part(bytes(buf[:index]))
+                del buf[:index + 4]
+                self._state = self._BODY
+            elif self._state == self._BODY:
+                index = buf.find(self.delimiter)
+                if index == -1:
+                    # keep what could be the beginning of a delimiter
+                    keep = len(self.delimiter) - 1
+                    if len(buf) > keep:
+                        self._write(buf[:len(buf) - keep])
+                        del buf[:len(buf) - keep]
+                    break
+                self._write(buf[:index])
+                del buf[:index + len(self.delimiter)]
+                if self.current is not None:
+                    self.current.seek(0)
+                    completed.append(self.current)
+                self.current = None
+                self._state = self._DELIMITER
+            else:
+                buf.clear()
+                break
+        return completed
+
+    def close(self):
+        """Signal the end of input, raising ``ValueError`` for a truncated body."""
+        if self._state != self._END:
+            if self.current is not None:
+                self.current.close()
+            raise ValueError("Unexpected end of multipart body")
+
+    def _write(self, data):
+        if self.current is not None and data:
+            self.current.write(data)
+
+    def _start_part(self, raw_headers: bytes) -> typing.Optional[SpooledUpload]:
+        disposition = {}
+        content_type = "application/octet-stream"
+        for line in raw_headers.decode("utf-8", "replace").split("\r\n"):
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            if name == "content-disposition":
+                _, disposition = parse_content_header(value.strip())
+            elif name == "content-type":
+                content_type = value.strip()
+        field_name = disposition.get("name")
+        if field_name is None:
+            raise ValueError("Multipart part without a name")
+        if not self.accept(field_name):
+            return None
+        return SpooledUpload(field_name, disposition.get("filename"), content_type, self.spool_max_size)
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Awaitable validators and deserializers of schema fields.
+
+marshmallow calls validators and deserializers synchronously, so a
+coroutine function used as one of them would never be awaited. The parser
+loads a copy of the schema without such validators (see `sync_schema`) and
+runs them, with the awaitable values of fields whose ``_deserialize`` is a
+coroutine function, once the copy has loaded.
+"""
+import asyncio
+import copy
+import inspect
+import typing
+
+from marshmallow import Schema, ValidationError, missing, validate
+from marshmallow.decorators import POST_LOAD
+from marshmallow.error_store import merge_errors
+
+
+class AsyncFieldCheck(typing.NamedTuple):
+    """Awaitable work of a field: its value and validators."""
+
+    attribute: str
+    key: str
+    field: typing.Any
+    validators: typing.Tuple[typing.Callable, ...]
+
+
+def is_async_callable(func) -> bool:
+    """Whether calling ``func`` returns a coroutine."""
+    if inspect.iscoroutinefunction(func):
+        return True
+    return not inspect.isroutine(func) and inspect.iscoroutinefunction(getattr(type(func), "__call__", None))
+
+
+def has_async_deserializer(field) -> bool:
+    return inspect.iscoroutinefunction(getattr(type(field), "_deserialize", None))
+
+
+def async_checks(schema: Schema) -> typing.Tuple[AsyncFieldCheck, ...]:
+    """Return the checks of the fields of ``schema`` with awaitable validators
+    or an awaitable deserializer.
+
+    All the validators of a field with an awaitable deserializer are
+    deferred, so that they receive the awaited value. Only the fields of
+    ``schema`` itself are looked at, not the ones of nested schemas.
+    Schemas with ``post_load`` hooks have no checks: their result need not
+    be a mapping the checks can run on, so they are loaded as they are.
+    """
+    if schema._hooks.get((POST_LOAD, False)) or schema._hooks.get((POST_LOAD, True)):
+        return ()
+    checks = []
+    for name, field in schema.load_fields.items():
+        deferred_all = has_async_deserializer(field)
+        deferred = [
+            validator for validator in field.validators if deferred_all or is_async_callable(validator)
+        ]
+        if not (deferred_all or deferred):
+            continue
+        checks.append(AsyncFieldCheck(
+            attribute=field.attribute or name,
+            key=field.data_key if field.data_key is not None else name,
+            field=field,
+            validators=tuple(deferred),
+        ))
+    return tuple(checks)
+
+
+def sync_schema(schema: Schema, checks: typing.Sequence[AsyncFieldCheck]) -> Schema:
+    """Return a copy of ``schema`` loading without the validators deferred by
+    ``checks``, ``schema`` itself when there are none.
+
+    The fields of the checks are copied without those validators and the
+    other fields are shared. ``schema`` is left as is, so loading it
+    elsewhere still runs every validator.
+    """
+    if not checks:
+        return schema
+    replaced = {}
+    for check in checks:
+        deferred = set(map(id, check.validators))
+        field = replaced[id(check.field)] = copy.copy(check.field)
+        field.validators = [validator for validator in check.field.validators if id(validator) not in deferred]
+    copied = copy.copy(schema)
+    for name in ("fields", "load_fields", "dump_fields"):
+        setattr(copied, name, {
+            key: replaced.get(id(field), field) for key, field in getattr(schema, name).items()
+        })
+    return copied
+
+
+async def _run_validator(validator: typing.Callable, value, field) -> list:
+    try:
+        result = validator(value)
+        if inspect.isawaitable(result):
+            result = await result
+    except ValidationError as error:
+        return error.messages if isinstance(error.messages, list) else [error.messages]
+    if result is False and not isinstance(validator, validate.Validator):
+        return field.make_error("validator_failed").messages
+    return []
+
+
+async def _run_check(check: AsyncFieldCheck, data: dict, errors: dict):
+    value = data[check.attribute]
+    if inspect.isawaitable(value):
+        try:
+            value = await value
+        except ValidationError as error:
+            del data[check.attribute]
+            errors[check.key] = error.messages
+            return
+        data[check.attribute] = value
+    results = await asyncio.gather(*(
+        _run_validator(validator, value, check.field) for validator in check.validators
+    ))
+    messages = [message for result in results for message in result]
+    if messages:
+        del data[check.attribute]
+        errors[check.key] = messages
+
+
+async def run_async_checks(
+        checks: typing.Sequence[AsyncFieldCheck], data: dict, messages=None,
+        raw: typing.Optional[typing.Mapping] = None,
+):
+    """Run ``checks`` concurrently on the loaded ``data``, in place.
+
+    The fields failing them are removed from ``data`` and a
+    `ValidationError` holding their messages, merged with the ``messages``
+    of the synchronous load if it failed, is raised. Fields missing from
+    ``data``, absent from the input or already invalid, are skipped, as are
+    the fields absent from the ``raw`` input data when it is given, whose
+    value is their ``load_default``.
+    """
+    errors = {}
+    await asyncio.gather(*(
+        _run_check(check, data, errors) for check in checks
+        if check.attribute in data and (raw is None or raw.get(check.key, missing) is not missing)
+    ))
+    if errors or messages:
+        raise ValidationError(merge_errors(messages or {}, errors), valid_data=data)
+
+
+async def run_async_item_checks(
+        checks: typing.Sequence[AsyncFieldCheck], items: typing.Mapping, messages=None,
+        raws: typing.Optional[typing.Mapping] = None,
+):
+    """Run ``checks`` concurrently on each of the loaded ``items``, in place,
+    like `run_async_checks`.
+
+    ``items`` and their ``raws`` input data are keyed like the error
+    messages of the schema, by index or line number. The messages of the
+    failing items are merged with the ``messages`` of the synchronous load
+    in the raised `ValidationError`.
+    """
+    errors = {}
+
+    async def check(key, item):
+        raw = raws.get(key) if raws is not None else None
+        try:
+            await run_async_checks(checks, item, raw=raw if isinstance(raw, typing.Mapping) else None)
+        except ValidationError as error:
+            errors[key] = error.messages
+
+    await asyncio.gather(*(check(key, item) for key, item in items.items()))
+    if errors or messages:
+        raise ValidationError(merge_errors(messages or {}, errors), valid_data=items)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Registry of the schemas used by a parser, prepared before serving requests."""
+import typing
+import weakref
+
+from marshmallow import Schema, fields
+
+#: schemas used to load request arguments
+LOAD = "load"
+#: schemas used to dump responses
+DUMP = "dump"
+
+
+def bind_nested(schema: Schema, _seen: typing.Optional[set] = None):
+    """Instantiate the schemas of the ``Nested`` fields of ``schema``, recursively.
+
+    marshmallow builds them on first access, that is while handling the
+    first request using them.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(schema) in seen:
+        return
+    seen.add(id(schema))
+    pending = list(schema.fields.values())
+    while pending:
+        field = pending.pop()
+        if isinstance(field, fields.Nested):
+            bind_nested(field.schema, seen)
+        elif isinstance(field, fields.List):
+            pending.append(field.inner)
+        elif isinstance(field, fields.Tuple):
+            pending.extend(field.tuple_fields)
+        elif isinstance(field, fields.Mapping):
+            pending.extend(f for f in (field.key_field, field.value_field) if f is not None)
+
+
+class WarmupRegistry:
+    """Schemas seen by a parser, with what they are used for.
+
+    Schemas are held weakly: the ones of decorated handlers live as long as
+    the handlers, the ones built by ``parse`` as long as the parser's schema
+    cache keeps them.
+    """
+
+    def __init__(self):
+        self._schemas = weakref.WeakKeyDictionary()
+        #: result of the last `SanicParser.warm_up` call
+        self.last_report = None
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def __contains__(self, schema: Schema) -> bool:
+        return schema in self._schemas
+
+    def add(self, schema: Schema, use: str = LOAD):
+        uses = self._schemas.get(schema)
+        if uses is None:
+            self._schemas[schema] = {use}
+        else:
+            uses.add(use)
+
+    def items(self) -> typing.List[typing.Tuple[Schema, typing.Set[str]]]:
+        return list(self._schemas.items())